@@ -0,0 +1,46 @@
+from functools import wraps
+from flask import Blueprint, request, jsonify, session
+from config import Config
+
+from Models.db.db_slow_queries import SlowQueryLog
+
+admin_bp = Blueprint("admin", __name__, url_prefix="/api/admin")
+
+def admin_required(f):
+    """
+    Limits a route to Config.ADMIN_USERNAMES (comma-separated); when unset,
+    nobody is allowed.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        admins = {name.strip() for name in getattr(Config, "ADMIN_USERNAMES", "").split(",") if name.strip()}
+        if session.get("username") not in admins:
+            return jsonify({"success": False, "message": "Administrator access required"}), 403
+        return f(*args, **kwargs)
+    return decorated
+
+# --- SLOW QUERIES ---
+@admin_bp.route("/slow-queries", methods=["GET"])
+@admin_required
+def get_slow_queries():
+    """
+    Lists logged slow statements, newest first, with their sampled EXPLAIN plans (?limit=).
+    """
+    try:
+        limit = int(request.args.get("limit", 50))
+    except ValueError:
+        return jsonify({"error": "limit must be a whole number"}), 400
+
+    threshold = SlowQueryLog.threshold()
+    response = jsonify({
+        "thresholdMs": threshold * 1000 if threshold is not None else None,
+        "rows": SlowQueryLog.entries(limit),
+    })
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+@admin_bp.route("/slow-queries", methods=["DELETE"])
+@admin_required
+def clear_slow_queries():
+    SlowQueryLog.clear()
+    return jsonify({"success": True, "message": "Slow query log cleared."})
@@ -1,12 +1,19 @@
-from flask import Flask, send_from_directory, send_file, session, redirect, request, jsonify
-from werkzeug.utils import safe_join
-import os
+from flask import Flask, session, redirect, request, jsonify
 from config import Config
+from Models.db.db_utils import DBUtils
+from Controllers.static_assets import StaticManifest
+from Controllers.response_compression import ResponseCompression
+from Controllers.request_metrics import RequestMetrics
+from Controllers import json_provider
 
 # Existing controllers
 from Controllers.college_modules.college_operations import college_bp
 from Controllers.student_modules.student_operations import student_bp
 from Controllers.program_modules.program_operations import program_bp
+from Controllers.stats_modules.stats_operations import stats_bp
+from Controllers.media_modules.media_operations import media_bp
+from Controllers.metrics_modules.metrics_operations import metrics_bp
+from Controllers.admin_modules.admin_operations import admin_bp
 
 # Authentication controller
 from Controllers.auth_user_controller import auth_bp
@@ -15,10 +22,26 @@ from Controllers.auth_user_controller import auth_bp
 app = Flask(__name__, static_folder=Config.REACT_DIST)
 app.secret_key = Config.SECRET_KEY  # required for session management
 
+# orjson-backed JSON serialization (Config.JSON_PROVIDER)
+json_provider.init_app(app)
+
+# Per-endpoint timing; registered first so it measures every other hook too
+RequestMetrics.init_app(app)
+
+# Compress /api/ JSON; registered before DBUtils so it runs after the transaction is committed
+ResponseCompression.init_app(app)
+
+# One database connection and transaction per request
+DBUtils.init_app(app)
+
 # ---------- Register API routes ----------
 app.register_blueprint(college_bp)
 app.register_blueprint(student_bp)
 app.register_blueprint(program_bp)
+app.register_blueprint(stats_bp)
+app.register_blueprint(media_bp)
+app.register_blueprint(metrics_bp)
+app.register_blueprint(admin_bp)
 
 app.register_blueprint(auth_bp)
 
@@ -35,7 +58,8 @@ def protect_api_routes():
 
 
 # ---------- React SPA serving ----------
-INDEX_HTML = os.path.join(app.static_folder, "index.html")
+# Built files are indexed in memory once; restart (or call STATIC_MANIFEST.load()) after a rebuild
+STATIC_MANIFEST = StaticManifest(app.static_folder)
 
 # SPA routes that require login
 PROTECTED_ROUTES = [
@@ -56,12 +80,15 @@ def serve_react(path):
         return redirect("/login")
 
     # Serve static files if they exist (JS, CSS, images)
-    file_path = safe_join(app.static_folder, path)
-    if path != "" and file_path and os.path.isfile(file_path):
-        return send_from_directory(app.static_folder, path)
+    asset = STATIC_MANIFEST.get(path) if path else None
 
     # Fallback to React SPA for other routes (including 404)
-    return send_file(INDEX_HTML)
+    if asset is None:
+        asset = STATIC_MANIFEST.get("index.html")
+        if asset is None:
+            return "Frontend build not found.", 404
+
+    return STATIC_MANIFEST.response(asset)
 
 if __name__ == "__main__":
     app.run(host=Config.HOST, port=Config.PORT, debug=Config.DEBUG)
\ No newline at end of file
@@ -0,0 +1,30 @@
+from contextlib import asynccontextmanager
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from a2wsgi import WSGIMiddleware
+from Models.db.db_async import AsyncDatabaseConnection
+
+from Controllers.app import app as flask_app
+from Controllers.college_modules.college_async_operations import college_routes
+from Controllers.student_modules.student_async_operations import student_routes
+from Controllers.program_modules.program_async_operations import program_routes
+
+# ---------- ASGI app setup ----------
+# The list and search routes run natively on the event loop over asyncpg;
+# every other route (writes, auth, SPA) is served by the Flask app in a thread pool.
+
+@asynccontextmanager
+async def lifespan(app):
+    await AsyncDatabaseConnection.get_pool()
+    yield
+    await AsyncDatabaseConnection.close()
+
+app = Starlette(
+    routes=[
+        *college_routes,
+        *student_routes,
+        *program_routes,
+        Mount("/", app=WSGIMiddleware(flask_app)),
+    ],
+    lifespan=lifespan,
+)
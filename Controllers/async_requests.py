@@ -0,0 +1,103 @@
+import asyncio
+from functools import wraps
+from starlette.responses import JSONResponse, Response
+from Controllers.app import app as flask_app
+from Controllers.conditional_requests import compute_etag
+from Controllers.response_compression import ResponseCompression
+from Controllers.json_provider import dumps_bytes
+from Models.db.db_table_versions import TableVersions
+
+# ----------------- Responses -----------------
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse serialized with the same encoder as the Flask app (orjson when installed).
+    """
+
+    def render(self, content):
+        return dumps_bytes(content)
+
+# ----------------- Decorators -----------------
+def async_login_required(f):
+    """
+    Async counterpart of the /api/ session check in Controllers/app.py.
+
+    Reads the signed Flask session cookie, so a user logged in through the
+    Flask routes is recognised by the async routes and vice versa.
+    """
+    @wraps(f)
+    async def decorated(request):
+        session = {}
+        cookie = request.cookies.get(flask_app.config["SESSION_COOKIE_NAME"])
+        serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+        if cookie and serializer is not None:
+            try:
+                session = serializer.loads(
+                    cookie, max_age=int(flask_app.permanent_session_lifetime.total_seconds())
+                )
+            except Exception:
+                session = {}
+        if "username" not in session:
+            return JSONResponse({"success": False, "message": "Authentication required"}, status_code=401)
+        return await f(request)
+    return decorated
+
+
+def async_versioned_etag(*tables):
+    """
+    Async counterpart of versioned_etag; produces the same ETags for the same request.
+
+    Version lookups are memory reads while the change listener is connected,
+    but may query the database otherwise, so they run in a worker thread.
+    """
+    def decorator(f):
+        @wraps(f)
+        async def decorated(request):
+            try:
+                versions = await asyncio.to_thread(lambda: [TableVersions.get(table) for table in tables])
+            except Exception as e:
+                print("Error reading table versions, skipping ETag:", e)
+                return await f(request)
+
+            etag = compute_etag(request.url.path, request.query_params.multi_items(), tables, versions)
+            quoted = f'"{etag}"'
+
+            if_none_match = request.headers.get("if-none-match", "")
+            if if_none_match.strip() == "*" or quoted in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+                return Response(status_code=304, headers={"ETag": quoted})
+
+            response = await f(request)
+            if response.status_code == 200:
+                response.headers["ETag"] = quoted
+                # Let the browser keep the body but revalidate on every use
+                response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return decorated
+    return decorator
+
+
+def async_compressed(f):
+    """
+    Async counterpart of ResponseCompression's after_request hook, for the ASGI routes.
+    """
+    @wraps(f)
+    async def decorated(request):
+        response = await f(request)
+        if response.status_code in (204, 304) or "content-encoding" in response.headers:
+            return response
+
+        encoding, body, eligible = ResponseCompression.encode(
+            response.body, request.headers.get("accept-encoding", "")
+        )
+        if eligible:
+            response.headers.append("Vary", "Accept-Encoding")
+        if encoding is None:
+            return response
+
+        response.body = body
+        response.headers["Content-Encoding"] = encoding
+        response.headers["Content-Length"] = str(len(body))
+        etag = response.headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            response.headers["ETag"] = f"W/{etag}"
+        return response
+    return decorated
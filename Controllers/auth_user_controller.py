@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, session, send_file, current_app
 from werkzeug.utils import safe_join
 from Models.userModel.user_model import UserModel
+from Models.userModel.password_hasher import HasherBusyError
 from functools import wraps
 import os
 
@@ -36,11 +37,15 @@ def login():
     if not username or not password:
         return jsonify({"success": False, "message": "Missing credentials"}), 400
 
-    user = UserModel.get_user_by_username(username)
-    if not user:
-        return jsonify({"success": False, "message": "Invalid username or password"}), 401
+    try:
+        # bcrypt runs in a bounded process pool, not in this request thread
+        valid = UserModel.verify_login(username, password)
+    except HasherBusyError:
+        response = jsonify({"success": False, "message": "Too many login attempts in progress, try again shortly"})
+        response.headers["Retry-After"] = "1"
+        return response, 503
 
-    if UserModel.check_password(password, user[1]):
+    if valid:
         session["username"] = username
         return jsonify({"success": True, "message": "Login successful"})
     else:
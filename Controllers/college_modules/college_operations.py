@@ -1,4 +1,6 @@
 from flask import Blueprint, request, jsonify
+from Controllers.conditional_requests import versioned_etag
+from Controllers.streaming_responses import export_response
 
 # Assuming your model structure remains the same
 from Models.collegeTableModel.college_add_model import CollegeAddModel
@@ -12,41 +14,75 @@ college_bp = Blueprint("colleges", __name__, url_prefix="/api/colleges")
 
 # --- READ (List & Filter) ---
 @college_bp.route("", methods=["GET"])
+@versioned_etag("colleges")
 def get_colleges():
     params = request.args.to_dict()
     order_by = params.pop("order_by", "college_code")
     direction = params.pop("direction", "ASC").upper()
+    # "format=columnar" sends column names once and each row as an array
+    columnar = params.pop("format", None) == "columnar"
     filters = params 
 
     try:
-        rows = CollegeModel.get_colleges(order_by, direction, filters)
+        rows = CollegeModel.get_colleges(order_by, direction, filters, columnar)
         total_count = CollegeModel.get_count(filters)
-        return jsonify({"rows": rows, "totalCount": total_count})
+        body = {"rows": rows, "totalCount": total_count}
+        if columnar:
+            body["columns"] = CollegeModel.columns
+        return jsonify(body)
     except Exception as e:
         print("Error fetching colleges:", e)
         return jsonify({"error": "Database error"}), 500
 
 # --- SEARCH ---
 @college_bp.route("/search", methods=["GET"])
+@versioned_etag("colleges")
 def search_colleges():
     q = request.args.get("q", "").strip()
     limit = int(request.args.get("limit", 20))
     offset = int(request.args.get("offset", 0))
     order_by = request.args.get("order_by", "college_code")
     direction = request.args.get("direction", "ASC").upper()
+    # "count=estimated" lets broad (empty-query) searches skip the exact COUNT
+    estimate_count = request.args.get("count") == "estimated"
+    columnar = request.args.get("format") == "columnar"
 
     if direction not in ("ASC", "DESC"):
         direction = "ASC"
 
     try:
         total_count, rows = CollegeSearchModel.search_colleges(
-            query=q, limit=limit, offset=offset, order_by=order_by, direction=direction
+            query=q, limit=limit, offset=offset, order_by=order_by, direction=direction,
+            estimate_count=estimate_count, columnar=columnar
         )
-        return jsonify({"totalCount": total_count, "rows": rows})
+        body = {"totalCount": total_count, "rows": rows}
+        if columnar:
+            body["columns"] = CollegeSearchModel.columns
+        return jsonify(body)
     except Exception as e:
         print("Error in college search controller:", e)
         return jsonify({"error": "Database error"}), 500
 
+# --- EXPORT ---
+@college_bp.route("/export", methods=["GET"])
+def export_colleges():
+    """
+    Streams every college matching ?q= (all when empty) as CSV or NDJSON (?format=, default csv).
+    """
+    q = request.args.get("q", "").strip()
+    file_format = request.args.get("format", "csv").lower()
+    order_by = request.args.get("order_by", "college_code")
+    direction = request.args.get("direction", "ASC").upper()
+
+    try:
+        sql, params, columns = CollegeSearchModel.export_query(q, order_by, direction)
+        return export_response(sql, params, columns, file_format, "colleges")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print("Error exporting colleges:", e)
+        return jsonify({"error": "Database error"}), 500
+
 # --- CREATE ---
 @college_bp.route("/add", methods=["POST"])
 def add_college():
@@ -0,0 +1,56 @@
+import hashlib
+from functools import wraps
+from flask import request, make_response
+from Models.db.db_table_versions import TableVersions
+from Models.db.db_replicas import ReplicaRouting
+
+# ----------------- Helpers -----------------
+def compute_etag(path, arguments, tables, versions):
+    """
+    Hashes the request path, its (sorted) arguments and the versions of `tables`.
+    """
+    fingerprint = repr((path, sorted(arguments), tables, versions)).encode("utf-8")
+    return hashlib.sha1(fingerprint).hexdigest()
+
+# ----------------- Decorator -----------------
+def versioned_etag(*tables):
+    """
+    Conditional GET for read endpoints whose result depends only on `tables` and the query string.
+
+    The ETag hashes the current change version of each table with the path and
+    the (sorted) request arguments. A matching If-None-Match is answered with
+    304 before the view runs, so no query is issued; while the change listener
+    is connected the versions themselves are memory reads.
+
+    A body read from the lagging replica is tagged with the versions the
+    replica had when the read began, never with newer ones (see ReplicaRouting).
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            try:
+                versions = [TableVersions.get(table) for table in tables]
+            except Exception as e:
+                print("Error reading table versions, skipping ETag:", e)
+                return f(*args, **kwargs)
+
+            etag = compute_etag(request.path, request.args.items(multi=True), tables, versions)
+
+            # Weak comparison: compressed responses carry the weak form (see response_compression.py)
+            if request.if_none_match.contains_weak(etag):
+                response = make_response("", 304)
+                response.set_etag(etag)
+                return response
+
+            ReplicaRouting.track_versions(tables)
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                replica_versions = ReplicaRouting.tracked_versions()
+                if replica_versions is not None:
+                    etag = compute_etag(request.path, request.args.items(multi=True), tables, replica_versions)
+                response.set_etag(etag)
+                # Let the browser keep the body but revalidate on every use
+                response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return decorated
+    return decorator
@@ -0,0 +1,58 @@
+import json
+from flask.json.provider import DefaultJSONProvider
+from config import Config
+
+try:
+    import orjson
+except ImportError:  # Falls back to Flask's stdlib provider
+    orjson = None
+
+
+def dumps_bytes(obj):
+    """
+    Serializes `obj` to UTF-8 JSON bytes with orjson when available.
+
+    Types orjson does not handle natively (Decimal, dates in Flask's HTTP
+    date format, ...) go through Flask's default hook, so output matches
+    the stdlib provider apart from key order and whitespace.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj, default=DefaultJSONProvider.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(obj, default=DefaultJSONProvider.default, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Keys keep their insertion order instead of being sorted, and responses
+    are written straight from bytes without an intermediate str.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # indent/sort_keys etc. are only requested for debugging output
+            return super().dumps(obj, **kwargs)
+        return dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if self._app.debug and self.compact is not False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
+
+
+def init_app(app):
+    """
+    Installs the JSON provider selected by Config.JSON_PROVIDER ("fast" or "default").
+    """
+    if getattr(Config, "JSON_PROVIDER", "fast") == "fast" and orjson is not None:
+        app.json = FastJSONProvider(app)
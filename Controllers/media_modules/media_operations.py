@@ -0,0 +1,32 @@
+import mimetypes
+from flask import Blueprint, request, make_response
+from Models.imageModel.image_storage import ImageStorage
+
+# Serves images stored by the local storage backend (Config.IMAGE_STORAGE = "local").
+# Public like the storage bucket it replaces, so <img> tags need no session.
+media_bp = Blueprint("media", __name__, url_prefix="/media")
+
+@media_bp.route("/<path:key>/<name>", methods=["GET"])
+def serve_media(key, name):
+    storage = ImageStorage.default()
+    try:
+        data = storage.read(key, name)
+        if data is None:
+            # Clients ask for a fixed size; serve the closest one this key was rendered in
+            name = storage.nearest_variant(key, name)
+            data = storage.read(key, name) if name else None
+    except ValueError:
+        data = None
+    if data is None:
+        return "Not found", 404
+
+    # Keys are content-addressed, so a URL always serves the same bytes
+    etag = f"{key.rsplit('/', 1)[-1]}-{name}"
+    if request.if_none_match.contains(etag):
+        response = make_response("", 304)
+    else:
+        response = make_response(data)
+        response.mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
@@ -0,0 +1,53 @@
+import hmac
+from flask import Blueprint, Response, request, session
+from config import Config
+from Controllers.request_metrics import RequestMetrics
+from Controllers.response_compression import ResponseCompression
+
+from Models.db.db_async import AsyncDatabaseConnection
+from Models.db.db_connection import DatabaseConnection
+from Models.db.db_metrics import MetricsText, QueryMetrics
+from Models.db.db_query_cache import QueryShapeCache
+from Models.db.db_reference_cache import ReferenceCache
+
+# Served outside /api/ so Prometheus can scrape it with "Authorization: Bearer <Config.METRICS_TOKEN>";
+# a logged-in session also works. Anonymous access needs Config.METRICS_PUBLIC.
+metrics_bp = Blueprint("metrics", __name__)
+
+def metrics_authorized():
+    if getattr(Config, "METRICS_PUBLIC", False) or "username" in session:
+        return True
+    token = getattr(Config, "METRICS_TOKEN", "")
+    return bool(token) and hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}")
+
+# --- READ ---
+@metrics_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    if not metrics_authorized():
+        return Response("Unauthorized\n", status=401, mimetype="text/plain")
+
+    try:
+        text = MetricsText()
+        QueryMetrics.export(text)
+        RequestMetrics.export(text)
+
+        # Never create the pool just to report on it
+        if DatabaseConnection._instance is not None:
+            text.add_stats("db_pool", "Connection pool", DatabaseConnection().stats(),
+                           counters=("acquired", "timeouts", "discarded", "wait_time_total"))
+            text.add_stats("db_replica_pool", "Read replica connection pool", DatabaseConnection().replica_stats(),
+                           counters=("acquired", "timeouts", "discarded", "wait_time_total"))
+        text.add_stats("db_async_pool", "Async connection pool", AsyncDatabaseConnection.stats())
+        text.add_stats("db_query_shape_cache", "Query shape cache", QueryShapeCache.stats(),
+                       counters=("hits", "misses", "prepares", "prepared_executions"))
+        text.add_stats("reference_cache", "Reference cache", ReferenceCache.stats(), counters=("hits", "misses"))
+        text.add_stats("api_compression", "API response compression", ResponseCompression.stats(),
+                       counters=("compressed", "skipped_small", "bytes_in", "bytes_out", "bytes_saved"))
+
+        response = Response(text.render(), mimetype="text/plain")
+        response.headers["Content-Type"] = MetricsText.CONTENT_TYPE
+        response.headers["Cache-Control"] = "no-store"
+        return response
+    except Exception as e:
+        print("Error rendering metrics:", e)
+        return Response("Error rendering metrics\n", status=500, mimetype="text/plain")
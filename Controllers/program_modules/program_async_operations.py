@@ -0,0 +1,70 @@
+import asyncio
+from starlette.routing import Route
+from Controllers.async_requests import async_login_required, async_versioned_etag, async_compressed, FastJSONResponse
+from Models.programTableModel.program_async_model import ProgramAsyncModel
+from Models.programTableModel.program_table_model import ProgramModel
+from Models.programTableModel.program_search_model import ProgramSearchModel
+
+# Async versions of the program read routes, served by the ASGI app (asgi.py)
+
+# --- READ (List & Filter) ---
+@async_login_required
+@async_compressed
+@async_versioned_etag("programs", "colleges")
+async def programs_route(request):
+    params = dict(request.query_params)
+    order_by = params.pop("order_by", "program_code")
+    direction = params.pop("direction", "ASC").upper()
+    # "format=columnar" sends column names once and each row as an array
+    columnar = params.pop("format", None) == "columnar"
+    filters = params  # Remaining parameters are treated as filters
+
+    try:
+        rows, total_count = await asyncio.gather(
+            ProgramAsyncModel.get_programs(order_by, direction, filters, columnar),
+            ProgramAsyncModel.get_count(filters)
+        )
+        body = {"rows": rows, "totalCount": total_count}
+        if columnar:
+            body["columns"] = ProgramModel.columns
+        return FastJSONResponse(body)
+    except Exception as e:
+        print("Error fetching programs:", e)
+        return FastJSONResponse({"error": "Database error"}, status_code=500)
+
+# --- SEARCH ---
+@async_login_required
+@async_compressed
+@async_versioned_etag("programs", "colleges")
+async def search_programs(request):
+    args = request.query_params
+    q = args.get("q", "").strip()
+    limit = int(args.get("limit", 20))
+    offset = int(args.get("offset", 0))
+    order_by = args.get("order_by", "program_code")
+    direction = args.get("direction", "ASC").upper()
+    # "count=estimated" lets broad (empty-query) searches skip the exact COUNT
+    estimate_count = args.get("count") == "estimated"
+    columnar = args.get("format") == "columnar"
+
+    if direction not in ("ASC", "DESC"):
+        direction = "ASC"
+
+    try:
+        total_count, rows = await ProgramAsyncModel.search_programs(
+            query=q, limit=limit, offset=offset, order_by=order_by, direction=direction,
+            estimate_count=estimate_count, columnar=columnar
+        )
+        body = {"totalCount": total_count, "rows": rows}
+        if columnar:
+            body["columns"] = ProgramSearchModel.columns
+        return FastJSONResponse(body)
+    except Exception as e:
+        print("Error in program search controller:", e)
+        return FastJSONResponse({"error": "Database error"}, status_code=500)
+
+
+program_routes = [
+    Route("/api/programs", programs_route, methods=["GET"]),
+    Route("/api/programs/search", search_programs, methods=["GET"]),
+]
@@ -1,4 +1,6 @@
 from flask import Blueprint, request, jsonify
+from Controllers.conditional_requests import versioned_etag
+from Controllers.streaming_responses import export_response
 
 # Importing all relevant program models
 from Models.programTableModel.program_add_model import ProgramAddModel
@@ -12,28 +14,38 @@ program_bp = Blueprint("programs", __name__, url_prefix="/api/programs")
 
 # --- READ (List & Filter) ---
 @program_bp.route("", methods=["GET"])
+@versioned_etag("programs", "colleges")
 def programs_route():
     params = request.args.to_dict()
     order_by = params.pop("order_by", "program_code")
     direction = params.pop("direction", "ASC").upper()
+    # "format=columnar" sends column names once and each row as an array
+    columnar = params.pop("format", None) == "columnar"
     filters = params  # Remaining parameters are treated as filters
 
     try:
-        rows = ProgramModel.get_programs(order_by=order_by, direction=direction, filters=filters)
+        rows = ProgramModel.get_programs(order_by=order_by, direction=direction, filters=filters, columnar=columnar)
         total_count = ProgramModel.get_count(filters)
-        return jsonify({"rows": rows, "totalCount": total_count})
+        body = {"rows": rows, "totalCount": total_count}
+        if columnar:
+            body["columns"] = ProgramModel.columns
+        return jsonify(body)
     except Exception as e:
         print("Error fetching programs:", e)
         return jsonify({"error": "Database error"}), 500
 
 # --- SEARCH ---
 @program_bp.route("/search", methods=["GET"])
+@versioned_etag("programs", "colleges")
 def search_programs():
     q = request.args.get("q", "").strip()
     limit = int(request.args.get("limit", 20))
     offset = int(request.args.get("offset", 0))
     order_by = request.args.get("order_by", "program_code")
     direction = request.args.get("direction", "ASC").upper()
+    # "count=estimated" lets broad (empty-query) searches skip the exact COUNT
+    estimate_count = request.args.get("count") == "estimated"
+    columnar = request.args.get("format") == "columnar"
 
     if direction not in ("ASC", "DESC"):
         direction = "ASC" #
@@ -44,13 +56,38 @@ def search_programs():
             limit=limit,
             offset=offset,
             order_by=order_by,
-            direction=direction
+            direction=direction,
+            estimate_count=estimate_count,
+            columnar=columnar
         )
-        return jsonify({"totalCount": total_count, "rows": rows}), 200
+        body = {"totalCount": total_count, "rows": rows}
+        if columnar:
+            body["columns"] = ProgramSearchModel.columns
+        return jsonify(body), 200
     except Exception as e:
         print("Error in program search controller:", e)
         return jsonify({"error": "Database error"}), 500
 
+# --- EXPORT ---
+@program_bp.route("/export", methods=["GET"])
+def export_programs():
+    """
+    Streams every program matching ?q= (all when empty) as CSV or NDJSON (?format=, default csv).
+    """
+    q = request.args.get("q", "").strip()
+    file_format = request.args.get("format", "csv").lower()
+    order_by = request.args.get("order_by", "program_code")
+    direction = request.args.get("direction", "ASC").upper()
+
+    try:
+        sql, params, columns = ProgramSearchModel.export_query(q, order_by, direction)
+        return export_response(sql, params, columns, file_format, "programs")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print("Error exporting programs:", e)
+        return jsonify({"error": "Database error"}), 500
+
 # --- CREATE ---
 @program_bp.route("/add", methods=["POST"])
 def add_program():
@@ -0,0 +1,100 @@
+import threading
+import time
+from flask import g, request
+from Models.db.db_metrics import Histogram, QueryMetrics
+
+
+class _EndpointStats:
+    __slots__ = ("latency", "statuses", "statements", "db_seconds", "rows", "pool_wait")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.statuses = {}      # status code -> responses
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.pool_wait = 0.0
+
+
+class RequestMetrics:
+    """
+    Per-endpoint request instrumentation for the Flask app.
+
+    Records the duration of every request by Flask endpoint and method,
+    response counts by status, and the database work done on its behalf
+    (statements, time in the database, rows and pool wait, as collected by
+    QueryMetrics during the request).
+    """
+
+    _lock = threading.Lock()
+    _endpoints = {}     # (endpoint, method) -> _EndpointStats
+
+    @staticmethod
+    def record(endpoint, method, status, seconds, query_totals):
+        statements, db_seconds, rows, pool_wait = query_totals
+        key = (endpoint, method)
+        with RequestMetrics._lock:
+            stats = RequestMetrics._endpoints.get(key)
+            if stats is None:
+                stats = RequestMetrics._endpoints[key] = _EndpointStats()
+            stats.latency.observe(seconds)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.statements += statements
+            stats.db_seconds += db_seconds
+            stats.rows += rows
+            stats.pool_wait += pool_wait
+
+    @staticmethod
+    def reset():
+        with RequestMetrics._lock:
+            RequestMetrics._endpoints = {}
+
+    @staticmethod
+    def export(text):
+        """
+        Adds the request series to a MetricsText.
+        """
+        with RequestMetrics._lock:
+            endpoints = [({"endpoint": endpoint, "method": method}, stats)
+                         for (endpoint, method), stats in RequestMetrics._endpoints.items()]
+            latency = [s for labels, stats in endpoints
+                       for s in stats.latency.samples("http_request_duration_seconds", labels)]
+            responses = [({**labels, "status": str(status)}, count)
+                         for labels, stats in endpoints for status, count in stats.statuses.items()]
+            statements = [(labels, stats.statements) for labels, stats in endpoints]
+            db_seconds = [(labels, stats.db_seconds) for labels, stats in endpoints]
+            rows = [(labels, stats.rows) for labels, stats in endpoints]
+            pool_wait = [(labels, stats.pool_wait) for labels, stats in endpoints]
+
+        text.add("http_request_duration_seconds", "histogram", "Request duration by Flask endpoint.", latency)
+        text.add("http_responses_total", "counter", "Responses by Flask endpoint and status code.", responses)
+        text.add("http_request_db_statements_total", "counter", "Statements executed by Flask endpoint.", statements)
+        text.add("http_request_db_seconds_total", "counter", "Time spent executing statements by Flask endpoint.",
+                 db_seconds)
+        text.add("http_request_db_rows_total", "counter", "Rows returned or affected by Flask endpoint.", rows)
+        text.add("http_request_db_pool_wait_seconds_total", "counter",
+                 "Time spent waiting for a pooled connection by Flask endpoint.", pool_wait)
+
+    # ---------- Flask integration ----------
+    @staticmethod
+    def init_app(app):
+        """
+        Registers the hooks timing each request.
+
+        Call before the other init_app hooks: the first before_request runs
+        first and the first after_request runs last, so the measured time
+        includes authentication, the commit and compression.
+        """
+        @app.before_request
+        def _start_request_timer():
+            g._request_started = time.perf_counter()
+
+        @app.after_request
+        def _record_request(response):
+            started = g.pop("_request_started", None)
+            if started is not None:
+                RequestMetrics.record(
+                    request.endpoint or "unmatched", request.method, response.status_code,
+                    time.perf_counter() - started, QueryMetrics.request_totals()
+                )
+            return response
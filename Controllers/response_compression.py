@@ -0,0 +1,160 @@
+import gzip
+import threading
+from flask import request
+from werkzeug.http import parse_accept_header
+from config import Config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from compression import zstd    # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+
+class ResponseCompression:
+    """
+    Compresses /api/ JSON responses above API_COMPRESS_MIN_SIZE bytes.
+
+    The encoding is negotiated from Accept-Encoding. brotli and zstd are used
+    when their packages are installed; gzip is always available. Compressed
+    responses carry a weak ETag, because the bytes differ from the
+    uncompressed representation while the content is the same.
+    Conditional GET (see conditional_requests.py) compares weakly, so a
+    cached copy in either encoding still revalidates to 304.
+    """
+
+    _lock = threading.Lock()
+    _counters = {"compressed": 0, "skipped_small": 0, "bytes_in": 0, "bytes_out": 0}
+    _by_encoding = {}
+
+    # ---------- Negotiation and encoding ----------
+    @staticmethod
+    def available_encodings():
+        """
+        Returns supported encodings in order of preference.
+        """
+        encodings = []
+        if brotli is not None:
+            encodings.append("br")
+        if zstd is not None:
+            encodings.append("zstd")
+        encodings.append("gzip")
+        return encodings
+
+    @staticmethod
+    def negotiate(accept_encoding):
+        """
+        Returns the preferred encoding the client accepts, or None.
+        """
+        if not accept_encoding:
+            return None
+        accepted = parse_accept_header(accept_encoding)
+        for encoding in ResponseCompression.available_encodings():
+            if accepted[encoding]:
+                return encoding
+        return None
+
+    @staticmethod
+    def compress(body, encoding):
+        if encoding == "br":
+            return brotli.compress(body, quality=int(getattr(Config, "API_BROTLI_QUALITY", 4)))
+        if encoding == "zstd":
+            level = int(getattr(Config, "API_ZSTD_LEVEL", 3))
+            if hasattr(zstd, "ZstdCompressor") and not hasattr(zstd, "compress"):
+                return zstd.ZstdCompressor(level=level).compress(body)
+            return zstd.compress(body, level)
+        return gzip.compress(body, compresslevel=int(getattr(Config, "API_GZIP_LEVEL", 6)))
+
+    @staticmethod
+    def encode(body, accept_encoding):
+        """
+        Compresses `body` for a client sending `accept_encoding`.
+
+        Returns:
+            tuple: (encoding, body, eligible). encoding is None when the body is
+                sent as is; eligible is False when the body is below the
+                threshold, i.e. the representation does not vary by encoding.
+        """
+        if len(body) < int(getattr(Config, "API_COMPRESS_MIN_SIZE", 1024)):
+            ResponseCompression._record(None, len(body), len(body), small=True)
+            return None, body, False
+
+        encoding = ResponseCompression.negotiate(accept_encoding)
+        if encoding is None:
+            return None, body, True
+
+        compressed = ResponseCompression.compress(body, encoding)
+        if len(compressed) >= len(body):
+            return None, body, True
+
+        ResponseCompression._record(encoding, len(body), len(compressed))
+        return encoding, compressed, True
+
+    # ---------- Metrics ----------
+    @staticmethod
+    def _record(encoding, bytes_in, bytes_out, small=False):
+        with ResponseCompression._lock:
+            counters = ResponseCompression._counters
+            if small:
+                counters["skipped_small"] += 1
+                return
+            counters["compressed"] += 1
+            counters["bytes_in"] += bytes_in
+            counters["bytes_out"] += bytes_out
+            per_encoding = ResponseCompression._by_encoding.setdefault(
+                encoding, {"responses": 0, "bytes_in": 0, "bytes_out": 0}
+            )
+            per_encoding["responses"] += 1
+            per_encoding["bytes_in"] += bytes_in
+            per_encoding["bytes_out"] += bytes_out
+
+    @staticmethod
+    def stats():
+        """
+        Returns response counts and bytes before/after compression, overall and per encoding.
+        """
+        with ResponseCompression._lock:
+            stats = dict(ResponseCompression._counters)
+            stats["bytes_saved"] = stats["bytes_in"] - stats["bytes_out"]
+            stats["by_encoding"] = {e: dict(c) for e, c in ResponseCompression._by_encoding.items()}
+        return stats
+
+    # ---------- Flask integration ----------
+    @staticmethod
+    def init_app(app):
+        """
+        Registers the after_request hook compressing /api/ JSON responses.
+        """
+        @app.after_request
+        def _compress_api_response(response):
+            if (
+                not request.path.startswith("/api/")
+                or response.mimetype != "application/json"
+                or response.status_code in (204, 304)
+                or response.is_streamed
+                or response.direct_passthrough
+                or "Content-Encoding" in response.headers
+            ):
+                return response
+
+            encoding, body, eligible = ResponseCompression.encode(
+                response.get_data(), request.headers.get("Accept-Encoding", "")
+            )
+            if eligible:
+                response.vary.add("Accept-Encoding")
+            if encoding is None:
+                return response
+
+            response.set_data(body)
+            response.headers["Content-Encoding"] = encoding
+            etag, weak = response.get_etag()
+            if etag and not weak:
+                response.set_etag(etag, weak=True)
+            return response
@@ -0,0 +1,556 @@
+"""
+End-to-end benchmark of the student, program, college and auth routes.
+
+In-process, through Flask's test client (no server needed):
+
+    python -m Controllers.scripts.benchmark --username bench --password bench
+
+Against a running server, with concurrent keep-alive HTTP clients:
+
+    python -m Controllers.scripts.benchmark --url http://localhost:5000 --concurrency 16 --duration 20
+
+Each scenario issues one kind of request from --concurrency workers (each with
+its own logged-in session) until --iterations requests or --duration seconds,
+and reports p50/p95/p99 latency and throughput. Scenarios that write create
+and remove their own rows (IDs starting with 9, codes starting with ZB) in
+untimed setup and teardown steps, so the seeded data is left as it was; see
+Controllers/scripts/seed_data.py for producing that data.
+
+Save a run with --json and pass it to a later run with --baseline to fail
+(exit status 1) when a scenario's p95 regressed by more than --max-regression.
+"""
+import argparse
+import fnmatch
+import http.client
+import io
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+try:
+    from PIL import Image
+except ImportError:  # profile image scenarios are skipped
+    Image = None
+
+
+# ---------- Sessions ----------
+class TestClientSession:
+    """
+    One logged-in user driving the app in-process through Flask's test client.
+    """
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None, data=None, content_type=None):
+        """
+        Returns:
+            tuple: (status_code, response_bytes)
+        """
+        kwargs = {"headers": {"Accept-Encoding": "gzip"}}
+        if body is not None:
+            kwargs["json"] = body
+        elif data is not None:
+            kwargs["data"] = data
+            kwargs["content_type"] = content_type
+        response = self.client.open(path, method=method, **kwargs)
+        # Reading the body runs streamed responses (exports) to completion
+        return response.status_code, response.get_data()
+
+
+class HttpSession:
+    """
+    One logged-in user on a keep-alive connection to a running server.
+    """
+
+    def __init__(self, base_url, timeout=60):
+        parts = urlsplit(base_url)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.cookies = {}
+        self.conn = None
+
+    def request(self, method, path, body=None, data=None, content_type=None):
+        headers = {"Accept-Encoding": "gzip"}
+        if body is not None:
+            data, content_type = json.dumps(body).encode("utf-8"), "application/json"
+        if content_type:
+            headers["Content-Type"] = content_type
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in self.cookies.items())
+
+        # A keep-alive connection the server closed is retried once on a fresh one
+        for attempt in (1, 2):
+            if self.conn is None:
+                self.conn = self.connection_class(self.netloc, timeout=self.timeout)
+            try:
+                self.conn.request(method, self.prefix + path, body=data, headers=headers)
+                response = self.conn.getresponse()
+                payload = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                self.conn.close()
+                self.conn = None
+                if attempt == 2:
+                    raise
+
+        for header in response.headers.get_all("Set-Cookie") or ():
+            name, _, value = header.split(";", 1)[0].partition("=")
+            self.cookies[name.strip()] = value.strip()
+        if response.getheader("Connection", "").lower() == "close":
+            self.conn.close()
+            self.conn = None
+        return response.status, payload
+
+
+def login(session, username, password):
+    status, payload = session.request("POST", "/api/login", body={"username": username, "password": password})
+    if status != 200:
+        raise RuntimeError(f"Login as '{username}' failed ({status}): {payload[:200]!r}")
+
+
+# ---------- Data used by the scenarios ----------
+class BenchmarkData:
+    """
+    Values sampled from the seeded data, plus unique keys for rows the scenarios create.
+    """
+
+    def __init__(self, session, username, password, sample_size=200):
+        self.username = username
+        self.password = password
+        self.rng = random.Random()
+        students = self._sample(session, f"/api/students?limit={sample_size}&fields=id_number,last_name")
+        # Search terms that match real rows, in their real proportions
+        self.surnames = [row["last_name"] for row in students]
+        self.program_codes = [row["program_code"] for row in self._sample(session, "/api/programs")]
+        if not self.program_codes:
+            raise RuntimeError("The database has no programs; run Controllers/scripts/seed_data.py first.")
+        self.image = sample_image()
+
+        # Keys of created rows; randomized so an interrupted run does not collide with the next
+        self._keys = itertools.count(self.rng.randrange(1_000_000, 9_000_000))
+        # Parent college of the programs the scenarios create
+        self.bench_college = self.college_code(self.next_key())
+
+    @staticmethod
+    def _sample(session, path):
+        status, payload = session.request("GET", path)
+        if status != 200:
+            raise RuntimeError(f"GET {path} failed ({status}): {payload[:200]!r}")
+        return json.loads(payload)["rows"]
+
+    def next_key(self):
+        return next(self._keys)
+
+    # "9NNN-NNNN" is outside the seeded years; codes are at most 10 characters
+    @staticmethod
+    def student_id(key):
+        return f"9{key // 10000 % 1000:03d}-{key % 10000:04d}"
+
+    @staticmethod
+    def college_code(key):
+        return f"ZBC{key % 10_000_000:07d}"
+
+    @staticmethod
+    def program_code(key):
+        return f"ZBP{key % 10_000_000:07d}"
+
+    def pick(self, values):
+        return self.rng.choice(values)
+
+    def student(self, key):
+        return {
+            "id_number": self.student_id(key), "first_name": "Bench", "middle_name": "",
+            "last_name": self.pick(self.surnames or ["Mark"]), "gender": "Female", "year_level": 1,
+            "program_code": self.pick(self.program_codes),
+        }
+
+    def import_csv(self, keys):
+        lines = ["id_number,first_name,middle_name,last_name,gender,year_level,program_code"]
+        for key in keys:
+            s = self.student(key)
+            lines.append(f"{s['id_number']},{s['first_name']},,{s['last_name']},{s['gender']},1,{s['program_code']}")
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def sample_image():
+    """
+    A camera-sized JPEG for the profile image scenarios, or None without Pillow.
+    """
+    if Image is None:
+        return None
+    buffer = io.BytesIO()
+    Image.new("RGB", (1024, 768), (90, 140, 200)).save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+# ---------- Scenarios ----------
+class Scenario:
+    """
+    One timed request, with optional untimed setup and teardown around it.
+
+    `path`, `body` and `data` may be callables taking (data, key), where `key`
+    is unique to the iteration; setup and teardown take (session, data, key).
+    """
+
+    def __init__(self, name, method, path, body=None, data=None, content_type=None,
+                 setup=None, teardown=None, expect=(200,), scale=1.0):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+        self.data = data
+        self.content_type = content_type
+        self.setup = setup
+        self.teardown = teardown
+        self.expect = expect
+        # Fraction of --iterations to run (e.g. for logins, which are CPU-bound by design)
+        self.scale = scale
+
+    @staticmethod
+    def _resolve(value, data, key):
+        return value(data, key) if callable(value) else value
+
+    def run(self, session, data, key):
+        """
+        Returns:
+            tuple: (seconds, ok, detail) of the timed request.
+        """
+        if self.setup:
+            self.setup(session, data, key)
+        try:
+            path = self._resolve(self.path, data, key)
+            body = self._resolve(self.body, data, key)
+            raw = self._resolve(self.data, data, key)
+            start = time.perf_counter()
+            status, payload = session.request(self.method, path, body=body, data=raw, content_type=self.content_type)
+            elapsed = time.perf_counter() - start
+            return elapsed, status in self.expect, f"{status}: {payload[:200]!r}"
+        finally:
+            if self.teardown:
+                self.teardown(session, data, key)
+
+
+def _call(session, method, path, body=None, data=None, content_type=None, expect=(200, 201)):
+    status, payload = session.request(method, path, body=body, data=data, content_type=content_type)
+    if status not in expect:
+        raise RuntimeError(f"{method} {path} failed ({status}): {payload[:200]!r}")
+
+
+def _add_student(session, data, key):
+    _call(session, "POST", "/api/students/add", body=data.student(key))
+
+
+def _delete_student(session, data, key):
+    _call(session, "DELETE", "/api/students/delete", body={"id_number": data.student_id(key)}, expect=(200, 400))
+
+
+def _bulk_keys(key, count=20):
+    # The keys of the rows one bulk iteration creates
+    return range(key * count, key * count + count)
+
+
+def _import_students(session, data, key):
+    _call(session, "POST", "/api/students/import?format=csv", data=data.import_csv(_bulk_keys(key)),
+          content_type="text/csv")
+
+
+def _bulk_delete_students(session, data, key):
+    ids = [data.student_id(k) for k in _bulk_keys(key)]
+    _call(session, "DELETE", "/api/students/bulk-delete", body={"id_numbers": ids})
+
+
+def _upload_image(session, data, key):
+    _call(session, "POST", f"/api/students/{data.student_id(key)}/profile-image",
+          data=data.image, content_type="application/octet-stream")
+
+
+def _add_program(session, data, key):
+    _call(session, "POST", "/api/programs/add", body={
+        "program_code": data.program_code(key), "program_name": f"Benchmark Program {key}",
+        "college_code": data.bench_college,
+    })
+
+
+def _delete_program(session, data, key):
+    _call(session, "DELETE", "/api/programs/delete", body={"program_code": data.program_code(key)}, expect=(200, 400))
+
+
+def _add_college(session, data, key):
+    _call(session, "POST", "/api/colleges/add", body={
+        "college_code": data.college_code(key), "college_name": f"Benchmark College {key}",
+    })
+
+
+def _delete_college(session, data, key):
+    _call(session, "DELETE", "/api/colleges/delete", body={"college_code": data.college_code(key)}, expect=(200, 400))
+
+
+def _both(*steps):
+    def run(session, data, key):
+        for step in steps:
+            step(session, data, key)
+    return run
+
+
+def scenarios():
+    """
+    Every benchmarked request, named "<blueprint>.<case>".
+    """
+    def search_term(data, key):
+        return quote(data.pick(data.surnames or ["a"]))
+
+    cases = [
+        # --- auth ---
+        Scenario("auth.login", "POST", "/api/login", body=lambda d, k: {"username": d.username, "password": d.password},
+                 scale=0.1),
+        Scenario("auth.logout", "POST", "/api/logout",
+                 teardown=lambda s, d, k: login(s, d.username, d.password), scale=0.1),
+
+        # --- students: reads ---
+        Scenario("students.list", "GET", "/api/students?limit=20"),
+        Scenario("students.list_filtered", "GET",
+                 lambda d, k: f"/api/students?limit=20&program_code={quote(d.pick(d.program_codes))}"),
+        Scenario("students.list_sorted_desc", "GET", "/api/students?limit=20&order_by=last_name&direction=DESC"),
+        Scenario("students.list_deep_offset", "GET", "/api/students?limit=20&offset=100000"),
+        Scenario("students.list_keyset", "GET", "/api/students?limit=20&cursor="),
+        Scenario("students.list_columnar", "GET",
+                 "/api/students?limit=100&format=columnar&fields=id_number,first_name,last_name"),
+        Scenario("students.search", "GET", lambda d, k: f"/api/students/search?limit=20&q={search_term(d, k)}"),
+        Scenario("students.search_keyset", "GET",
+                 lambda d, k: f"/api/students/search?limit=20&cursor=&q={search_term(d, k)}"),
+        Scenario("students.search_empty_estimated", "GET", "/api/students/search?limit=20&count=estimated"),
+        Scenario("students.export_program_csv", "GET",
+                 lambda d, k: f"/api/students/export?format=csv&program_code={quote(d.pick(d.program_codes))}",
+                 scale=0.2),
+
+        # --- students: writes ---
+        Scenario("students.add", "POST", "/api/students/add", body=lambda d, k: d.student(k),
+                 teardown=_delete_student, expect=(201,)),
+        Scenario("students.update", "PUT", "/api/students/update",
+                 body=lambda d, k: {"id_number": d.student_id(k), "new_year_level": 2},
+                 setup=_add_student, teardown=_delete_student),
+        Scenario("students.delete", "DELETE", "/api/students/delete", body=lambda d, k: {"id_number": d.student_id(k)},
+                 setup=_add_student),
+        Scenario("students.import_20", "POST", "/api/students/import?format=csv",
+                 data=lambda d, k: d.import_csv(_bulk_keys(k)), content_type="text/csv",
+                 teardown=_bulk_delete_students),
+        Scenario("students.bulk_update_20", "PUT", "/api/students/bulk-update",
+                 body=lambda d, k: {"id_numbers": [d.student_id(x) for x in _bulk_keys(k)], "patch": {"year_level": 3}},
+                 setup=_import_students, teardown=_bulk_delete_students),
+        Scenario("students.bulk_delete_20", "DELETE", "/api/students/bulk-delete",
+                 body=lambda d, k: {"id_numbers": [d.student_id(x) for x in _bulk_keys(k)]},
+                 setup=_import_students),
+        Scenario("students.profile_image_upload", "POST", lambda d, k: f"/api/students/{d.student_id(k)}/profile-image",
+                 data=lambda d, k: d.image, content_type="application/octet-stream",
+                 setup=_add_student, teardown=_delete_student, scale=0.2),
+        Scenario("students.profile_image_delete", "DELETE",
+                 lambda d, k: f"/api/students/{d.student_id(k)}/profile-image",
+                 setup=_both(_add_student, _upload_image), teardown=_delete_student, scale=0.2),
+
+        # --- programs ---
+        Scenario("programs.list", "GET", "/api/programs"),
+        Scenario("programs.list_columnar", "GET", "/api/programs?format=columnar"),
+        Scenario("programs.search", "GET", "/api/programs/search?limit=20&q=science"),
+        Scenario("programs.export_csv", "GET", "/api/programs/export?format=csv", scale=0.2),
+        Scenario("programs.add", "POST", "/api/programs/add",
+                 body=lambda d, k: {"program_code": d.program_code(k), "program_name": f"Benchmark Program {k}",
+                                    "college_code": d.bench_college},
+                 teardown=_delete_program, expect=(201,)),
+        Scenario("programs.update", "PUT", "/api/programs/update",
+                 body=lambda d, k: {"program_code": d.program_code(k), "new_program_name": f"Renamed Program {k}",
+                                    "new_college_code": d.bench_college},
+                 setup=_add_program, teardown=_delete_program),
+        Scenario("programs.delete", "DELETE", "/api/programs/delete",
+                 body=lambda d, k: {"program_code": d.program_code(k)}, setup=_add_program),
+
+        # --- colleges ---
+        Scenario("colleges.list", "GET", "/api/colleges"),
+        Scenario("colleges.search", "GET", "/api/colleges/search?limit=20&q=college"),
+        Scenario("colleges.export_csv", "GET", "/api/colleges/export?format=csv", scale=0.2),
+        Scenario("colleges.add", "POST", "/api/colleges/add",
+                 body=lambda d, k: {"college_code": d.college_code(k), "college_name": f"Benchmark College {k}"},
+                 teardown=_delete_college, expect=(201,)),
+        Scenario("colleges.update", "PUT", "/api/colleges/update",
+                 body=lambda d, k: {"college_code": d.college_code(k), "new_college_name": f"Renamed College {k}"},
+                 setup=_add_college, teardown=_delete_college),
+        Scenario("colleges.delete", "DELETE", "/api/colleges/delete",
+                 body=lambda d, k: {"college_code": d.college_code(k)}, setup=_add_college),
+    ]
+    return cases
+
+
+# ---------- Running and reporting ----------
+def percentile(ordered, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))]
+
+
+def run_scenario(scenario, sessions, data, iterations, duration, warmup):
+    """
+    Runs one scenario on every session concurrently.
+
+    Returns:
+        dict: requests, errors, p50/p95/p99/mean latency (ms) and throughput (requests/s).
+    """
+    for _ in range(warmup):
+        scenario.run(sessions[0], data, data.next_key())
+
+    target = max(1, int(iterations * scenario.scale))
+    issued = itertools.count()
+    lock = threading.Lock()
+    timings, errors, failures = [], [0], []
+    deadline = time.perf_counter() + duration if duration else None
+
+    def worker(session):
+        while next(issued) < target and (deadline is None or time.perf_counter() < deadline):
+            try:
+                seconds, ok, detail = scenario.run(session, data, data.next_key())
+            except Exception as e:
+                seconds, ok, detail = None, False, str(e)
+            with lock:
+                if ok:
+                    timings.append(seconds)
+                else:
+                    errors[0] += 1
+                    if len(failures) < 3:
+                        failures.append(detail)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(session,)) for session in sessions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    timings.sort()
+    ms = lambda seconds: round(seconds * 1000, 3) if seconds is not None else None
+    return {
+        "requests": len(timings) + errors[0],
+        "errors": errors[0],
+        "p50_ms": ms(percentile(timings, 0.50)),
+        "p95_ms": ms(percentile(timings, 0.95)),
+        "p99_ms": ms(percentile(timings, 0.99)),
+        "mean_ms": ms(sum(timings) / len(timings)) if timings else None,
+        "throughput_rps": round(len(timings) / wall, 2) if wall > 0 else None,
+        "failures": failures,
+    }
+
+
+def print_report(results, regressions=()):
+    header = f"{'scenario':<36}{'requests':>9}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}"
+    print(header)
+    print("-" * len(header))
+    fmt = lambda value: "-" if value is None else f"{value:.2f}"
+    for name, r in results.items():
+        flag = "  REGRESSED" if name in regressions else ""
+        print(f"{name:<36}{r['requests']:>9}{r['errors']:>8}{fmt(r['p50_ms']):>10}{fmt(r['p95_ms']):>10}"
+              f"{fmt(r['p99_ms']):>10}{fmt(r['throughput_rps']):>10}{flag}")
+        for failure in r["failures"]:
+            print(f"    ! {failure}")
+
+
+def find_regressions(results, baseline, max_regression, noise_ms=1.0):
+    """
+    Returns the scenarios whose p95 grew by more than `max_regression` (a fraction)
+    and by more than `noise_ms` over the baseline run.
+    """
+    regressed = []
+    for name, result in results.items():
+        before = baseline.get(name, {}).get("p95_ms")
+        after = result.get("p95_ms")
+        if before is None or after is None:
+            continue
+        if after > before * (1 + max_regression) and after - before > noise_ms:
+            regressed.append(name)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the student, program, college and auth routes.")
+    parser.add_argument("--url", help="base URL of a running server; default runs in-process with the test client")
+    parser.add_argument("--username", default="bench")
+    parser.add_argument("--password", default="bench")
+    parser.add_argument("--concurrency", type=int, default=1, help="concurrent sessions per scenario")
+    parser.add_argument("--iterations", type=int, default=200, help="requests per scenario (scaled for slow ones)")
+    parser.add_argument("--duration", type=float, default=0, help="stop each scenario after this many seconds")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed requests before each scenario")
+    parser.add_argument("--only", default="*", help="comma-separated scenario name patterns, e.g. 'students.*'")
+    parser.add_argument("--list", action="store_true", help="list scenario names and exit")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="results file of an earlier run to compare p95 against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed p95 growth over the baseline")
+    args = parser.parse_args()
+
+    patterns = [p.strip() for p in args.only.split(",") if p.strip()]
+    selected = [s for s in scenarios() if any(fnmatch.fnmatch(s.name, p) for p in patterns)]
+    if args.list:
+        print("\n".join(s.name for s in selected))
+        return 0
+
+    if args.url:
+        new_session = lambda: HttpSession(args.url)
+    else:
+        from Controllers.app import app
+        new_session = lambda: TestClientSession(app)
+
+    sessions = [new_session() for _ in range(max(1, args.concurrency))]
+    for session in sessions:
+        login(session, args.username, args.password)
+
+    data = BenchmarkData(sessions[0], args.username, args.password)
+    if data.image is None:
+        selected = [s for s in selected if "profile_image" not in s.name]
+        print("Pillow is not installed; skipping the profile image scenarios.")
+
+    _call(sessions[0], "POST", "/api/colleges/add",
+          body={"college_code": data.bench_college, "college_name": "Benchmark College"})
+    results = {}
+    try:
+        for scenario in selected:
+            print(f"Running {scenario.name}...", file=sys.stderr)
+            results[scenario.name] = run_scenario(
+                scenario, sessions, data, args.iterations, args.duration, args.warmup
+            )
+    finally:
+        _call(sessions[0], "DELETE", "/api/colleges/delete", body={"college_code": data.bench_college},
+              expect=(200, 400))
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = find_regressions(results, json.load(f)["results"], args.max_regression)
+
+    print_report(results, regressions)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "mode": "http" if args.url else "test_client",
+                "url": args.url,
+                "concurrency": len(sessions),
+                "iterations": args.iterations,
+                "duration": args.duration,
+                "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "results": results,
+            }, f, indent=2)
+
+    if regressions:
+        print(f"\np95 regressed by more than {args.max_regression:.0%} in: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
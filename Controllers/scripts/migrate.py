@@ -0,0 +1,41 @@
+"""
+Applies the schema migrations in Models/migrations, or reports their status.
+
+    python -m Controllers.scripts.migrate              # apply everything pending
+    python -m Controllers.scripts.migrate --dry-run    # list what would be applied
+    python -m Controllers.scripts.migrate --target 3   # apply up to version 3
+    python -m Controllers.scripts.migrate status
+"""
+import argparse
+import sys
+
+from Models.db.db_migrations import MigrationError, Migrations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply or inspect schema migrations.")
+    parser.add_argument("command", nargs="?", choices=("apply", "status"), default="apply")
+    parser.add_argument("--target", type=int, help="highest version to apply")
+    parser.add_argument("--dry-run", action="store_true", help="only list the migrations that would be applied")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "status":
+            entries = Migrations.status()
+            for entry in entries:
+                applied_at = entry["applied_at"].isoformat(timespec="seconds") if entry["applied_at"] else ""
+                print(f"{entry['version']:04d}  {entry['state']:<8}  {entry['name']:<32}  {applied_at}")
+            # Non-zero when the schema is not up to date, so deploy checks can use it
+            return 0 if all(entry["state"] == "applied" for entry in entries) else 1
+
+        applied = Migrations.apply(target=args.target, dry_run=args.dry_run)
+        if not applied:
+            print("Schema is up to date.")
+        return 0
+    except MigrationError as e:
+        print("Migration error:", e)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+Seeds the database with synthetic colleges, programs and students at production-like volumes.
+
+    python -m Controllers.scripts.migrate
+    python -m Controllers.scripts.seed_data --colleges 50 --programs 2000 --students 1000000
+
+Rows are generated deterministically from --seed and bulk-loaded with COPY
+through temporary staging tables, so a run can be repeated (rows that already
+exist are skipped) and two runs with the same arguments produce the same data.
+Student names follow skewed (Zipf-like) frequency lists, most students have a
+middle name, and enrollment is concentrated in the popular programs and lower
+year levels, so searches and filters see realistic selectivity.
+
+The per-row search-document trigger is disabled while students are loaded and
+the documents are rebuilt in one statement afterwards; the statement-level
+enrollment_stats and table_versions triggers stay enabled.
+"""
+import argparse
+import itertools
+import random
+import time
+from datetime import date
+
+from Models.db.db_utils import DBUtils
+from Models.studentTableModel.student_import_model import StudentImportModel, _CsvRowStream
+from Models.studentTableModel.student_search_index import StudentSearchIndex
+from Models.userModel.user_model import UserModel
+
+FIELDS = [
+    "Engineering", "Computer Studies", "Arts and Social Sciences", "Science and Mathematics",
+    "Business Administration", "Education", "Nursing", "Health Sciences", "Agriculture",
+    "Architecture", "Law", "Public Administration", "Fine Arts", "Music", "Forestry",
+    "Fisheries", "Hospitality Management", "Criminal Justice", "Veterinary Medicine",
+    "Marine Sciences", "Medicine", "Pharmacy", "Industrial Technology", "Mass Communication",
+    "Environmental Studies",
+]
+
+SUBJECTS = [
+    "Civil Engineering", "Mechanical Engineering", "Electrical Engineering", "Chemical Engineering",
+    "Computer Science", "Information Technology", "Information Systems", "Mathematics", "Statistics",
+    "Physics", "Chemistry", "Biology", "Marine Biology", "Psychology", "Sociology", "Political Science",
+    "History", "Philosophy", "English", "Filipino", "Economics", "Accountancy", "Marketing",
+    "Financial Management", "Entrepreneurship", "Elementary Education", "Secondary Education",
+    "Physical Education", "Nursing", "Nutrition", "Public Health", "Agronomy", "Animal Science",
+    "Architecture", "Interior Design", "Fine Arts", "Music", "Forestry", "Fisheries",
+    "Hotel Management", "Tourism", "Criminology", "Journalism", "Broadcasting", "Environmental Science",
+]
+
+DEGREES = ["Bachelor of Science in", "Bachelor of Arts in", "Master of Science in", "Master of Arts in",
+           "Doctor of Philosophy in"]
+DEGREE_CODES = ["BS", "AB", "MS", "MA", "PHD"]
+DEGREE_WEIGHTS = [60, 25, 8, 5, 2]
+
+# Most frequent first, as in real name lists; sampled with Zipf-like weights
+MALE_NAMES = [
+    "John", "Mark", "Michael", "James", "Joshua", "Christian", "Daniel", "Paolo", "Miguel", "Carlo",
+    "Angelo", "Gabriel", "Jose", "Juan", "Rafael", "Kenneth", "Kevin", "Jerome", "Francis", "Patrick",
+    "Vincent", "Ryan", "Adrian", "Nathan", "Ian", "Jericho", "Emmanuel", "Ramon", "Luis", "Antonio",
+    "Benedict", "Dominic", "Elijah", "Noel", "Arnel", "Rodel", "Jomar", "Aldrin", "Reymark", "Jayson",
+]
+FEMALE_NAMES = [
+    "Maria", "Angel", "Kristine", "Jasmine", "Nicole", "Camille", "Andrea", "Patricia", "Bea", "Angela",
+    "Sofia", "Isabel", "Princess", "Joy", "Grace", "Mary", "Ana", "Erika", "Hannah", "Katrina",
+    "Mae", "Rhea", "Lovely", "Janine", "Ella", "Trisha", "Bianca", "Clarisse", "Danica", "Faith",
+    "Gwen", "Hazel", "Irene", "Jessa", "Kaye", "Liza", "Mika", "Nina", "Pauline", "Queenie",
+]
+SURNAMES = [
+    "Santos", "Reyes", "Cruz", "Bautista", "Garcia", "Mendoza", "Torres", "Flores", "Gonzales", "Ramos",
+    "Villanueva", "Rivera", "Aquino", "Castillo", "Fernandez", "Lopez", "Perez", "Navarro", "Dela Cruz",
+    "Del Rosario", "Santiago", "Morales", "Domingo", "Gutierrez", "Pascual", "Salazar", "Tolentino",
+    "Manalo", "Aguilar", "Mercado", "Soriano", "Valdez", "Castro", "Ocampo", "Sarmiento", "Marquez",
+    "Rosales", "Jimenez", "Dizon", "Velasco", "Padilla", "Lim", "Tan", "Sy", "Uy", "Co", "Go", "Chua",
+    "Macaraeg", "Abellera", "Balagtas", "Dimaculangan", "Magbanua", "Pacquiao", "Lumbre", "Sabado",
+    "Alonzo", "Ybanez", "Quijano", "Zamora",
+]
+
+GENDERS = ["Male", "Female"]
+YEAR_LEVELS = [1, 2, 3, 4, 5]
+YEAR_LEVEL_WEIGHTS = [32, 26, 21, 17, 4]
+
+# id_number is "YYYY-NNNN": at most this many students per year prefix
+IDS_PER_YEAR = 10000
+
+
+def zipf_weights(count, exponent=1.0):
+    """
+    Cumulative weights for random.choices where rank r has weight 1 / r**exponent.
+    """
+    return list(itertools.accumulate(1.0 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+def acronym(name):
+    return "".join(word[0] for word in name.replace(" and ", " ").replace(" in ", " ").split() if word[0].isupper())
+
+
+def generate_colleges(count):
+    """
+    Yields (college_code, college_name); fields repeat as numbered campuses beyond len(FIELDS).
+    """
+    seen = {}
+    for n in range(count):
+        field = FIELDS[n % len(FIELDS)]
+        campus = n // len(FIELDS)
+        name = f"College of {field}" + (f" - Campus {campus + 1}" if campus else "")
+        # Acronyms collide (Music, Medicine), so repeats get a number
+        code = f"C{acronym(field)}"
+        seen[code] = seen.get(code, 0) + 1
+        yield (code if seen[code] == 1 else f"{code}{seen[code]}"), name
+
+
+def generate_programs(count, college_codes, rng):
+    """
+    Yields (program_code, program_name, college_code), spread round-robin over the colleges.
+    """
+    for n in range(count):
+        degree = rng.choices(range(len(DEGREES)), weights=DEGREE_WEIGHTS)[0]
+        subject = SUBJECTS[n % len(SUBJECTS)]
+        track = n // len(SUBJECTS)
+        name = f"{DEGREES[degree]} {subject}" + (f" (Track {track + 1})" if track else "")
+        yield f"{DEGREE_CODES[degree]}{n + 1:05d}", name, college_codes[n % len(college_codes)]
+
+
+def generate_students(count, program_codes, rng, first_year):
+    """
+    Yields student rows in StudentImportModel.COLUMNS order.
+    """
+    male_weights = zipf_weights(len(MALE_NAMES))
+    female_weights = zipf_weights(len(FEMALE_NAMES))
+    surname_weights = zipf_weights(len(SURNAMES), 0.9)
+    # A few programs hold most of the enrollment
+    program_weights = zipf_weights(len(program_codes), 0.8)
+
+    for n in range(count):
+        gender = rng.choice(GENDERS)
+        if gender == "Male":
+            first_name = rng.choices(MALE_NAMES, cum_weights=male_weights)[0]
+        else:
+            first_name = rng.choices(FEMALE_NAMES, cum_weights=female_weights)[0]
+        # Roughly one in five have a compound first name
+        if rng.random() < 0.2:
+            pool, weights = (MALE_NAMES, male_weights) if gender == "Male" else (FEMALE_NAMES, female_weights)
+            first_name += " " + rng.choices(pool, cum_weights=weights)[0]
+        middle_name = rng.choices(SURNAMES, cum_weights=surname_weights)[0] if rng.random() < 0.85 else None
+        last_name = rng.choices(SURNAMES, cum_weights=surname_weights)[0]
+
+        yield (
+            f"{first_year - n // IDS_PER_YEAR:04d}-{n % IDS_PER_YEAR:04d}",
+            first_name,
+            middle_name,
+            last_name,
+            gender,
+            rng.choices(YEAR_LEVELS, weights=YEAR_LEVEL_WEIGHTS)[0],
+            rng.choices(program_codes, cum_weights=program_weights)[0],
+            None,
+        )
+
+
+def load(table, columns, key, rows):
+    """
+    Bulk-loads rows through a temporary staging table, skipping keys that already exist.
+
+    Returns:
+        int: Number of rows inserted.
+    """
+    column_list = ", ".join(columns)
+    with DBUtils.transaction():
+        DBUtils.execute_query(f"CREATE TEMP TABLE seed_staging ON COMMIT DROP AS "
+                              f"SELECT {column_list} FROM {table} WITH NO DATA")
+        DBUtils.copy_expert(f"COPY seed_staging ({column_list}) FROM STDIN WITH (FORMAT csv)", _CsvRowStream(iter(rows)))
+        inserted = DBUtils.execute_query(f"""
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM seed_staging
+            ON CONFLICT ({key}) DO NOTHING
+            RETURNING 1
+        """, fetch=True)
+        # ON COMMIT DROP only applies to the outermost transaction
+        DBUtils.execute_query("DROP TABLE seed_staging")
+    return len(inserted)
+
+
+def search_trigger_exists():
+    rows = DBUtils.execute_query(
+        "SELECT 1 FROM pg_trigger WHERE tgname = 'trg_students_search_document' AND NOT tgisinternal", fetch=True
+    )
+    return bool(rows)
+
+
+def seed(colleges, programs, students, seed_value=42, batch_size=100000, truncate=False):
+    rng = random.Random(seed_value)
+    first_year = date.today().year
+    if students > first_year * IDS_PER_YEAR:
+        raise ValueError(f"At most {first_year * IDS_PER_YEAR} students fit the YYYY-NNNN id format.")
+
+    if truncate:
+        print("Truncating students, programs and colleges...")
+        with DBUtils.transaction():
+            DBUtils.execute_query("TRUNCATE students, programs, colleges CASCADE")
+
+    started = time.perf_counter()
+    college_rows = list(generate_colleges(colleges))
+    inserted = load("colleges", ("college_code", "college_name"), "college_code", college_rows)
+    print(f"colleges: {inserted} inserted ({len(college_rows) - inserted} already present)")
+
+    program_rows = list(generate_programs(programs, [row[0] for row in college_rows], rng))
+    inserted = load("programs", ("program_code", "program_name", "college_code"), "program_code", program_rows)
+    print(f"programs: {inserted} inserted ({len(program_rows) - inserted} already present)")
+
+    if not students:
+        return
+
+    program_codes = [row[0] for row in program_rows] or [
+        row[0] for row in DBUtils.execute_query("SELECT program_code FROM programs ORDER BY program_code", fetch=True)
+    ]
+    if not program_codes:
+        raise ValueError("Students need at least one program.")
+
+    rows = generate_students(students, program_codes, rng, first_year)
+    search_trigger = search_trigger_exists()
+    total = 0
+    # One transaction, so a failed load also undoes the trigger change
+    with DBUtils.transaction():
+        if search_trigger:
+            DBUtils.execute_query("ALTER TABLE students DISABLE TRIGGER trg_students_search_document")
+
+        # Batches bound the staging table and the rows held in memory
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            total += load("students", StudentImportModel.COLUMNS, "id_number", batch)
+            rate = total / max(time.perf_counter() - started, 1e-9)
+            print(f"students: {total} inserted ({rate:,.0f} rows/s)")
+
+        if search_trigger:
+            DBUtils.execute_query("ALTER TABLE students ENABLE TRIGGER trg_students_search_document")
+            print("Rebuilding student search documents...")
+            StudentSearchIndex.rebuild()
+
+    print("Analyzing...")
+    DBUtils.execute_query("ANALYZE colleges; ANALYZE programs; ANALYZE students")
+    print(f"Done in {time.perf_counter() - started:.1f}s.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the database with synthetic data.")
+    parser.add_argument("--colleges", type=int, default=50)
+    parser.add_argument("--programs", type=int, default=2000)
+    parser.add_argument("--students", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=42, help="random seed; equal seeds give equal data")
+    parser.add_argument("--batch-size", type=int, default=100000, help="students per COPY")
+    parser.add_argument("--truncate", action="store_true", help="delete existing colleges, programs and students first")
+    parser.add_argument("--username", help="also create this login (e.g. for the benchmark)")
+    parser.add_argument("--password", help="password for --username")
+    args = parser.parse_args()
+
+    seed(args.colleges, args.programs, args.students, args.seed, args.batch_size, args.truncate)
+
+    if args.username:
+        if UserModel.get_user_by_username(args.username):
+            print(f"User '{args.username}' already exists.")
+        else:
+            UserModel.create_user(args.username, args.password or args.username)
+            print(f"User '{args.username}' created.")
+
+
+if __name__ == "__main__":
+    main()
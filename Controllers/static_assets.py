@@ -0,0 +1,120 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from flask import request, make_response
+
+try:
+    import brotli
+except ImportError:  # Brotli variants are only served when pre-built or when the package is installed
+    brotli = None
+
+# Vite emits content-hashed names such as assets/index-B3x9_kQz.js
+HASHED_ASSET = re.compile(r"(^|/)assets/.+[-.][A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml",
+                      "application/wasm", "application/xml", "application/manifest+json")
+
+# Preference order when the client accepts several encodings
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class StaticAsset:
+    __slots__ = ("path", "body", "mimetype", "etag", "immutable", "variants")
+
+    def __init__(self, path, body, mimetype, immutable):
+        self.path = path
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.immutable = immutable
+        self.variants = {}      # encoding -> compressed body
+
+
+class StaticManifest:
+    """
+    In-memory index of the built SPA (Views/dist), loaded once at startup.
+
+    Every file is read, hashed for its ETag and, when compressible, paired
+    with gzip/brotli variants: pre-built .gz/.br files from the build are
+    used as they are, otherwise the variants are compressed here once. A
+    request is then a dictionary lookup with no filesystem access.
+    Content-hashed bundles under assets/ are served as immutable for a year;
+    everything else, including index.html, is revalidated by ETag.
+    """
+
+    MIN_COMPRESS_SIZE = 1024
+
+    def __init__(self, root):
+        self.root = root
+        self.assets = {}
+        self.load()
+
+    def load(self):
+        assets = {}
+        if os.path.isdir(self.root):
+            for directory, _, files in os.walk(self.root):
+                for name in files:
+                    if name.endswith((".gz", ".br")):
+                        continue
+                    full_path = os.path.join(directory, name)
+                    path = os.path.relpath(full_path, self.root).replace(os.sep, "/")
+                    assets[path] = self._load_asset(full_path, path)
+        self.assets = assets
+
+    def _load_asset(self, full_path, path):
+        with open(full_path, "rb") as f:
+            body = f.read()
+        mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        asset = StaticAsset(path, body, mimetype, bool(HASHED_ASSET.search(path)))
+
+        if not mimetype.startswith(COMPRESSIBLE_TYPES) or len(body) < self.MIN_COMPRESS_SIZE:
+            return asset
+
+        for encoding, suffix in ENCODINGS:
+            if os.path.isfile(full_path + suffix):
+                with open(full_path + suffix, "rb") as f:
+                    asset.variants[encoding] = f.read()
+            elif encoding == "gzip":
+                asset.variants[encoding] = gzip.compress(body, compresslevel=9, mtime=0)
+            elif encoding == "br" and brotli is not None:
+                asset.variants[encoding] = brotli.compress(body, quality=11)
+
+        # Keep a variant only when it actually saves bytes
+        asset.variants = {e: v for e, v in asset.variants.items() if len(v) < len(body)}
+        return asset
+
+    def get(self, path):
+        return self.assets.get(path)
+
+    def response(self, asset):
+        """
+        Builds the response for `asset`, negotiating Content-Encoding and honouring If-None-Match.
+        """
+        encoding = None
+        for candidate, _ in ENCODINGS:
+            if candidate in asset.variants and request.accept_encodings[candidate]:
+                encoding = candidate
+                break
+
+        # Each representation needs its own validator
+        etag = f"{asset.etag}-{encoding}" if encoding else asset.etag
+
+        if request.if_none_match.contains(etag):
+            response = make_response("", 304)
+        else:
+            body = asset.variants[encoding] if encoding else asset.body
+            response = make_response(body)
+            response.mimetype = asset.mimetype
+            if encoding:
+                response.headers["Content-Encoding"] = encoding
+
+        response.set_etag(etag)
+        if asset.variants:
+            response.headers["Vary"] = "Accept-Encoding"
+        if asset.immutable:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "public, no-cache"
+        return response
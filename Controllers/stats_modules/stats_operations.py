@@ -0,0 +1,16 @@
+from flask import Blueprint, jsonify
+from Controllers.conditional_requests import versioned_etag
+
+from Models.statsModel.stats_model import StatsModel
+
+stats_bp = Blueprint("stats", __name__, url_prefix="/api/stats")
+
+# --- READ ---
+@stats_bp.route("", methods=["GET"])
+@versioned_etag("students", "programs", "colleges")
+def get_stats():
+    try:
+        return jsonify(StatsModel.get_stats())
+    except Exception as e:
+        print("Error fetching stats:", e)
+        return jsonify({"error": "Database error"}), 500
@@ -0,0 +1,66 @@
+import csv
+import io
+from flask import Response
+from Controllers.json_provider import dumps_bytes
+from Models.db.db_utils import DBUtils
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+# ----------------- Encoders -----------------
+def _csv_chunks(columns, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, when nothing matched
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(columns, batches):
+    # Same encoder as the JSON API responses, so values serialize identically
+    for rows in batches:
+        yield b"".join(dumps_bytes(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+# ----------------- Response -----------------
+def export_response(query, params, columns, file_format, filename):
+    """
+    Streams the result of `query` as a CSV or NDJSON download.
+
+    Rows are read from a server-side cursor in batches and encoded as they
+    arrive, so memory use does not grow with the export size. The first batch
+    is fetched before the response starts, so a failing query still produces
+    a proper error status instead of a truncated download.
+
+    Raises:
+        ValueError: If file_format is not supported.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{file_format}'. Use csv or ndjson.")
+    mimetype, extension = EXPORT_FORMATS[file_format]
+
+    batches = DBUtils.stream_query(query, params, replica=True)
+    first = next(batches, None)
+
+    def all_batches():
+        try:
+            if first is not None:
+                yield first
+            yield from batches
+        finally:
+            # Returns the connection if the client disconnects mid-download
+            batches.close()
+
+    encode = _csv_chunks if file_format == "csv" else _ndjson_chunks
+    response = Response(encode(columns, all_batches()), mimetype=mimetype)
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}.{extension}"'
+    response.headers["Cache-Control"] = "no-store"
+    return response
@@ -0,0 +1,117 @@
+import asyncio
+from starlette.routing import Route
+from Controllers.async_requests import async_login_required, async_versioned_etag, async_compressed, FastJSONResponse
+from Models.studentTableModel.student_async_model import StudentAsyncModel
+from Models.studentTableModel.student_table_model import StudentModel
+from Models.studentTableModel.student_search_model import StudentSearchModel
+from Models.db.db_pagination import InvalidCursorError
+
+# Async versions of the student read routes, served by the ASGI app (asgi.py)
+
+# --- READ (List & Filter) ---
+@async_login_required
+@async_compressed
+@async_versioned_etag("students", "programs", "colleges")
+async def students_route(request):
+    params = dict(request.query_params)
+    limit = int(params.pop("limit", 20))
+    offset = int(params.pop("offset", 0))
+    order_by = params.pop("order_by", "id_number")
+    direction = params.pop("direction", "ASC").upper()
+    # Presence of "cursor" (even empty, for the first page) selects keyset pagination
+    cursor = params.pop("cursor", None)
+    # "format=columnar" sends column names once and each row as an array
+    columnar = params.pop("format", None) == "columnar"
+    # "fields=a,b" narrows the columns returned (and the joins needed)
+    fields = params.pop("fields", None)
+    filters = params
+
+    try:
+        fields = StudentModel.parse_fields(fields)
+
+        # The page and the count run concurrently on two pooled connections
+        if cursor is not None:
+            (rows, next_cursor), total_count = await asyncio.gather(
+                StudentAsyncModel.get_students_after(order_by, direction, limit, cursor, filters, columnar, fields),
+                StudentAsyncModel.get_count(filters)
+            )
+            body = {"rows": rows, "totalCount": total_count, "nextCursor": next_cursor}
+        else:
+            rows, total_count = await asyncio.gather(
+                StudentAsyncModel.get_students(order_by, direction, limit, offset, filters, columnar, fields),
+                StudentAsyncModel.get_count(filters)
+            )
+            body = {"rows": rows, "totalCount": total_count}
+
+        if columnar:
+            body["columns"] = list(fields)
+        return FastJSONResponse(body)
+    except (InvalidCursorError, ValueError) as e:
+        return FastJSONResponse({"error": str(e)}, status_code=400)
+    except Exception as e:
+        print("Error fetching students:", e)
+        return FastJSONResponse({"error": "Database error"}, status_code=500)
+
+# --- SEARCH ---
+@async_login_required
+@async_compressed
+@async_versioned_etag("students", "programs", "colleges")
+async def search_students(request):
+    args = request.query_params
+    q = args.get("q", "").strip()
+    limit = int(args.get("limit", 20))
+    offset = int(args.get("offset", 0))
+    order_by = args.get("order_by", "id_number")
+    direction = args.get("direction", "ASC").upper()
+    # "count=estimated" lets broad (empty-query) searches skip the exact COUNT
+    estimate_count = args.get("count") == "estimated"
+    cursor = args.get("cursor")
+    # "format=columnar" sends column names once and each row as an array
+    columnar = args.get("format") == "columnar"
+    fields = args.get("fields")
+
+    if direction not in ("ASC", "DESC"):
+        direction = "ASC"
+
+    try:
+        fields = StudentModel.parse_fields(fields, allowed=StudentSearchModel.columns)
+
+        if cursor is not None:
+            total_count, rows, next_cursor = await StudentAsyncModel.search_students_after(
+                query=q,
+                limit=limit,
+                cursor=cursor,
+                order_by=order_by,
+                direction=direction,
+                estimate_count=estimate_count,
+                columnar=columnar,
+                fields=fields
+            )
+            body = {"totalCount": total_count, "rows": rows, "nextCursor": next_cursor}
+        else:
+            total_count, rows = await StudentAsyncModel.search_students(
+                query=q,
+                limit=limit,
+                offset=offset,
+                order_by=order_by,
+                direction=direction,
+                estimate_count=estimate_count,
+                columnar=columnar,
+                fields=fields
+            )
+            body = {"totalCount": total_count, "rows": rows}
+
+        if columnar:
+            body["columns"] = list(fields)
+        return FastJSONResponse(body)
+    except (InvalidCursorError, ValueError) as e:
+        return FastJSONResponse({"error": str(e)}, status_code=400)
+    except Exception as e:
+        print("Error in student search controller:", e)
+        return FastJSONResponse({"error": "Database error"}, status_code=500)
+
+
+student_routes = [
+    Route("/api/students", students_route, methods=["GET"]),
+    Route("/api/students/search", search_students, methods=["GET"]),
+]
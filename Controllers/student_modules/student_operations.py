@@ -1,4 +1,6 @@
 from flask import Blueprint, request, jsonify
+from Controllers.conditional_requests import versioned_etag
+from Controllers.streaming_responses import export_response
 
 # Importing all relevant models
 from Models.studentTableModel.student_add_model import StudentAddModel
@@ -6,53 +8,136 @@ from Models.studentTableModel.student_search_model import StudentSearchModel
 from Models.studentTableModel.student_table_model import StudentModel
 from Models.studentTableModel.student_update_model import StudentUpdateModel
 from Models.studentTableModel.student_delete_model import StudentDeleteModel
+from Models.studentTableModel.student_import_model import StudentImportModel
+from Models.studentTableModel.student_image_model import StudentImageModel
+from Models.imageModel.image_processor import ImageProcessorBusyError
+from config import Config
+from Models.db.db_pagination import InvalidCursorError
 
 # Define a single blueprint for all student operations
 student_bp = Blueprint("students", __name__, url_prefix="/api/students")
 
 # --- READ (List & Filter) ---
 @student_bp.route("", methods=["GET"])
+@versioned_etag("students", "programs", "colleges")
 def students_route():
     params = request.args.to_dict()
     limit = int(params.pop("limit", 20))
     offset = int(params.pop("offset", 0))
     order_by = params.pop("order_by", "id_number")
     direction = params.pop("direction", "ASC").upper()
+    # Presence of "cursor" (even empty, for the first page) selects keyset pagination
+    cursor = params.pop("cursor", None)
+    # "format=columnar" sends column names once and each row as an array
+    columnar = params.pop("format", None) == "columnar"
+    # "fields=a,b" narrows the columns returned (and the joins needed)
+    fields = params.pop("fields", None)
     filters = params
 
     try:
-        rows = StudentModel.get_students(order_by, direction, limit, offset, filters)
-        total_count = StudentModel.get_count(filters)
-        return jsonify({"rows": rows, "totalCount": total_count})
+        fields = StudentModel.parse_fields(fields)
+
+        if cursor is not None:
+            rows, next_cursor = StudentModel.get_students_after(order_by, direction, limit, cursor, filters, columnar, fields)
+            total_count = StudentModel.get_count(filters)
+            body = {"rows": rows, "totalCount": total_count, "nextCursor": next_cursor}
+        else:
+            rows = StudentModel.get_students(order_by, direction, limit, offset, filters, columnar, fields)
+            total_count = StudentModel.get_count(filters)
+            body = {"rows": rows, "totalCount": total_count}
+
+        if columnar:
+            body["columns"] = list(fields)
+        return jsonify(body)
+    except (InvalidCursorError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print("Error fetching students:", e)
         return jsonify({"error": "Database error"}), 500
 
 # --- SEARCH ---
 @student_bp.route("/search", methods=["GET"])
+@versioned_etag("students", "programs", "colleges")
 def search_students():
     q = request.args.get("q", "").strip()
     limit = int(request.args.get("limit", 20))
     offset = int(request.args.get("offset", 0))
     order_by = request.args.get("order_by", "id_number")
     direction = request.args.get("direction", "ASC").upper()
+    # "count=estimated" lets broad (empty-query) searches skip the exact COUNT
+    estimate_count = request.args.get("count") == "estimated"
+    cursor = request.args.get("cursor")
+    # "format=columnar" sends column names once and each row as an array
+    columnar = request.args.get("format") == "columnar"
+    fields = request.args.get("fields")
 
     if direction not in ("ASC", "DESC"):
         direction = "ASC"
 
     try:
-        total_count, rows = StudentSearchModel.search_students(
-            query=q,
-            limit=limit,
-            offset=offset,
-            order_by=order_by,
-            direction=direction
-        )
-        return jsonify({"totalCount": total_count, "rows": rows})
+        fields = StudentModel.parse_fields(fields, allowed=StudentSearchModel.columns)
+
+        if cursor is not None:
+            total_count, rows, next_cursor = StudentSearchModel.search_students_after(
+                query=q,
+                limit=limit,
+                cursor=cursor,
+                order_by=order_by,
+                direction=direction,
+                estimate_count=estimate_count,
+                columnar=columnar,
+                fields=fields
+            )
+            body = {"totalCount": total_count, "rows": rows, "nextCursor": next_cursor}
+        else:
+            total_count, rows = StudentSearchModel.search_students(
+                query=q,
+                limit=limit,
+                offset=offset,
+                order_by=order_by,
+                direction=direction,
+                estimate_count=estimate_count,
+                columnar=columnar,
+                fields=fields
+            )
+            body = {"totalCount": total_count, "rows": rows}
+
+        if columnar:
+            body["columns"] = list(fields)
+        return jsonify(body)
+    except (InvalidCursorError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print("Error in student search controller:", e)
         return jsonify({"error": "Database error"}), 500
 
+# --- EXPORT ---
+@student_bp.route("/export", methods=["GET"])
+def export_students():
+    """
+    Streams every matching student as CSV or NDJSON (?format=, default csv).
+    With ?q= the search semantics apply; otherwise the remaining arguments
+    filter columns as on the list route.
+    """
+    params = request.args.to_dict()
+    q = params.pop("q", "").strip()
+    file_format = params.pop("format", "csv").lower()
+    order_by = params.pop("order_by", "id_number")
+    direction = params.pop("direction", "ASC").upper()
+    filters = params
+
+    try:
+        if q:
+            sql, values, columns = StudentSearchModel.export_query(q, order_by, direction)
+        else:
+            sql, values, columns = StudentModel.export_query(order_by, direction, filters)
+        return export_response(sql, values, columns, file_format, "students")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print("Error exporting students:", e)
+        return jsonify({"error": "Database error"}), 500
+
 # --- CREATE ---
 @student_bp.route("/add", methods=["POST"])
 def add_student():
@@ -91,6 +176,35 @@ def add_student():
         print("Error in add_student controller:", e)
         return jsonify({"success": False, "message": "Internal server error."}), 500
 
+# --- BULK IMPORT ---
+@student_bp.route("/import", methods=["POST"])
+def import_students():
+    """
+    Accepts a CSV (with header row) or NDJSON upload, either as multipart field
+    "file" or as the raw request body. The format comes from ?format=, the file
+    extension, or the Content-Type, defaulting to CSV.
+    """
+    try:
+        upload = request.files.get("file")
+        if upload is not None:
+            stream, filename, content_type = upload.stream, upload.filename or "", upload.mimetype or ""
+        else:
+            stream, filename, content_type = request.stream, "", request.mimetype or ""
+
+        file_format = request.args.get("format", "").lower()
+        if not file_format:
+            is_ndjson = filename.lower().endswith((".ndjson", ".jsonl")) or "ndjson" in content_type
+            file_format = "ndjson" if is_ndjson else "csv"
+        if file_format not in ("csv", "ndjson"):
+            return jsonify({"success": False, "message": "format must be csv or ndjson."}), 400
+
+        result = StudentImportModel.import_students(stream, file_format)
+        status_code = 200 if result["success"] else 400
+        return jsonify(result), status_code
+    except Exception as e:
+        print("Error in import_students controller:", e)
+        return jsonify({"success": False, "message": "Internal server error."}), 500
+
 # --- UPDATE ---
 @student_bp.route("/update", methods=["PUT"])
 def update_student():
@@ -119,6 +233,64 @@ def update_student():
             "message": "An unexpected error occurred while updating student."
         }), 500
 
+# --- PROFILE PICTURE ---
+@student_bp.route("/<id_number>/profile-image", methods=["POST"])
+def upload_profile_image(id_number):
+    """
+    Accepts an image as multipart field "file" or as the raw request body,
+    stores its thumbnails and records the new profile_image_path.
+    """
+    try:
+        upload = request.files.get("file")
+        stream = upload.stream if upload is not None else request.stream
+        # One byte past the limit is enough to reject an oversized upload
+        max_bytes = int(getattr(Config, "PROFILE_IMAGE_MAX_BYTES", 5 * 1024 * 1024))
+        data = stream.read(max_bytes + 1)
+
+        result = StudentImageModel.upload_profile_image(id_number.strip(), data)
+        status_code = 200 if result["success"] else 400
+        return jsonify(result), status_code
+    except ImageProcessorBusyError:
+        response = jsonify({"success": False, "message": "Too many uploads in progress, try again shortly."})
+        response.headers["Retry-After"] = "2"
+        return response, 503
+    except Exception as e:
+        print("Error in upload_profile_image controller:", e)
+        return jsonify({"success": False, "message": "Internal server error."}), 500
+
+@student_bp.route("/<id_number>/profile-image", methods=["DELETE"])
+def remove_profile_image(id_number):
+    try:
+        result = StudentImageModel.remove_profile_image(id_number.strip())
+        status_code = 200 if result["success"] else 400
+        return jsonify(result), status_code
+    except Exception as e:
+        print("Error in remove_profile_image controller:", e)
+        return jsonify({"success": False, "message": "Internal server error."}), 500
+
+# --- BULK UPDATE ---
+@student_bp.route("/bulk-update", methods=["PUT"])
+def bulk_update_students():
+    """
+    Body: {"id_numbers": [...], "patch": {"year_level": 2, ...}}
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({"success": False, "message": "Missing JSON body."}), 400
+
+        id_numbers = data.get("id_numbers")
+        patch = data.get("patch")
+        if not isinstance(id_numbers, list) or not isinstance(patch, dict):
+            return jsonify({"success": False, "message": "id_numbers (list) and patch (object) are required."}), 400
+
+        result = StudentUpdateModel.update_students(id_numbers, patch)
+        status_code = 200 if result["success"] else 400
+        return jsonify(result), status_code
+    except Exception as e:
+        print("Error in bulk_update_students controller:", e)
+        return jsonify({"success": False, "message": "Internal server error."}), 500
+
 # --- DELETE ---
 @student_bp.route("/delete", methods=["DELETE"])
 def delete_student():
@@ -134,4 +306,23 @@ def delete_student():
         return jsonify(result), status_code
     except Exception as e:
         print("Error in delete_student controller:", e)
-        return jsonify({"success": False, "message": "Internal server error."}), 500
\ No newline at end of file
+        return jsonify({"success": False, "message": "Internal server error."}), 500
+
+# --- BULK DELETE ---
+@student_bp.route("/bulk-delete", methods=["DELETE"])
+def bulk_delete_students():
+    """
+    Body: {"id_numbers": [...]}
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        id_numbers = data.get("id_numbers")
+        if not isinstance(id_numbers, list):
+            return jsonify({"success": False, "message": "id_numbers must be a list."}), 400
+
+        result = StudentDeleteModel.delete_students(id_numbers)
+        status_code = 200 if result["success"] else 400
+        return jsonify(result), status_code
+    except Exception as e:
+        print("Error in bulk_delete_students controller:", e)
+        return jsonify({"success": False, "message": "Internal server error."}), 500
@@ -1,4 +1,6 @@
 from Models.db.db_utils import DBUtils
+from Models.db.db_errors import ConstraintErrors
+from Models.db.db_reference_cache import ReferenceCache
 
 class CollegeAddModel:
 
@@ -21,20 +23,24 @@ class CollegeAddModel:
             return {"success": False, "message": "College code and name are required."}
 
         try:
-            # Check if the college already exists
-            check_query = "SELECT 1 FROM colleges WHERE college_code = %s"
-            existing = DBUtils.execute_query(check_query, (college_code,), fetch=True)
-            if existing:
-                return {"success": False, "message": "College code already exists."}
-
-            # Insert new college
-            insert_query = """
-                INSERT INTO colleges (college_code, college_name)
-                VALUES (%s, %s)
-            """
-            DBUtils.execute_query(insert_query, (college_code, college_name), fetch=False)
-            return {"success": True, "message": "College added successfully."}
-
+            with DBUtils.transaction():
+                # The primary key rejects duplicates; no row back means the code is taken
+                insert_query = """
+                    INSERT INTO colleges (college_code, college_name)
+                    VALUES (%s, %s)
+                    ON CONFLICT (college_code) DO NOTHING
+                    RETURNING college_code
+                """
+                inserted = DBUtils.execute_query(insert_query, (college_code, college_name), fetch=True)
         except Exception as e:
+            message = ConstraintErrors.message(e)
+            if message:
+                return {"success": False, "message": message}
             print("Error in add_college:", e)
             return {"success": False, "message": "Database error while adding college."}
+
+        if not inserted:
+            return {"success": False, "message": "College code already exists."}
+
+        DBUtils.on_commit(lambda: ReferenceCache.invalidate("colleges"))
+        return {"success": True, "message": "College added successfully."}
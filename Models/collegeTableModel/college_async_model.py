@@ -0,0 +1,33 @@
+from Models.db.db_async import AsyncDBUtils
+from Models.collegeTableModel.college_table_model import CollegeModel
+from Models.collegeTableModel.college_search_model import CollegeSearchModel
+
+class CollegeAsyncModel:
+    """
+    Async read paths for colleges, used by the ASGI serving mode.
+
+    SQL comes from the statement builders of CollegeModel and CollegeSearchModel.
+    """
+
+    @staticmethod
+    async def get_colleges(order_by="college_code", direction="ASC", filters={}, columnar=False):
+        query, params = CollegeModel.list_statement(order_by, direction, filters)
+        rows = await AsyncDBUtils.execute_query(query, params, fetch=True)
+        return rows if columnar else CollegeModel.to_dicts(rows)
+
+    @staticmethod
+    async def get_count(filters={}):
+        query, params = CollegeModel.count_statement(filters)
+        rows = await AsyncDBUtils.execute_query(query, params, fetch=True)
+        return rows[0][0]
+
+    @staticmethod
+    async def search_colleges(query="", limit=20, offset=0, order_by="college_code", direction="ASC", estimate_count=False,
+                             columnar=False):
+        """
+        Returns:
+            tuple: (total_count, rows)
+        """
+        data_query, params = CollegeSearchModel.search_statement(query, limit, offset, order_by, direction, estimate_count)
+        rows = await AsyncDBUtils.execute_query(data_query, params, fetch=True)
+        return CollegeSearchModel.to_result(rows, columnar)
@@ -1,4 +1,6 @@
 from Models.db.db_utils import DBUtils
+from Models.db.db_errors import ConstraintErrors
+from Models.db.db_reference_cache import ReferenceCache
 
 class CollegeDeleteModel:
 
@@ -20,27 +22,22 @@ class CollegeDeleteModel:
             return {"success": False, "message": "College code is required."}
 
         try:
-            # Check if the college exists
-            check_query = "SELECT 1 FROM colleges WHERE college_code = %s"
-            existing = DBUtils.execute_query(check_query, (college_code,), fetch=True)
-            if not existing:
-                return {"success": False, "message": "College not found."}
-
-            # Check if any programs are linked to this college
-            program_check_query = "SELECT 1 FROM programs WHERE college_code = %s LIMIT 1"
-            linked_program = DBUtils.execute_query(program_check_query, (college_code,), fetch=True)
-            if linked_program:
-                return {
-                    "success": False,
-                    "message": "Cannot Delete College: There are programs linked to it."
-                }
-
-            # Safe to delete
-            delete_query = "DELETE FROM colleges WHERE college_code = %s"
-            DBUtils.execute_query(delete_query, (college_code,), fetch=False)
-
-            return {"success": True, "message": "College deleted successfully."}
-
+            with DBUtils.transaction():
+                # programs.college_code's foreign key (ON DELETE RESTRICT, see migration 0006)
+                # rejects the delete while programs are linked, including ones added concurrently
+                delete_query = "DELETE FROM colleges WHERE college_code = %s RETURNING college_code"
+                deleted = DBUtils.execute_query(delete_query, (college_code,), fetch=True)
         except Exception as e:
+            message = ConstraintErrors.message(e, {
+                ConstraintErrors.FOREIGN_KEY_VIOLATION: "Cannot Delete College: There are programs linked to it.",
+            })
+            if message:
+                return {"success": False, "message": message}
             print("Error in delete_college:", e)
             return {"success": False, "message": "Database error while deleting college."}
+
+        if not deleted:
+            return {"success": False, "message": "College not found."}
+
+        DBUtils.on_commit(lambda: ReferenceCache.invalidate("colleges"))
+        return {"success": True, "message": "College deleted successfully."}
@@ -1,52 +1,89 @@
 from Models.db.db_utils import DBUtils
+from Models.db.db_search import SearchStatement
 
 class CollegeSearchModel:
+    base_query = "FROM colleges c"
+    columns = ["college_code", "college_name"]
+    columns_sql = "c.college_code, c.college_name"
+    order_columns = {"college_code": "c.college_code", "college_name": "c.college_name"}
 
     @staticmethod
-    def search_colleges(query="", limit=20, offset=0, order_by="college_code", direction="ASC"):
-        base_query = "FROM colleges c"
-
-        def build_where_clause(tokens, exact=False):
-            where_clauses = []
-            params = []
-            if not tokens.strip():
-                return where_clauses, params
-            if exact:
-                where_clauses.append("(c.college_code ILIKE %s OR c.college_name ILIKE %s)")
-                params.extend([f"%{tokens}%", f"%{tokens}%"])
-            else:
-                for token in tokens.split():
-                    token_like = f"%{token}%"
-                    where_clauses.append("(c.college_code ILIKE %s OR c.college_name ILIKE %s)")
-                    params.extend([token_like, token_like])
+    def build_where_clause(tokens, exact=False):
+        where_clauses = []
+        params = []
+        if not tokens.strip():
             return where_clauses, params
+        if exact:
+            where_clauses.append("(c.college_code ILIKE %s OR c.college_name ILIKE %s)")
+            params.extend([f"%{tokens}%", f"%{tokens}%"])
+        else:
+            for token in tokens.split():
+                token_like = f"%{token}%"
+                where_clauses.append("(c.college_code ILIKE %s OR c.college_name ILIKE %s)")
+                params.extend([token_like, token_like])
+        return where_clauses, params
+
+    @staticmethod
+    def search_statement(query="", limit=20, offset=0, order_by="college_code", direction="ASC", estimate_count=False):
+        """
+        Returns (sql, params) for search_colleges; shared with the async model.
+        """
+        direction = "DESC" if direction == "DESC" else "ASC"
+        base_query = CollegeSearchModel.base_query
+
+        # Step 1 and 2: exact search with tokenized fallback, resolved in one statement
+        exact_where, exact_params = CollegeSearchModel.build_where_clause(query, exact=True)
+        token_where, token_params = CollegeSearchModel.build_where_clause(query, exact=False)
+
+        # Step 3: Fetch paginated rows together with the total count
+        order_column = CollegeSearchModel.order_columns.get(order_by, "c.college_code")
+        columns_sql = CollegeSearchModel.columns_sql
+        order_sql = f"ORDER BY {order_column} {direction}"
+
+        if estimate_count and not query.strip():
+            return SearchStatement.build_estimated(
+                columns_sql, base_query, "colleges", order_sql, limit=limit, offset=offset
+            )
+        return SearchStatement.build(
+            columns_sql, base_query, "c.college_code",
+            exact_where, exact_params, token_where, token_params,
+            order_sql, limit=limit, offset=offset
+        )
+
+    @staticmethod
+    def to_result(rows, columnar=False):
+        """
+        Splits the rows of search_statement into (total_count, rows); rows are
+        dicts, or tuples in CollegeSearchModel.columns order with columnar=True.
+        """
+        total_count, rows = SearchStatement.split(rows)
+        if columnar:
+            return total_count, rows
+        return total_count, [dict(zip(CollegeSearchModel.columns, r)) for r in rows]
+
+    @staticmethod
+    def search_colleges(query="", limit=20, offset=0, order_by="college_code", direction="ASC", estimate_count=False,
+                       columnar=False):
+        data_query, params = CollegeSearchModel.search_statement(query, limit, offset, order_by, direction, estimate_count)
+        rows = DBUtils.read_query(data_query, tuple(params), prepared=True)
+        return CollegeSearchModel.to_result(rows, columnar)
+
+    @staticmethod
+    def export_query(query="", order_by="college_code", direction="ASC"):
+        """
+        Builds the statement returning every college matching `query`, for streaming exports.
 
-        # Step 1: Exact search
-        where_clauses, params = build_where_clause(query, exact=True)
-        where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
-
-        count_query = f"SELECT COUNT(*) {base_query} {where_sql}"
-        total_count_result = DBUtils.execute_query(count_query, tuple(params), fetch=True)
-        total_count = total_count_result[0][0] if total_count_result else 0
-
-        # Step 2: Fallback to tokenized search
-        if total_count == 0 and query.strip():
-            where_clauses, params = build_where_clause(query, exact=False)
-            where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
-            count_query = f"SELECT COUNT(*) {base_query} {where_sql}"
-            total_count_result = DBUtils.execute_query(count_query, tuple(params), fetch=True)
-            total_count = total_count_result[0][0] if total_count_result else 0
-
-        # Step 3: Fetch paginated rows
-        order_column = {"college_code": "c.college_code", "college_name": "c.college_name"}.get(order_by, "c.college_code")
-        data_query = f"""
-            SELECT c.college_code, c.college_name
-            {base_query}
-            {where_sql}
-            ORDER BY {order_column} {direction}
-            LIMIT %s OFFSET %s
+        Returns:
+            tuple: (sql, params, column_names)
         """
-        rows = DBUtils.execute_query(data_query, tuple(params + [limit, offset]), fetch=True)
-        result_rows = [{"college_code": r[0], "college_name": r[1]} for r in rows]
+        direction = "DESC" if direction == "DESC" else "ASC"
+        exact_where, exact_params = CollegeSearchModel.build_where_clause(query, exact=True)
+        token_where, token_params = CollegeSearchModel.build_where_clause(query, exact=False)
+        order_column = CollegeSearchModel.order_columns.get(order_by, "c.college_code")
 
-        return total_count, result_rows
+        sql, params = SearchStatement.build_all(
+            CollegeSearchModel.columns_sql, CollegeSearchModel.base_query, "c.college_code",
+            exact_where, exact_params, token_where, token_params,
+            f"ORDER BY {order_column} {direction}"
+        )
+        return sql, params, CollegeSearchModel.columns
@@ -1,4 +1,6 @@
 from Models.db.db_utils import DBUtils
+from Models.db.db_query_cache import QueryShapeCache
+from Models.db.db_reference_cache import ReferenceCache
 
 class CollegeModel:
     column_map = {
@@ -6,44 +8,80 @@ class CollegeModel:
         "college_name": "c.college_name",
     }
 
+    # Names of the columns returned by the list statement, in order
+    columns = list(column_map.keys())
+
     @staticmethod
-    def get_colleges(order_by="college_code", direction="ASC", filters={}):
-        base_query = """
-            SELECT 
-                c.college_code,
-                c.college_name
-            FROM colleges c
+    def filter_shape(filters):
+        """
+        Returns (filter_keys, values) for the recognised filters in a stable order.
         """
-        where_clauses = []
-        values = []
+        filter_keys = tuple(sorted(key for key in filters if key in CollegeModel.column_map))
+        return filter_keys, [filters[key] for key in filter_keys]
 
-        for key, value in filters.items():
-            if key in CollegeModel.column_map:
-                where_clauses.append(f"{CollegeModel.column_map[key]} = %s")
-                values.append(value)
+    @staticmethod
+    def where_sql(filter_keys):
+        where_clauses = [f"{CollegeModel.column_map[key]} = %s" for key in filter_keys]
+        return " WHERE " + " AND ".join(where_clauses) if where_clauses else ""
 
-        if where_clauses:
-            base_query += " WHERE " + " AND ".join(where_clauses)
+    @staticmethod
+    def list_statement(order_by="college_code", direction="ASC", filters={}):
+        """
+        Returns (sql, params) for get_colleges; shared with the async model.
+        """
+        direction = "DESC" if direction == "DESC" else "ASC"
+        if order_by not in CollegeModel.column_map:
+            order_by = "college_code"
+        filter_keys, values = CollegeModel.filter_shape(filters)
+
+        def build():
+            query = """
+                SELECT 
+                    c.college_code,
+                    c.college_name
+                FROM colleges c
+            """
+            query += CollegeModel.where_sql(filter_keys)
+            query += f" ORDER BY {CollegeModel.column_map[order_by]} {direction}"
+            return query
 
-        order_column = CollegeModel.column_map.get(order_by, "c.college_code")
-        base_query += f" ORDER BY {order_column} {direction}"
+        shape = ("colleges.list", filter_keys, order_by, direction)
+        return QueryShapeCache.get(shape, build), tuple(values)
+
+    @staticmethod
+    def count_statement(filters={}):
+        filter_keys, values = CollegeModel.filter_shape(filters)
 
-        rows = DBUtils.execute_query(base_query, tuple(values), fetch=True)
-        columns = list(CollegeModel.column_map.keys())
+        def build():
+            return "SELECT COUNT(*) FROM colleges c" + CollegeModel.where_sql(filter_keys)
+
+        return QueryShapeCache.get(("colleges.count", filter_keys), build), tuple(values)
+
+    @staticmethod
+    def to_dicts(rows):
+        columns = CollegeModel.columns
         return [dict(zip(columns, row)) for row in rows]
 
     @staticmethod
-    def get_count(filters={}):
-        base_query = "SELECT COUNT(*) FROM colleges c"
-        where_clauses = []
-        values = []
+    def get_colleges(order_by="college_code", direction="ASC", filters={}, columnar=False):
+        """
+        With columnar=True rows are returned as tuples in CollegeModel.columns order
+        instead of dicts.
+        """
+        query, params = CollegeModel.list_statement(order_by, direction, filters)
 
-        for key, value in filters.items():
-            if key in CollegeModel.column_map:
-                where_clauses.append(f"{CollegeModel.column_map[key]} = %s")
-                values.append(value)
+        def load():
+            # Read from the primary: a stale replica result would stay cached until the next change
+            rows = DBUtils.execute_query(query, params, fetch=True, prepared=True)
+            return [tuple(row) for row in rows] if columnar else CollegeModel.to_dicts(rows)
 
-        if where_clauses:
-            base_query += " WHERE " + " AND ".join(where_clauses)
+        # Served from memory until the colleges table changes
+        return ReferenceCache.get(("colleges",), (query, params, columnar), load)
 
-        return DBUtils.execute_query(base_query, tuple(values), fetch=True)[0][0]
+    @staticmethod
+    def get_count(filters={}):
+        query, params = CollegeModel.count_statement(filters)
+        return ReferenceCache.get(
+            ("colleges",), (query, params),
+            lambda: DBUtils.execute_query(query, params, fetch=True, prepared=True)[0][0]
+        )
@@ -1,4 +1,6 @@
 from Models.db.db_utils import DBUtils
+from Models.db.db_errors import ConstraintErrors
+from Models.db.db_reference_cache import ReferenceCache
 
 class CollegeUpdateModel:
 
@@ -21,21 +23,24 @@ class CollegeUpdateModel:
             return {"success": False, "message": "College code and new name are required."}
 
         try:
-            # Check if the college exists
-            check_query = "SELECT 1 FROM colleges WHERE college_code = %s"
-            existing = DBUtils.execute_query(check_query, (college_code,), fetch=True)
-            if not existing:
-                return {"success": False, "message": "College not found."}
-
-            # Update the college name
-            update_query = """
-                UPDATE colleges
-                SET college_name = %s
-                WHERE college_code = %s
-            """
-            DBUtils.execute_query(update_query, (new_college_name, college_code), fetch=False)
-            return {"success": True, "message": "College updated successfully."}
-
+            with DBUtils.transaction():
+                # No row back means the college does not exist
+                update_query = """
+                    UPDATE colleges
+                    SET college_name = %s
+                    WHERE college_code = %s
+                    RETURNING college_code
+                """
+                updated = DBUtils.execute_query(update_query, (new_college_name, college_code), fetch=True)
         except Exception as e:
+            message = ConstraintErrors.message(e)
+            if message:
+                return {"success": False, "message": message}
             print("Error in update_college:", e)
             return {"success": False, "message": "Database error while updating college."}
+
+        if not updated:
+            return {"success": False, "message": "College not found."}
+
+        DBUtils.on_commit(lambda: ReferenceCache.invalidate("colleges"))
+        return {"success": True, "message": "College updated successfully."}
@@ -0,0 +1,123 @@
+import asyncio
+import time
+from functools import lru_cache
+from config import Config
+from .db_query_cache import PreparedStatements
+from .db_metrics import QueryMetrics
+from .db_slow_queries import SlowQueryLog
+
+try:
+    import asyncpg
+except ImportError:  # Only needed for the ASGI serving mode (asgi.py)
+    asyncpg = None
+
+
+class AsyncDatabaseConnection:
+    """
+    asyncpg connection pool used by the ASGI serving mode.
+
+    One pool is created lazily per event loop. A request waiting for the
+    database suspends on the loop instead of holding a thread, so a single
+    worker can keep DB_ASYNC_POOL_MAX queries in flight and queue the rest.
+    asyncpg prepares and caches every statement per connection, so the shared
+    SQL shapes are parsed once per connection as in the synchronous path.
+    """
+
+    _pool = None
+    _loop = None
+    _lock = None
+
+    @classmethod
+    async def get_pool(cls):
+        loop = asyncio.get_running_loop()
+        if cls._pool is not None and cls._loop is loop:
+            return cls._pool
+
+        if asyncpg is None:
+            raise ConnectionError("Async mode requires the asyncpg package.")
+
+        if cls._lock is None or cls._loop is not loop:
+            cls._lock = asyncio.Lock()
+            cls._loop = loop
+            cls._pool = None
+
+        async with cls._lock:
+            if cls._pool is None:
+                print(f"Connecting (async) to database {Config.DB_NAME} at {Config.DB_HOST}:{Config.DB_PORT} as {Config.DB_USER}")
+                cls._pool = await asyncpg.create_pool(
+                    database=Config.DB_NAME,
+                    user=Config.DB_USER,
+                    password=Config.DB_PASSWORD,
+                    host=Config.DB_HOST,
+                    port=Config.DB_PORT,
+                    min_size=getattr(Config, "DB_ASYNC_POOL_MIN", 1),
+                    max_size=getattr(Config, "DB_ASYNC_POOL_MAX", 50),
+                    max_inactive_connection_lifetime=getattr(Config, "DB_POOL_MAX_LIFETIME", 1800.0),
+                )
+                print("Async connection pool created successfully.")
+        return cls._pool
+
+    @classmethod
+    async def close(cls):
+        if cls._pool is not None:
+            await cls._pool.close()
+            cls._pool = None
+
+    @classmethod
+    def stats(cls):
+        """
+        Returns pool counters, or {} if the pool has not been created.
+        """
+        if cls._pool is None:
+            return {}
+        return {
+            "size": cls._pool.get_size(),
+            "idle": cls._pool.get_idle_size(),
+            "max_size": cls._pool.get_max_size(),
+        }
+
+
+class AsyncDBUtils:
+    """
+    Async counterpart of DBUtils.execute_query for read-only statements.
+
+    Takes the same psycopg2-style SQL (%s placeholders) the models build, so
+    the synchronous and async models share their statement builders.
+    """
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def to_asyncpg(query):
+        """
+        Rewrites %s placeholders as $1..$n; cached per SQL text.
+        """
+        return PreparedStatements.to_server_placeholders(query)[0]
+
+    @staticmethod
+    async def execute_query(query, params=None, fetch=False):
+        pool = await AsyncDatabaseConnection.get_pool()
+        timeout = getattr(Config, "DB_POOL_TIMEOUT", 10.0)
+        sql = AsyncDBUtils.to_asyncpg(query)
+
+        start = time.perf_counter()
+        async with pool.acquire(timeout=timeout) as conn:
+            waited = time.perf_counter() - start
+            QueryMetrics.record_pool_wait(waited)
+            start = time.perf_counter()
+            try:
+                if fetch:
+                    rows = await conn.fetch(sql, *(params or ()))
+                    # Records behave like tuples for indexing; convert for the shared row helpers
+                    result = [tuple(row) for row in rows]
+                    elapsed = time.perf_counter() - start
+                    QueryMetrics.record(query, elapsed, len(result), waited)
+                    SlowQueryLog.observe(query, params, elapsed, len(result))
+                    return result
+                await conn.execute(sql, *(params or ()))
+            except Exception:
+                QueryMetrics.record(query, time.perf_counter() - start, 0, waited, error=True)
+                raise
+            elapsed = time.perf_counter() - start
+            QueryMetrics.record(query, elapsed, 0, waited)
+            SlowQueryLog.observe(query, params, elapsed)
+            return None
@@ -1,33 +1,277 @@
+import threading
+import time
+from collections import deque
 import psycopg2
-from psycopg2 import pool
+from psycopg2 import pool, extensions
 from config import Config
 
+
+class PoolTimeoutError(pool.PoolError):
+    """Raised when no connection becomes available within the acquisition timeout."""
+
+
+class PreparedStatementConnection(extensions.connection):
+    """
+    psycopg2 connection that remembers which server-side prepared statements it holds.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = {}
+
+
+class BoundedConnectionPool:
+    """
+    Thread-safe connection pool with a bounded size and a wait queue.
+
+    Unlike psycopg2's SimpleConnectionPool, getconn() blocks (up to `timeout`
+    seconds) when every connection is checked out instead of raising at once.
+    Connections are validated on checkout and retired once older than
+    `max_lifetime` seconds.
+    """
+
+    def __init__(self, minconn, maxconn, timeout=10.0, max_lifetime=1800.0, ping_after=30.0, **connect_kwargs):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        # Idle connections older than this are pinged before being handed out
+        self.ping_after = ping_after
+        self._connect_kwargs = connect_kwargs
+
+        self._cond = threading.Condition()
+        self._idle = deque()        # (conn, returned_at), most recently returned on the right
+        self._created_at = {}       # id(conn) -> creation time
+        self._size = 0              # open connections plus those being opened
+        self._in_use = 0
+        self._waiters = 0
+        self._closed = False
+
+        self._acquired = 0
+        self._timeouts = 0
+        self._discarded = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+        for _ in range(minconn):
+            conn = self._connect()
+            self._idle.append((conn, time.monotonic()))
+            self._size += 1
+
+    # ---------- Internals ----------
+    def _connect(self):
+        conn = psycopg2.connect(**self._connect_kwargs)
+        self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn):
+        """Closes a connection. Caller must hold the lock and own the slot."""
+        self._created_at.pop(id(conn), None)
+        self._size -= 1
+        self._discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _expired(self, conn, now):
+        created = self._created_at.get(id(conn), now)
+        return self.max_lifetime and now - created > self.max_lifetime
+
+    @staticmethod
+    def _broken(conn):
+        return conn.closed or conn.get_transaction_status() == extensions.TRANSACTION_STATUS_UNKNOWN
+
+    @staticmethod
+    def _ping(conn):
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    # ---------- Public API ----------
+    def getconn(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+
+        while True:
+            conn, needs_ping = self._checkout(deadline)
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._in_use -= 1
+                        self._cond.notify()
+                    raise
+            elif needs_ping and not self._ping(conn):
+                # Dead idle connection: drop it and retry within the same deadline
+                with self._cond:
+                    self._in_use -= 1
+                    self._discard(conn)
+                    self._cond.notify()
+                continue
+
+            waited = time.monotonic() - start
+            with self._cond:
+                self._acquired += 1
+                self._wait_time_total += waited
+                self._wait_time_max = max(self._wait_time_max, waited)
+            return conn
+
+    def _checkout(self, deadline):
+        """
+        Takes an idle connection or reserves a slot for a new one, waiting until `deadline`.
+
+        Returns:
+            tuple: (conn, needs_ping); conn is None when the caller must open a new connection.
+        """
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise pool.PoolError("connection pool is closed")
+
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    now = time.monotonic()
+                    if self._broken(conn) or self._expired(conn, now):
+                        self._discard(conn)
+                        continue
+                    self._in_use += 1
+                    return conn, now - returned_at > self.ping_after
+
+                if self._size < self.maxconn:
+                    # Reserve the slot; the caller connects without holding the lock
+                    self._size += 1
+                    self._in_use += 1
+                    return None, False
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"no database connection available within {self.timeout}s "
+                        f"({self._in_use} in use, {self._waiters} waiting)"
+                    )
+                self._waiters += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiters -= 1
+
+    def putconn(self, conn, close=False):
+        with self._cond:
+            self._in_use -= 1
+            now = time.monotonic()
+            if close or self._closed or self._broken(conn) or self._expired(conn, now):
+                self._discard(conn)
+            else:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        self._discard(conn)
+                        self._cond.notify()
+                        return
+                self._idle.append((conn, now))
+            self._cond.notify()
+
+    def closeall(self):
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiters": self._waiters,
+                "max_size": self.maxconn,
+                "acquired": self._acquired,
+                "timeouts": self._timeouts,
+                "discarded": self._discarded,
+                "wait_time_total": self._wait_time_total,
+                "wait_time_max": self._wait_time_max,
+            }
+
+
 class DatabaseConnection:
     _instance = None
     _pool = None
+    _replica_pool = None
+    _connect_kwargs = {}
+    _lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._init_pool()
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._init_pool()
+                    instance._init_replica_pool()
+                    cls._instance = instance
         return cls._instance
 
     def _init_pool(self):
         try:
             print(f"Connecting to database {Config.DB_NAME} at {Config.DB_HOST}:{Config.DB_PORT} as {Config.DB_USER}")
-            self._pool = psycopg2.pool.SimpleConnectionPool(
-                1, 25,
+            self._connect_kwargs = dict(
                 database=Config.DB_NAME,
                 user=Config.DB_USER,
                 password=Config.DB_PASSWORD,
                 host=Config.DB_HOST,
                 port=Config.DB_PORT
             )
+            self._pool = BoundedConnectionPool(
+                getattr(Config, "DB_POOL_MIN", 1),
+                getattr(Config, "DB_POOL_MAX", 25),
+                timeout=getattr(Config, "DB_POOL_TIMEOUT", 10.0),
+                max_lifetime=getattr(Config, "DB_POOL_MAX_LIFETIME", 1800.0),
+                connection_factory=PreparedStatementConnection,
+                **self._connect_kwargs
+            )
             print("Connection pool created successfully.")
         except Exception as e:
             print("Error initializing connection pool:", e)
             self._pool = None
 
+    def _init_replica_pool(self):
+        """
+        Creates the read replica pool when Config.DB_REPLICA_HOST is set.
+
+        The replica uses the primary's database and credentials. Its pool
+        starts empty by default, so an unreachable replica does not stop the
+        app from starting; reads fall back to the primary instead.
+        """
+        host = getattr(Config, "DB_REPLICA_HOST", "")
+        if not host:
+            return
+        try:
+            port = getattr(Config, "DB_REPLICA_PORT", Config.DB_PORT)
+            print(f"Using read replica at {host}:{port}")
+            self._replica_pool = BoundedConnectionPool(
+                getattr(Config, "DB_REPLICA_POOL_MIN", 0),
+                getattr(Config, "DB_REPLICA_POOL_MAX", 25),
+                timeout=getattr(Config, "DB_POOL_TIMEOUT", 10.0),
+                max_lifetime=getattr(Config, "DB_POOL_MAX_LIFETIME", 1800.0),
+                connection_factory=PreparedStatementConnection,
+                **dict(self._connect_kwargs, host=host, port=port)
+            )
+        except Exception as e:
+            print("Error initializing replica connection pool:", e)
+            self._replica_pool = None
+
     def get_conn(self):
         if not self._pool:
             raise ConnectionError("Connection pool not initialized.")
@@ -37,6 +281,38 @@ class DatabaseConnection:
         if self._pool:
             self._pool.putconn(conn)
 
+    def has_replica(self):
+        return self._replica_pool is not None
+
+    def get_replica_conn(self):
+        if not self._replica_pool:
+            raise ConnectionError("Replica connection pool not initialized.")
+        return self._replica_pool.getconn()
+
+    def put_replica_conn(self, conn):
+        if self._replica_pool:
+            self._replica_pool.putconn(conn)
+
     def close_all(self):
         if self._pool:
             self._pool.closeall()
+        if self._replica_pool:
+            self._replica_pool.closeall()
+
+    def connect(self):
+        """
+        Opens a dedicated connection outside the pool, for long-lived uses such as LISTEN.
+        """
+        return psycopg2.connect(**self._connect_kwargs)
+
+    def stats(self):
+        """
+        Returns pool counters (in_use, idle, waiters, wait times, ...), or {} if not initialized.
+        """
+        return self._pool.stats() if self._pool else {}
+
+    def replica_stats(self):
+        """
+        Returns the replica pool's counters, or {} without a replica.
+        """
+        return self._replica_pool.stats() if self._replica_pool else {}
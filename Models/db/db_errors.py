@@ -0,0 +1,56 @@
+from psycopg2 import errorcodes
+
+
+class ConstraintErrors:
+    """
+    Maps constraint violations raised by the database to user-facing messages.
+
+    The write models issue a single statement and let the schema's constraints
+    (primary keys, foreign keys, NOT NULL) reject bad writes instead of
+    checking with SELECTs first. Which constraint can fire is known from the
+    statement, so each model maps SQLSTATE codes to its own messages:
+
+        except Exception as e:
+            message = ConstraintErrors.message(e, {
+                ConstraintErrors.FOREIGN_KEY_VIOLATION: "Program not found.",
+            })
+
+    Raise the error out of the DBUtils.transaction() block before mapping it,
+    so the failed statement is rolled back (to a savepoint when earlier work
+    in the transaction must be kept).
+    """
+
+    UNIQUE_VIOLATION = errorcodes.UNIQUE_VIOLATION              # 23505
+    FOREIGN_KEY_VIOLATION = errorcodes.FOREIGN_KEY_VIOLATION    # 23503
+    NOT_NULL_VIOLATION = errorcodes.NOT_NULL_VIOLATION          # 23502
+    CHECK_VIOLATION = errorcodes.CHECK_VIOLATION                # 23514
+    STRING_TOO_LONG = errorcodes.STRING_DATA_RIGHT_TRUNCATION   # 22001
+    INVALID_NUMBER = errorcodes.INVALID_TEXT_REPRESENTATION     # 22P02
+
+    # Violations any write can hit, whatever the table
+    DEFAULT_MESSAGES = {
+        NOT_NULL_VIOLATION: "All required fields must be provided.",
+        CHECK_VIOLATION: "A value is outside the allowed range.",
+        STRING_TOO_LONG: "A value is too long.",
+        INVALID_NUMBER: "A value has the wrong format.",
+    }
+
+    @staticmethod
+    def sqlstate(error):
+        return getattr(error, "pgcode", None)
+
+    @staticmethod
+    def message(error, messages=None):
+        """
+        Returns the user-facing message for a database error, or None when it is not a mapped violation.
+
+        Args:
+            error (Exception): The exception raised by the statement.
+            messages (dict, optional): SQLSTATE -> message, taking precedence over DEFAULT_MESSAGES.
+        """
+        code = ConstraintErrors.sqlstate(error)
+        if code is None:
+            return None
+        if messages and code in messages:
+            return messages[code]
+        return ConstraintErrors.DEFAULT_MESSAGES.get(code)
@@ -0,0 +1,230 @@
+import hashlib
+import re
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+from flask import g, has_request_context
+from config import Config
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Cumulative-on-export histogram with fixed buckets; callers hold the owner's lock.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)     # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name, labels):
+        """
+        Yields (name, labels, value) in Prometheus histogram form.
+        """
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            yield f"{name}_bucket", {**labels, "le": repr(bound)}, running
+        yield f"{name}_bucket", {**labels, "le": "+Inf"}, self.count
+        yield f"{name}_sum", labels, self.sum
+        yield f"{name}_count", labels, self.count
+
+
+class MetricsText:
+    """
+    Builds a Prometheus text-format (0.0.4) exposition.
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self.lines = []
+
+    @staticmethod
+    def _escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    @staticmethod
+    def _labels(labels):
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{key}="{MetricsText._escape(value)}"' for key, value in labels.items()) + "}"
+
+    def add(self, name, kind, help_text, samples):
+        """
+        Args:
+            kind (str): "counter", "gauge" or "histogram".
+            samples (iterable): (sample_name, labels, value) tuples, or (labels, value) pairs named `name`.
+        """
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        for sample in samples:
+            sample_name, labels, value = sample if len(sample) == 3 else (name, *sample)
+            self.lines.append(f"{sample_name}{self._labels(labels)} {float(value):.10g}")
+
+    def add_stats(self, prefix, help_text, stats, counters=()):
+        """
+        Adds one metric per numeric entry of a stats() dict; keys in `counters` are counters, the rest gauges.
+        """
+        for key, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"{prefix}_{key}"
+            kind = "counter" if key in counters else "gauge"
+            if kind == "counter" and not name.endswith("_total"):
+                name += "_total"
+            self.add(name, kind, f"{help_text} ({key})", [({}, value)])
+
+    def render(self):
+        return "\n".join(self.lines) + "\n"
+
+
+class _FingerprintStats:
+    __slots__ = ("statement", "latency", "rows", "errors", "pool_wait")
+
+    def __init__(self, statement):
+        self.statement = statement
+        self.latency = Histogram()
+        self.rows = 0
+        self.errors = 0
+        self.pool_wait = 0.0
+
+
+class QueryMetrics:
+    """
+    Per-statement instrumentation of the database layer.
+
+    Each statement is reduced to a fingerprint: its SQL with literals and
+    placeholders replaced by "?", IN lists collapsed and whitespace
+    normalized, so every execution of one query shape lands in one series
+    whatever its parameters. The normalization is cached per SQL text (the
+    query-shape cache hands out the same strings), so recording a statement
+    costs a dictionary lookup, a bisect and a short critical section.
+
+    Series per fingerprint: a latency histogram, rows returned or affected,
+    errors, and the time spent waiting for a pooled connection before the
+    statement could run. Inside a Flask request the totals are also added to
+    the request so they can be reported per endpoint (see RequestMetrics).
+    """
+
+    _lock = threading.Lock()
+    _fingerprints = {}      # fingerprint id -> _FingerprintStats
+    _pool_wait = Histogram()
+
+    # Fingerprints beyond this many are counted under "other" to bound label cardinality
+    OTHER = "other"
+
+    _comments = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+    _strings = re.compile(r"'(?:[^']|'')*'")
+    _numbers = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+    _placeholders = re.compile(r"%s|\$\d+")
+    _in_lists = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+    _whitespace = re.compile(r"\s+")
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def fingerprint(query):
+        """
+        Returns (fingerprint_id, normalized_sql) for a statement.
+        """
+        text = QueryMetrics._comments.sub(" ", query)
+        text = QueryMetrics._strings.sub("?", text)
+        text = QueryMetrics._placeholders.sub("?", text)
+        text = QueryMetrics._numbers.sub("?", text)
+        text = QueryMetrics._in_lists.sub("(?+)", text)
+        text = QueryMetrics._whitespace.sub(" ", text).strip()
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16], text
+
+    @staticmethod
+    def record(query, seconds, rows=0, pool_wait=0.0, error=False):
+        """
+        Records one execution of `query`.
+
+        Args:
+            seconds (float): Execution time, excluding the wait for a connection.
+            rows (int): Rows returned or affected (negative counts are ignored).
+            pool_wait (float): Seconds spent waiting for the connection it ran on.
+        """
+        fingerprint, statement = QueryMetrics.fingerprint(query)
+        rows = rows if rows and rows > 0 else 0
+
+        with QueryMetrics._lock:
+            stats = QueryMetrics._fingerprints.get(fingerprint)
+            if stats is None:
+                if len(QueryMetrics._fingerprints) >= int(getattr(Config, "METRICS_MAX_FINGERPRINTS", 500)):
+                    fingerprint = QueryMetrics.OTHER
+                    stats = QueryMetrics._fingerprints.get(fingerprint)
+                if stats is None:
+                    stats = QueryMetrics._fingerprints[fingerprint] = _FingerprintStats(
+                        statement if fingerprint != QueryMetrics.OTHER else "(other statements)"
+                    )
+            stats.latency.observe(seconds)
+            stats.rows += rows
+            stats.pool_wait += pool_wait
+            if error:
+                stats.errors += 1
+
+        if has_request_context():
+            totals = g.get("_query_totals")
+            if totals is None:
+                totals = g._query_totals = [0, 0.0, 0, 0.0]
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += rows
+            totals[3] += pool_wait
+
+    @staticmethod
+    def record_pool_wait(seconds):
+        """
+        Records one connection checkout and how long it waited.
+        """
+        with QueryMetrics._lock:
+            QueryMetrics._pool_wait.observe(seconds)
+
+    @staticmethod
+    def request_totals():
+        """
+        Returns (statements, seconds, rows, pool_wait) recorded in the current request.
+        """
+        totals = g.get("_query_totals") if has_request_context() else None
+        return tuple(totals) if totals else (0, 0.0, 0, 0.0)
+
+    @staticmethod
+    def reset():
+        with QueryMetrics._lock:
+            QueryMetrics._fingerprints = {}
+            QueryMetrics._pool_wait = Histogram()
+
+    @staticmethod
+    def export(text):
+        """
+        Adds the query series to a MetricsText.
+        """
+        with QueryMetrics._lock:
+            fingerprints = list(QueryMetrics._fingerprints.items())
+            latency = [s for fp, stats in fingerprints
+                       for s in stats.latency.samples("db_query_duration_seconds", {"fingerprint": fp})]
+            rows = [({"fingerprint": fp}, stats.rows) for fp, stats in fingerprints]
+            errors = [({"fingerprint": fp}, stats.errors) for fp, stats in fingerprints]
+            waits = [({"fingerprint": fp}, stats.pool_wait) for fp, stats in fingerprints]
+            pool_wait = list(QueryMetrics._pool_wait.samples("db_pool_wait_seconds", {}))
+
+        text.add("db_query_duration_seconds", "histogram", "Statement execution time by SQL fingerprint.", latency)
+        text.add("db_query_rows_total", "counter", "Rows returned or affected by SQL fingerprint.", rows)
+        text.add("db_query_errors_total", "counter", "Failed statements by SQL fingerprint.", errors)
+        text.add("db_query_pool_wait_seconds_total", "counter",
+                 "Time statements waited for a pooled connection, by SQL fingerprint.", waits)
+        text.add("db_query_fingerprint_info", "gauge", "Normalized SQL of each fingerprint.",
+                 [({"fingerprint": fp, "statement": stats.statement[:500]}, 1) for fp, stats in fingerprints])
+        text.add("db_pool_wait_seconds", "histogram", "Time spent waiting to check out a pooled connection.", pool_wait)
@@ -0,0 +1,260 @@
+import hashlib
+import os
+import re
+import time
+from .db_connection import DatabaseConnection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+# "0005_hot_path_indexes.sql" -> version 5, name "hot_path_indexes"
+_FILE_NAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+# First-line marker for files that must run outside a transaction (e.g. CREATE INDEX CONCURRENTLY)
+_NO_TRANSACTION = re.compile(r"^\s*--\s*migrate:\s*no-transaction\s*$", re.I | re.M)
+_CONCURRENT_INDEX = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.I
+)
+
+
+class MigrationError(Exception):
+    """Raised when migrations cannot be applied (bad files, edited history, or a failed statement)."""
+
+
+class Migration:
+    """
+    One migration file.
+    """
+
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+        with open(path, "rb") as f:
+            raw = f.read()
+        self.sql = raw.decode("utf-8")
+        self.checksum = hashlib.sha256(raw).hexdigest()
+        self.transactional = not _NO_TRANSACTION.search(self.sql.split("\n", 1)[0])
+
+    def statements(self):
+        """
+        Splits a no-transaction migration into statements, one per trailing ";".
+
+        Such files hold plain DDL (no function bodies), since each statement
+        has to be sent on its own to run outside a transaction block.
+        """
+        statements = []
+        for chunk in re.split(r";\s*$", self.sql, flags=re.M):
+            code = "\n".join(line for line in chunk.splitlines() if not line.strip().startswith("--")).strip()
+            if code:
+                statements.append(code)
+        return statements
+
+    def concurrent_indexes(self):
+        return _CONCURRENT_INDEX.findall(self.sql)
+
+
+class Migrations:
+    """
+    Ordered, checksummed schema migrations in Models/migrations.
+
+    Files are named NNNN_description.sql and applied in version order. Each
+    applied file is recorded in schema_migrations with the SHA-256 of its
+    contents; editing a file after it was applied is reported and stops
+    further migrations, so changes always go in a new file.
+
+    A migration runs in one transaction with its bookkeeping row, unless its
+    first line is "-- migrate: no-transaction", in which case its statements
+    run one by one in autocommit mode (required for CREATE INDEX CONCURRENTLY).
+    If such a migration fails, the invalid indexes it left behind are dropped
+    so the next run can build them again.
+
+    Runs take a session advisory lock, so concurrent deploys apply each
+    migration once.
+    """
+
+    TABLE = "schema_migrations"
+    # pg_advisory_lock key; any constant shared by every runner works
+    LOCK_ID = 720_451_977
+
+    @staticmethod
+    def discover(directory=MIGRATIONS_DIR):
+        """
+        Returns the migration files in version order.
+
+        Raises:
+            MigrationError: If a file name is malformed or two files share a version.
+        """
+        migrations = {}
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".sql"):
+                continue
+            match = _FILE_NAME.match(filename)
+            if not match:
+                raise MigrationError(f"Migration file '{filename}' is not named NNNN_description.sql.")
+            version = int(match.group(1))
+            if version in migrations:
+                raise MigrationError(f"Migrations '{migrations[version].path}' and '{filename}' share version {version}.")
+            migrations[version] = Migration(version, match.group(2), os.path.join(directory, filename))
+        return [migrations[version] for version in sorted(migrations)]
+
+    @staticmethod
+    def status(directory=MIGRATIONS_DIR):
+        """
+        Compares the migration files with the applied ones.
+
+        Returns:
+            list[dict]: One entry per version with "version", "name", "applied_at" and "state":
+                "applied", "pending", "changed" (edited since applied) or "missing" (applied, file gone).
+        """
+        migrations = Migrations.discover(directory)
+        conn = Migrations._connect()
+        try:
+            applied = Migrations._applied(conn)
+        finally:
+            conn.close()
+        return Migrations._compare(migrations, applied)
+
+    @staticmethod
+    def apply(directory=MIGRATIONS_DIR, target=None, dry_run=False, log=print):
+        """
+        Applies the pending migrations up to `target` (all by default).
+
+        Args:
+            target (int, optional): Highest version to apply.
+            dry_run (bool): Only report what would be applied.
+            log (callable): Receives progress messages.
+
+        Returns:
+            list[Migration]: The migrations applied (or that would be, when dry_run).
+
+        Raises:
+            MigrationError: If an applied migration was edited or removed, or a migration fails.
+        """
+        migrations = Migrations.discover(directory)
+        conn = Migrations._connect()
+        try:
+            with conn.cursor() as cur:
+                # Index builds and backfills can outlast a server-wide statement_timeout
+                cur.execute("SET statement_timeout = 0")
+                # Session-level: held across the migrations' commits, released when the connection closes
+                cur.execute("SELECT pg_advisory_lock(%s)", (Migrations.LOCK_ID,))
+
+            # Read under the lock so a concurrent runner's work is seen
+            entries = Migrations._compare(migrations, Migrations._applied(conn))
+            problems = [e for e in entries if e["state"] in ("changed", "missing")]
+            if problems:
+                raise MigrationError("Applied migrations no longer match their files: " + ", ".join(
+                    f"{e['version']:04d}_{e['name']} ({e['state']})" for e in problems
+                ))
+
+            pending_versions = {e["version"] for e in entries if e["state"] == "pending"}
+            pending = [m for m in migrations
+                       if m.version in pending_versions and (target is None or m.version <= target)]
+            for migration in pending:
+                if dry_run:
+                    log(f"Would apply {migration.version:04d}_{migration.name}")
+                    continue
+                log(f"Applying {migration.version:04d}_{migration.name}...")
+                seconds = Migrations._run(conn, migration)
+                log(f"Applied {migration.version:04d}_{migration.name} in {seconds:.2f}s")
+            return pending
+        finally:
+            conn.close()
+
+    # ---------- Internals ----------
+    @staticmethod
+    def _connect():
+        # A dedicated connection: the advisory lock and autocommit switches are session state
+        conn = DatabaseConnection().connect()
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS {Migrations.TABLE} (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    checksum TEXT NOT NULL,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    execution_ms INTEGER NOT NULL
+                )
+            """)
+        return conn
+
+    @staticmethod
+    def _applied(conn):
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT version, name, checksum, applied_at FROM {Migrations.TABLE} ORDER BY version")
+            return {row[0]: row for row in cur.fetchall()}
+
+    @staticmethod
+    def _compare(migrations, applied):
+        entries = []
+        for migration in migrations:
+            row = applied.get(migration.version)
+            if row is None:
+                state = "pending"
+            elif row[2] != migration.checksum:
+                state = "changed"
+            else:
+                state = "applied"
+            entries.append({"version": migration.version, "name": migration.name, "state": state,
+                            "applied_at": row[3] if row else None})
+        files = {m.version for m in migrations}
+        for version, name, _, applied_at in applied.values():
+            if version not in files:
+                entries.append({"version": version, "name": name, "state": "missing", "applied_at": applied_at})
+        return sorted(entries, key=lambda e: e["version"])
+
+    @staticmethod
+    def _record(cur, migration, seconds):
+        cur.execute(
+            f"INSERT INTO {Migrations.TABLE} (version, name, checksum, execution_ms) VALUES (%s, %s, %s, %s)",
+            (migration.version, migration.name, migration.checksum, int(seconds * 1000))
+        )
+
+    @staticmethod
+    def _run(conn, migration):
+        start = time.perf_counter()
+        if migration.transactional:
+            conn.autocommit = False
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(migration.sql)
+                    Migrations._record(cur, migration, time.perf_counter() - start)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise MigrationError(f"Migration {migration.version:04d}_{migration.name} failed: {e}") from e
+            finally:
+                conn.autocommit = True
+            return time.perf_counter() - start
+
+        try:
+            with conn.cursor() as cur:
+                for statement in migration.statements():
+                    cur.execute(statement)
+                Migrations._record(cur, migration, time.perf_counter() - start)
+        except Exception as e:
+            Migrations._drop_invalid_indexes(conn, migration)
+            raise MigrationError(f"Migration {migration.version:04d}_{migration.name} failed: {e}") from e
+        return time.perf_counter() - start
+
+    @staticmethod
+    def _drop_invalid_indexes(conn, migration):
+        """
+        Drops indexes of `migration` left INVALID by a failed concurrent build;
+        IF NOT EXISTS would otherwise skip them on the next run.
+        """
+        names = migration.concurrent_indexes()
+        if not names:
+            return
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT c.relname
+                    FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    WHERE NOT i.indisvalid AND c.relname = ANY(%s) AND pg_table_is_visible(c.oid)
+                """, (names,))
+                for (name,) in cur.fetchall():
+                    cur.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+        except Exception as e:
+            print("Error dropping invalid indexes:", e)
@@ -0,0 +1,82 @@
+import base64
+import binascii
+import json
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the request."""
+
+
+class KeysetPagination:
+    """
+    Helpers for keyset (seek) pagination.
+
+    A cursor is an opaque, URL-safe token holding the sort value and tie-breaker
+    key of the last row on a page, together with the ordering it was issued for.
+    Seeking from it with a row comparison lets every page use the ORDER BY index
+    instead of scanning and discarding OFFSET rows.
+    """
+
+    @staticmethod
+    def encode_cursor(order_by: str, direction: str, sort_value, key_value):
+        payload = {"o": order_by, "d": direction, "v": sort_value, "k": key_value}
+        raw = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str, order_by: str, direction: str):
+        """
+        Decodes a cursor issued for the given ordering.
+
+        Returns:
+            tuple: (sort_value, key_value)
+
+        Raises:
+            InvalidCursorError: If the token is malformed or was issued for a different ordering.
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            sort_value, key_value = payload["v"], payload["k"]
+            issued_for = (payload["o"], payload["d"])
+        except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+            raise InvalidCursorError("Malformed cursor.")
+
+        if issued_for != (order_by, direction):
+            raise InvalidCursorError("Cursor does not match the requested ordering.")
+        return sort_value, key_value
+
+    @staticmethod
+    def seek_clause(sort_column: str, key_column: str, direction: str):
+        """
+        Builds the WHERE predicate that skips past the cursor row.
+
+        Both columns are ordered in the same direction, so a row-value comparison
+        expresses "after the cursor" in a single index-friendly predicate.
+        """
+        operator = "<" if direction == "DESC" else ">"
+        return f"({sort_column}, {key_column}) {operator} (%s, %s)"
+
+    @staticmethod
+    def order_clause(sort_column: str, key_column: str, direction: str):
+        if sort_column == key_column:
+            return f"ORDER BY {sort_column} {direction}"
+        return f"ORDER BY {sort_column} {direction}, {key_column} {direction}"
+
+    @staticmethod
+    def build_page(rows, limit: int, order_by: str, direction: str, sort_index: int, key_index: int):
+        """
+        Trims a LIMIT + 1 fetch down to one page and derives the next cursor.
+
+        Returns:
+            tuple: (page_rows, next_cursor) where next_cursor is None on the last page.
+        """
+        if limit <= 0:
+            return [], None
+        if len(rows) <= limit:
+            return rows, None
+
+        page = rows[:limit]
+        last = page[-1]
+        next_cursor = KeysetPagination.encode_cursor(order_by, direction, last[sort_index], last[key_index])
+        return page, next_cursor
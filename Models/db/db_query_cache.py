@@ -0,0 +1,127 @@
+import hashlib
+import re
+import threading
+
+
+class QueryShapeCache:
+    """
+    Caches generated SQL text per query shape.
+
+    A shape is a hashable key capturing everything that changes the SQL text
+    (e.g. filter keys, order column, direction, paging mode) but not the bound
+    values, so the string is built once per shape instead of once per request.
+    """
+
+    MAX_SHAPES = 1024
+
+    _lock = threading.Lock()
+    _shapes = {}
+    _hits = 0
+    _misses = 0
+
+    @classmethod
+    def get(cls, key, builder):
+        """
+        Returns the SQL for `key`, calling builder() to generate it on a miss.
+        """
+        sql = cls._shapes.get(key)
+        if sql is not None:
+            with cls._lock:
+                cls._hits += 1
+            return sql
+
+        sql = builder()
+        with cls._lock:
+            cls._misses += 1
+            # Shapes are bounded by the column maps; the cap only guards against misuse
+            if len(cls._shapes) < cls.MAX_SHAPES:
+                cls._shapes[key] = sql
+        return sql
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._shapes.clear()
+
+    @classmethod
+    def stats(cls):
+        with cls._lock:
+            stats = {"shapes": len(cls._shapes), "hits": cls._hits, "misses": cls._misses}
+        stats.update(PreparedStatements.stats())
+        return stats
+
+
+class PreparedStatements:
+    """
+    Executes queries as server-side prepared statements, prepared once per connection.
+
+    Statements are named after a hash of their SQL text, so identical shapes
+    share a plan on every connection and Postgres skips re-parsing them.
+    Connections must come from PreparedStatementConnection (see
+    db_connection.py); others fall back to plain execution.
+    """
+
+    # Beyond this many statements per connection, new shapes run unprepared
+    MAX_PER_CONNECTION = 256
+
+    _placeholder = re.compile(r"%%|%s")
+
+    _lock = threading.Lock()
+    _prepares = 0
+    _executions = 0
+
+    @staticmethod
+    def statement_name(query):
+        return "ps_" + hashlib.sha1(query.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def to_server_placeholders(query):
+        """
+        Rewrites psycopg2 %s placeholders as $1..$n (and %% as %).
+
+        Returns:
+            tuple: (sql, parameter_count)
+        """
+        count = 0
+
+        def replace(match):
+            nonlocal count
+            if match.group(0) == "%%":
+                return "%"
+            count += 1
+            return f"${count}"
+
+        return PreparedStatements._placeholder.sub(replace, query), count
+
+    @staticmethod
+    def execute(conn, cur, query, params=None):
+        prepared = getattr(conn, "prepared_statements", None)
+        name = PreparedStatements.statement_name(query) if prepared is not None else None
+        if prepared is None or (name not in prepared and len(prepared) >= PreparedStatements.MAX_PER_CONNECTION):
+            cur.execute(query, params or ())
+            return
+
+        if name not in prepared:
+            sql, count = PreparedStatements.to_server_placeholders(query)
+            # No parameters passed, so psycopg2 leaves the text untouched
+            cur.execute(f"PREPARE {name} AS {sql}")
+            prepared[name] = count
+            with PreparedStatements._lock:
+                PreparedStatements._prepares += 1
+
+        params = tuple(params or ())
+        if params:
+            cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cur.execute(f"EXECUTE {name}")
+
+        with PreparedStatements._lock:
+            PreparedStatements._executions += 1
+
+    @staticmethod
+    def stats():
+        with PreparedStatements._lock:
+            return {
+                "prepares": PreparedStatements._prepares,
+                "prepared_executions": PreparedStatements._executions,
+            }
@@ -0,0 +1,70 @@
+import threading
+from .db_table_versions import TableVersions
+from .db_utils import DBUtils
+
+
+class ReferenceCache:
+    """
+    In-memory cache for data read far more often than it changes (the college
+    and program lists and the enrollment summary).
+
+    Each entry remembers the versions of the tables it was loaded from and is
+    reloaded as soon as any of them moves (see TableVersions), so results are
+    never served across a committed write, in this process or any other.
+    """
+
+    MAX_ENTRIES = 256
+
+    _lock = threading.Lock()
+    _entries = {}   # key -> (tables, versions, value)
+    _hits = 0
+    _misses = 0
+
+    @classmethod
+    def get(cls, tables, key, loader):
+        """
+        Returns the cached value for `key`, calling loader() when it is missing or stale.
+
+        Args:
+            tables (tuple): Tables the value is derived from.
+            key (hashable): Cache key, unique across all callers.
+            loader (callable): Produces the value from the database.
+        """
+        uow = DBUtils.current_unit()
+        if uow is not None and uow.wrote:
+            # The loader would see this transaction's uncommitted writes; they must not be cached
+            return loader()
+
+        versions = tuple(TableVersions.get(table) for table in tables)
+
+        entry = cls._entries.get(key)
+        if entry is not None and entry[1] == versions:
+            with cls._lock:
+                cls._hits += 1
+            return entry[2]
+
+        # Loaded against the versions read above: a concurrent write bumps the
+        # version and the next call reloads
+        value = loader()
+        with cls._lock:
+            cls._misses += 1
+            if len(cls._entries) >= cls.MAX_ENTRIES:
+                cls._entries.clear()
+            cls._entries[key] = (tables, versions, value)
+        return value
+
+    @classmethod
+    def invalidate(cls, table):
+        """
+        Drops every entry derived from `table`. Write models register it with
+        DBUtils.on_commit, so it runs once the change is visible to other connections.
+        """
+        TableVersions.invalidate(table)
+        with cls._lock:
+            for key in [k for k, entry in cls._entries.items() if table in entry[0]]:
+                del cls._entries[key]
+
+    @classmethod
+    def stats(cls):
+        with cls._lock:
+            return {"entries": len(cls._entries), "hits": cls._hits, "misses": cls._misses}
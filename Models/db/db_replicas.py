@@ -0,0 +1,145 @@
+import threading
+import time
+from flask import g, has_request_context, session
+from config import Config
+
+
+def parse_lsn(text):
+    """
+    Converts a pg_lsn such as "16/B374D848" to an integer, so positions can be compared.
+    """
+    high, low = text.split("/")
+    return (int(high, 16) << 32) | int(low, 16)
+
+
+class ReplicaRouting:
+    """
+    Decides whether the read replica may serve a read.
+
+    A session that has just written must see its write, but streaming
+    replication applies it on the replica some time later. After each commit
+    that wrote, the primary's WAL position is stored in the session; the
+    session's reads go to the primary until the replica has replayed past
+    that position, or for at most DB_READ_YOUR_WRITES_WINDOW seconds. The
+    highest replay position seen is remembered per process, so the replica
+    is only asked again while it is still behind.
+
+    A replica that cannot be reached is skipped for DB_REPLICA_RETRY_AFTER
+    seconds, during which every read goes to the primary.
+
+    Responses tagged with table versions (see versioned_etag) must not carry
+    a version newer than their body, or a client would keep a stale replica
+    body through 304s. Such requests call track_versions(); their first
+    replica read then records the replica's versions before running, and
+    the tag is built from those.
+    """
+
+    SESSION_KEY = "_db_write_lsn"
+
+    _lock = threading.Lock()
+    _replay_lsn = -1        # highest position the replica was seen to have replayed
+    _down_until = 0.0
+
+    # ---------- Public API ----------
+    @classmethod
+    def available(cls):
+        return time.monotonic() >= cls._down_until
+
+    @classmethod
+    def mark_down(cls):
+        cls._down_until = time.monotonic() + getattr(Config, "DB_REPLICA_RETRY_AFTER", 10.0)
+
+    @staticmethod
+    def record_write(conn):
+        """
+        Remembers, in the session, the primary's WAL position after a commit that wrote.
+
+        Args:
+            conn: The primary connection the write was committed on.
+        """
+        if not has_request_context():
+            return
+        lsn = None
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT pg_current_wal_lsn()::text")
+            lsn = cur.fetchone()[0]
+            cur.close()
+            conn.rollback()
+        except Exception as e:
+            # Without a position the session stays on the primary for the whole window
+            print("Error reading WAL position:", e)
+        window = getattr(Config, "DB_READ_YOUR_WRITES_WINDOW", 30.0)
+        session[ReplicaRouting.SESSION_KEY] = [lsn, time.time() + window]
+
+    @classmethod
+    def caught_up(cls, conn):
+        """
+        Returns True when the replica has replayed the current session's last write.
+
+        Args:
+            conn: A replica connection, used only when the known replay position is behind.
+        """
+        entry = session.get(cls.SESSION_KEY) if has_request_context() else None
+        if not entry:
+            return True
+        lsn, expires_at = entry
+        if time.time() >= expires_at:
+            session.pop(cls.SESSION_KEY, None)
+            return True
+        if lsn is None:
+            return False
+
+        required = parse_lsn(lsn)
+        if cls._replay_lsn >= required:
+            return True
+
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT pg_last_wal_replay_lsn()::text")
+            replayed = cur.fetchone()[0]
+        finally:
+            cur.close()
+        if replayed is None:
+            # Not a standby, so its position cannot be compared with the primary's
+            return False
+        replayed = parse_lsn(replayed)
+        with cls._lock:
+            cls._replay_lsn = max(cls._replay_lsn, replayed)
+        return replayed >= required
+
+    # ---------- Versions for ETags ----------
+    @staticmethod
+    def track_versions(tables):
+        """
+        Asks this request's replica reads to record the versions of `tables` they start from.
+        """
+        g._replica_version_tables = tuple(tables)
+
+    @staticmethod
+    def tracked_versions():
+        """
+        Returns the versions recorded by the request's first replica read, in
+        track_versions() order, or None if no read went to the replica.
+        """
+        return g.get("_replica_versions")
+
+    @staticmethod
+    def record_versions(conn):
+        """
+        Reads the tracked table versions on a replica connection, once per request.
+
+        Called before the read itself, so the body is at least as new as the versions.
+        """
+        if not has_request_context():
+            return
+        tables = g.get("_replica_version_tables")
+        if not tables or "_replica_versions" in g:
+            return
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT table_name, version FROM table_versions WHERE table_name = ANY(%s)", (list(tables),))
+            found = dict(cur.fetchall())
+        finally:
+            cur.close()
+        g._replica_versions = [found.get(table, 0) for table in tables]
@@ -0,0 +1,144 @@
+class SearchStatement:
+    """
+    Builds single-statement search queries that return the total count and one page together.
+
+    The search models try the whole query as a phrase first and fall back to
+    matching every token. Because a phrase match is always also a token match,
+    both can be evaluated in one pass: candidates are selected with the token
+    predicate and flagged with the phrase predicate, and if any candidate is a
+    phrase match only those are kept. The count and the page are then read
+    from the same materialized set, so the join and LIKE predicates run once
+    per request instead of up to three times.
+
+    Result rows are (total_count, page_row, *page_columns), where page_row is
+    TRUE for real page rows. When the page is empty (e.g. offset past the end)
+    a single row carrying only the count is returned; use split() to separate
+    the two.
+    """
+
+    @staticmethod
+    def build(columns_sql, from_sql, key_column, exact_where, exact_params, token_where, token_params,
+              order_sql, order_params=(), page_where=None, page_params=(), limit=20, offset=0, page_from_sql=None):
+        """
+        Args:
+            columns_sql (str): SELECT list of the page.
+            from_sql (str): FROM/JOIN clause of the match (and of the page unless page_from_sql is given).
+            key_column (str): Unique key of the searched table, e.g. "s.id_number".
+            exact_where / token_where (list[str]): Predicates ANDed together; empty means TRUE.
+            order_sql (str): ORDER BY clause of the page.
+            page_where (str, optional): Extra page-only predicate that must not affect the count
+                (e.g. a keyset seek).
+            page_from_sql (str, optional): FROM/JOIN clause of the page, when it needs
+                different joins than the match (e.g. only those of the selected columns).
+
+        Returns:
+            tuple: (sql, params)
+        """
+        exact_sql = " AND ".join(exact_where) if exact_where else "TRUE"
+        token_sql = " AND ".join(token_where) if token_where else "TRUE"
+        page_filter = f"AND {page_where}" if page_where else ""
+        page_from_sql = page_from_sql or from_sql
+
+        # The outer query has exactly one row (the count), so the lateral page
+        # keeps its own ORDER BY.
+        sql = f"""
+            WITH candidates AS (
+                SELECT {key_column} AS search_key, ({exact_sql}) AS is_exact
+                {from_sql}
+                WHERE {token_sql}
+            ),
+            matched AS (
+                SELECT search_key FROM candidates
+                WHERE is_exact OR NOT EXISTS (SELECT 1 FROM candidates WHERE is_exact)
+            )
+            SELECT t.total_count, page.*
+            FROM (SELECT COUNT(*) AS total_count FROM matched) t
+            LEFT JOIN LATERAL (
+                SELECT TRUE AS page_row, {columns_sql}
+                {page_from_sql}
+                WHERE {key_column} IN (SELECT search_key FROM matched)
+                {page_filter}
+                {order_sql}
+                LIMIT %s OFFSET %s
+            ) page ON TRUE
+        """
+        params = list(exact_params) + list(token_params) + list(page_params) + list(order_params) + [limit, offset]
+        return sql, params
+
+    @staticmethod
+    def build_all(columns_sql, from_sql, key_column, exact_where, exact_params, token_where, token_params,
+                  order_sql, order_params=()):
+        """
+        Builds a statement returning every matching row (no count, no paging), for exports.
+
+        Uses the same phrase-then-token resolution as build().
+
+        Returns:
+            tuple: (sql, params)
+        """
+        exact_sql = " AND ".join(exact_where) if exact_where else "TRUE"
+        token_sql = " AND ".join(token_where) if token_where else "TRUE"
+
+        sql = f"""
+            WITH candidates AS (
+                SELECT {key_column} AS search_key, ({exact_sql}) AS is_exact
+                {from_sql}
+                WHERE {token_sql}
+            )
+            SELECT {columns_sql}
+            {from_sql}
+            WHERE {key_column} IN (
+                SELECT search_key FROM candidates
+                WHERE is_exact OR NOT EXISTS (SELECT 1 FROM candidates WHERE is_exact)
+            )
+            {order_sql}
+        """
+        params = list(exact_params) + list(token_params) + list(order_params)
+        return sql, params
+
+    @staticmethod
+    def build_estimated(columns_sql, from_sql, table, order_sql, order_params=(),
+                        page_where=None, page_params=(), limit=20, offset=0):
+        """
+        Builds an unfiltered page query whose count is the planner's row estimate for `table`.
+
+        Meant for the broadest searches (an empty query), where an exact COUNT
+        over the whole join costs more than the page itself. Falls back to an
+        exact count while the table has never been analyzed.
+
+        Returns:
+            tuple: (sql, params)
+        """
+        page_filter = f"WHERE {page_where}" if page_where else ""
+
+        sql = f"""
+            SELECT t.total_count, page.*
+            FROM (
+                SELECT CASE
+                    WHEN reltuples > 0 THEN reltuples::bigint
+                    ELSE (SELECT COUNT(*) FROM {table})
+                END AS total_count
+                FROM pg_class
+                WHERE oid = %s::regclass
+            ) t
+            LEFT JOIN LATERAL (
+                SELECT TRUE AS page_row, {columns_sql}
+                {from_sql}
+                {page_filter}
+                {order_sql}
+                LIMIT %s OFFSET %s
+            ) page ON TRUE
+        """
+        params = [table] + list(page_params) + list(order_params) + [limit, offset]
+        return sql, params
+
+    @staticmethod
+    def split(rows):
+        """
+        Returns:
+            tuple: (total_count, page_rows) with the count and marker columns stripped from each row.
+        """
+        if not rows:
+            return 0, []
+        total_count = rows[0][0]
+        return total_count, [row[2:] for row in rows if row[1]]
@@ -0,0 +1,211 @@
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from config import Config
+from .db_metrics import QueryMetrics
+
+# Frames in these files are skipped when looking for the code that issued a statement
+_DB_LAYER = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(os.path.dirname(_DB_LAYER))
+
+# Statements that are safe to run again under EXPLAIN ANALYZE: plain reads, including
+# WITH queries (the search statements) without data-modifying CTEs or row locks
+_READ_ONLY = re.compile(r"^\s*(SELECT|WITH)\b", re.I)
+_WRITES = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE|FOR\s+(NO\s+KEY\s+)?UPDATE|FOR\s+(KEY\s+)?SHARE)\b", re.I)
+
+
+class SlowQueryLog:
+    """
+    Records statements slower than SLOW_QUERY_THRESHOLD_MS.
+
+    Each slow statement is logged with its normalized SQL (see
+    QueryMetrics.fingerprint), the shape of its bound parameters (types and
+    list lengths, never the values) and the first caller outside Models/db.
+    A sample of them (SLOW_QUERY_EXPLAIN_SAMPLE, at most once per fingerprint
+    every SLOW_QUERY_EXPLAIN_INTERVAL seconds) is re-run under
+    EXPLAIN (ANALYZE, BUFFERS) by a background thread on its own connection,
+    always inside a transaction that is rolled back. Only read-only SELECT
+    and WITH statements are explained, since ANALYZE executes the statement.
+
+    The newest SLOW_QUERY_LOG_SIZE entries, with their plans, are kept in
+    memory and served by the admin endpoint.
+    """
+
+    _lock = threading.Lock()
+    _entries = None             # deque of entry dicts, newest on the right
+    _last_explained = {}        # fingerprint -> time of the last EXPLAIN
+    _sequence = 0
+
+    _queue = None
+    _worker = None
+    _worker_pid = None
+
+    @staticmethod
+    def threshold():
+        """
+        Returns the slow-statement threshold in seconds (None when disabled).
+        """
+        threshold_ms = float(getattr(Config, "SLOW_QUERY_THRESHOLD_MS", 500))
+        return threshold_ms / 1000.0 if threshold_ms > 0 else None
+
+    @staticmethod
+    def observe(query, params, seconds, rows=0):
+        """
+        Called for every executed statement; only statements over the threshold do any work.
+        """
+        threshold = SlowQueryLog.threshold()
+        if threshold is None or seconds < threshold:
+            return
+        try:
+            SlowQueryLog._capture(query, params, seconds, rows)
+        except Exception as e:
+            # Diagnostics must never fail the statement they observe
+            print("Error recording slow query:", e)
+
+    @staticmethod
+    def param_shape(params):
+        """
+        Describes bound parameters without their values, e.g. ["str", "int", "list[3]"].
+        """
+        shape = []
+        for value in params or ():
+            if isinstance(value, (list, tuple)):
+                shape.append(f"{type(value).__name__}[{len(value)}]")
+            else:
+                shape.append(type(value).__name__)
+        return shape
+
+    @staticmethod
+    def caller():
+        """
+        Returns "file:line in function" of the nearest frame outside Models/db.
+        """
+        frame = sys._getframe(1)
+        while frame is not None:
+            filename = os.path.abspath(frame.f_code.co_filename)
+            if not filename.startswith(_DB_LAYER) and "contextlib" not in filename:
+                return f"{os.path.relpath(filename, _ROOT)}:{frame.f_lineno} in {frame.f_code.co_name}"
+            frame = frame.f_back
+        return None
+
+    @staticmethod
+    def entries(limit=None):
+        """
+        Returns the logged slow statements, newest first.
+        """
+        with SlowQueryLog._lock:
+            entries = list(SlowQueryLog._entries or ())
+        entries.reverse()
+        return [dict(entry) for entry in entries[:limit]]
+
+    @staticmethod
+    def clear():
+        with SlowQueryLog._lock:
+            SlowQueryLog._entries = None
+            SlowQueryLog._last_explained = {}
+
+    # ---------- Internals ----------
+    @staticmethod
+    def _capture(query, params, seconds, rows):
+        fingerprint, statement = QueryMetrics.fingerprint(query)
+        now = time.time()
+        entry = {
+            "id": None,
+            "fingerprint": fingerprint,
+            "statement": statement,
+            "param_shape": SlowQueryLog.param_shape(params),
+            "caller": SlowQueryLog.caller(),
+            "duration_ms": round(seconds * 1000, 3),
+            "rows": rows if rows and rows > 0 else 0,
+            "at": now,
+            "plan": None,
+            "plan_status": "not sampled",
+        }
+
+        explain = SlowQueryLog._should_explain(statement, fingerprint, now)
+        if explain:
+            entry["plan_status"] = "pending"
+
+        with SlowQueryLog._lock:
+            if SlowQueryLog._entries is None:
+                SlowQueryLog._entries = deque(maxlen=int(getattr(Config, "SLOW_QUERY_LOG_SIZE", 100)))
+            SlowQueryLog._sequence += 1
+            entry["id"] = SlowQueryLog._sequence
+            SlowQueryLog._entries.append(entry)
+
+        print(f"Slow query ({entry['duration_ms']} ms, {entry['rows']} rows) from {entry['caller']}: "
+              f"{statement[:300]} params={entry['param_shape']}")
+
+        if explain:
+            try:
+                SlowQueryLog._explain_queue().put_nowait((entry, query, tuple(params or ())))
+            except queue.Full:
+                entry["plan_status"] = "skipped (queue full)"
+
+    @staticmethod
+    def _should_explain(statement, fingerprint, now):
+        if not _READ_ONLY.match(statement) or _WRITES.search(statement):
+            return False
+        if random.random() >= float(getattr(Config, "SLOW_QUERY_EXPLAIN_SAMPLE", 0.1)):
+            return False
+        interval = float(getattr(Config, "SLOW_QUERY_EXPLAIN_INTERVAL", 300))
+        with SlowQueryLog._lock:
+            if now - SlowQueryLog._last_explained.get(fingerprint, 0) < interval:
+                return False
+            SlowQueryLog._last_explained[fingerprint] = now
+        return True
+
+    @staticmethod
+    def _explain_queue():
+        # One worker per process; threads do not survive fork()
+        if SlowQueryLog._worker_pid != os.getpid():
+            with SlowQueryLog._lock:
+                if SlowQueryLog._worker_pid != os.getpid():
+                    SlowQueryLog._queue = queue.Queue(maxsize=16)
+                    SlowQueryLog._worker = threading.Thread(
+                        target=SlowQueryLog._run_worker, args=(SlowQueryLog._queue,),
+                        name="slow-query-explain", daemon=True
+                    )
+                    SlowQueryLog._worker.start()
+                    SlowQueryLog._worker_pid = os.getpid()
+        return SlowQueryLog._queue
+
+    @staticmethod
+    def _run_worker(jobs):
+        from .db_connection import DatabaseConnection
+
+        conn = None
+        while True:
+            entry, query, params = jobs.get()
+            try:
+                if conn is None or conn.closed:
+                    conn = DatabaseConnection().connect()
+                entry["plan"] = SlowQueryLog._explain(conn, query, params)
+                entry["plan_status"] = "captured"
+            except Exception as e:
+                entry["plan_status"] = f"failed: {e}".strip()
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                    conn = None
+
+    @staticmethod
+    def _explain(conn, query, params):
+        timeout_ms = int(float(getattr(Config, "SLOW_QUERY_EXPLAIN_TIMEOUT", 30)) * 1000)
+        cur = conn.cursor()
+        try:
+            # SET LOCAL only lasts until the rollback below
+            cur.execute("SET LOCAL statement_timeout = %s", (timeout_ms,))
+            # Always pass a tuple so %% escapes are unescaped as in the original execution
+            cur.execute("EXPLAIN (ANALYZE, BUFFERS) " + query, tuple(params))
+            return "\n".join(row[0] for row in cur.fetchall())
+        finally:
+            cur.close()
+            conn.rollback()
@@ -0,0 +1,120 @@
+import os
+import select
+import threading
+import time
+from psycopg2 import extensions
+from config import Config
+from .db_connection import DatabaseConnection
+from .db_utils import DBUtils
+
+
+class TableVersions:
+    """
+    Process-local view of the per-table change versions in `table_versions`.
+
+    Triggers bump a table's version on every write and NOTIFY the new value
+    (see Models/migrations/0002_table_versions.sql). A background thread in each worker
+    process LISTENs for those notifications, so while it is connected a
+    version lookup is a dictionary read. If the listener is down, versions
+    are re-read from the database at most once per POLL_INTERVAL.
+    """
+
+    CHANNEL = "table_versions"
+    POLL_INTERVAL = 1.0
+    RECONNECT_DELAY = 5.0
+
+    _lock = threading.Lock()
+    _versions = {}          # table -> (version, fetched_at)
+    _listening = False
+    _listener_pid = None
+
+    # ---------- Public API ----------
+    @classmethod
+    def get(cls, table):
+        """
+        Returns the current version of `table`.
+        """
+        cls._ensure_listener()
+
+        entry = cls._versions.get(table)
+        if entry is not None and (cls._listening or time.monotonic() - entry[1] < cls.POLL_INTERVAL):
+            return entry[0]
+
+        # Outside any unit of work: a writer's uncommitted bump must not be stored process-wide
+        rows = DBUtils.execute_query(
+            "SELECT version FROM table_versions WHERE table_name = %s", (table,), fetch=True, isolated=True
+        )
+        return cls._store(table, rows[0][0] if rows else 0)
+
+    @classmethod
+    def invalidate(cls, table):
+        """
+        Forgets the known version of `table` so the next get() re-reads it.
+
+        Used by write models for immediate effect in this process; other
+        processes are updated by the NOTIFY sent on commit.
+        """
+        with cls._lock:
+            cls._versions.pop(table, None)
+
+    # ---------- Internals ----------
+    @classmethod
+    def _store(cls, table, version):
+        # Versions only move forward; a slow read must not undo a newer notification
+        with cls._lock:
+            current = cls._versions.get(table)
+            if current is None or current[0] <= version:
+                cls._versions[table] = (version, time.monotonic())
+                return version
+            return current[0]
+
+    @classmethod
+    def _ensure_listener(cls):
+        # Threads do not survive fork(), so each worker process starts its own
+        if cls._listener_pid == os.getpid() or not getattr(Config, "DB_LISTEN_FOR_CHANGES", True):
+            return
+        with cls._lock:
+            if cls._listener_pid == os.getpid():
+                return
+            cls._listener_pid = os.getpid()
+            cls._listening = False
+            cls._versions = {}
+        threading.Thread(target=cls._listen_forever, name="table-versions-listener", daemon=True).start()
+
+    @classmethod
+    def _listen_forever(cls):
+        while True:
+            conn = None
+            try:
+                conn = DatabaseConnection().connect()
+                conn.set_isolation_level(extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                cur = conn.cursor()
+                cur.execute(f"LISTEN {cls.CHANNEL}")
+
+                # Anything read before LISTEN took effect may have missed a notification
+                with cls._lock:
+                    cls._versions.clear()
+                    cls._listening = True
+
+                while True:
+                    if select.select([conn], [], [], 60) == ([], [], []):
+                        # Idle: make sure the connection is still alive
+                        cur.execute("SELECT 1")
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        table, _, version = notify.payload.partition(":")
+                        if version.isdigit():
+                            cls._store(table, int(version))
+            except Exception as e:
+                print("Table version listener disconnected:", e)
+            finally:
+                with cls._lock:
+                    cls._listening = False
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            time.sleep(cls.RECONNECT_DELAY)
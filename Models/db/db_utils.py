@@ -1,18 +1,171 @@
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import extensions
+from flask import g, has_request_context, current_app, jsonify
 from .db_connection import DatabaseConnection
+from .db_query_cache import QueryShapeCache, PreparedStatements
+from .db_metrics import QueryMetrics
+from .db_slow_queries import SlowQueryLog
+from .db_replicas import ReplicaRouting
+
+# Command tags (cursor.statusmessage) of statements that change data or schema
+WRITE_COMMANDS = frozenset(("INSERT", "UPDATE", "DELETE", "MERGE", "COPY", "CREATE", "ALTER", "DROP", "TRUNCATE"))
+
+
+def _checkout(db, replica=False):
+    """
+    Takes a pooled connection (from the replica pool with replica=True), recording how long the checkout waited.
+
+    Returns:
+        tuple: (conn, seconds_waited)
+    """
+    start = time.perf_counter()
+    conn = db.get_replica_conn() if replica else db.get_conn()
+    waited = time.perf_counter() - start
+    QueryMetrics.record_pool_wait(waited)
+    return conn, waited
+
+
+def _is_write(cur):
+    return (cur.statusmessage or "").split(" ", 1)[0] in WRITE_COMMANDS
+
+
+def _run_pooled(conn, waited, query, params, fetch, prepared):
+    """
+    Runs one statement in its own transaction on a checked-out connection.
+
+    Returns:
+        tuple: (result, wrote)
+    """
+    cur = conn.cursor()
+    start = time.perf_counter()
+    try:
+        if prepared:
+            PreparedStatements.execute(conn, cur, query, params)
+        else:
+            cur.execute(query, params or ())
+        result = cur.fetchall() if fetch else None
+        wrote = _is_write(cur)
+        conn.commit()
+    except Exception:
+        elapsed = time.perf_counter() - start
+        QueryMetrics.record(query, elapsed, 0, waited, error=True)
+        SlowQueryLog.observe(query, params, elapsed)
+        raise
+    elapsed = time.perf_counter() - start
+    QueryMetrics.record(query, elapsed, cur.rowcount, waited)
+    SlowQueryLog.observe(query, params, elapsed, cur.rowcount)
+    cur.close()
+    return result, wrote
+
+
+class UnitOfWork:
+    """
+    One pooled connection and one open transaction shared by every query issued inside it.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        # The wait is charged to the first statement, which is what it delayed
+        self.conn, self.pool_wait = _checkout(db)
+        self.statements = 0
+        self.savepoints = 0
+        self.after_commit = []
+        # Whether anything was written since the last commit (see ReplicaRouting)
+        self.wrote = False
+
+    def execute(self, query, params=None, fetch=False, prepared=False):
+        cur = self.conn.cursor()
+        start = time.perf_counter()
+        failed = True
+        try:
+            if prepared:
+                PreparedStatements.execute(self.conn, cur, query, params)
+            else:
+                cur.execute(query, params or ())
+            self.statements += 1
+            self.wrote = self.wrote or _is_write(cur)
+            result = cur.fetchall() if fetch else None
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            QueryMetrics.record(query, elapsed, cur.rowcount, self.pool_wait, failed)
+            SlowQueryLog.observe(query, params, elapsed, cur.rowcount)
+            self.pool_wait = 0.0
+            cur.close()
+
+    def copy_expert(self, sql, file):
+        cur = self.conn.cursor()
+        start = time.perf_counter()
+        failed = True
+        try:
+            cur.copy_expert(sql, file)
+            self.statements += 1
+            self.wrote = True
+            failed = False
+            return cur.rowcount
+        finally:
+            QueryMetrics.record(sql, time.perf_counter() - start, cur.rowcount, self.pool_wait, failed)
+            self.pool_wait = 0.0
+            cur.close()
+
+    def commit(self):
+        wrote = self.wrote
+        self.conn.commit()
+        self.statements = 0
+        self.wrote = False
+        if wrote and self.db.has_replica():
+            ReplicaRouting.record_write(self.conn)
+        callbacks, self.after_commit = self.after_commit, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                # The transaction is already committed; a failed side effect must not undo it
+                print("Error in after-commit callback:", e)
+
+    def rollback(self):
+        self.conn.rollback()
+        self.statements = 0
+        self.wrote = False
+        self.after_commit = []
+
+    def close(self):
+        if self.conn is not None:
+            self.db.put_conn(self.conn)
+            self.conn = None
+
 
 class DBUtils:
+    # Units of work opened outside a Flask request (scripts, background threads)
+    _local = threading.local()
+
     @staticmethod
-    def execute_query(query, params=None, fetch=False):
+    def execute_query(query, params=None, fetch=False, prepared=False, isolated=False):
+        """
+        Runs one statement, inside the active unit of work if there is one.
+
+        With prepared=True the statement is executed as a server-side prepared
+        statement, prepared once per connection. With isolated=True it always
+        runs on its own connection and transaction, so it only sees committed
+        data even while the caller's unit of work has uncommitted writes.
+        """
+        uow = None if isolated else DBUtils.current_unit(create=True)
+        if uow is not None:
+            # Part of a larger unit of work: its owner commits or rolls back
+            return uow.execute(query, params, fetch, prepared)
+
         db = DatabaseConnection()
         conn = None
         try:
-            conn = db.get_conn()
-            cur = conn.cursor()
-            cur.execute(query, params or ())
-            
-            result = cur.fetchall() if fetch else None
-            conn.commit()
-            cur.close()
+            conn, waited = _checkout(db)
+            result, wrote = _run_pooled(conn, waited, query, params, fetch, prepared)
+            if wrote and db.has_replica():
+                ReplicaRouting.record_write(conn)
             return result
         except Exception as e:
             if conn:
@@ -21,3 +174,275 @@ class DBUtils:
         finally:
             if conn:
                 db.put_conn(conn)
+
+    @staticmethod
+    def read_query(query, params=None, prepared=False):
+        """
+        Runs a read-only statement on the read replica when one may serve it, else like execute_query.
+
+        Reads stay on the primary when no replica is configured or reachable,
+        inside a unit of work that has written (or any explicit transaction
+        outside a request), and while the session's last write has not been
+        replayed on the replica (see ReplicaRouting). A replica read that fails
+        with a connection or recovery-conflict error is retried on the primary.
+
+        Returns:
+            list: The fetched rows.
+        """
+        uow = DBUtils.current_unit()
+        stay_on_primary = uow is not None and (uow.wrote or not DBUtils._request_scoped())
+
+        db = DatabaseConnection()
+        conn, waited = (None, 0.0) if stay_on_primary else DBUtils._replica_checkout(db)
+        if conn is None:
+            return DBUtils.execute_query(query, params, fetch=True, prepared=prepared)
+
+        try:
+            result, _ = _run_pooled(conn, waited, query, params, True, prepared)
+            return result
+        except psycopg2.OperationalError as e:
+            print("Error reading from replica, retrying on primary:", e)
+            if conn.closed:
+                ReplicaRouting.mark_down()
+        finally:
+            # The pool rolls back or discards the connection as needed
+            db.put_replica_conn(conn)
+        return DBUtils.execute_query(query, params, fetch=True, prepared=prepared)
+
+    @staticmethod
+    def _replica_checkout(db):
+        """
+        Takes a replica connection that may serve the current session's reads.
+
+        Returns:
+            tuple: (conn, seconds_waited); conn is None when the read must go to the primary.
+        """
+        if not db.has_replica() or not ReplicaRouting.available():
+            return None, 0.0
+        try:
+            conn, waited = _checkout(db, replica=True)
+        except Exception as e:
+            print("Error connecting to replica, reading from primary:", e)
+            ReplicaRouting.mark_down()
+            return None, 0.0
+        try:
+            if ReplicaRouting.caught_up(conn):
+                ReplicaRouting.record_versions(conn)
+                return conn, waited
+        except Exception as e:
+            print("Error preparing replica read:", e)
+            if conn.closed:
+                ReplicaRouting.mark_down()
+        db.put_replica_conn(conn)
+        return None, 0.0
+
+    @staticmethod
+    def execute_shape(shape, builder, params=None, fetch=False):
+        """
+        Runs a dynamically built statement through the query-shape cache.
+
+        Args:
+            shape (tuple): Key identifying the SQL text (not the bound values).
+            builder (callable): Returns the SQL for `shape`; only called on a cache miss.
+        """
+        query = QueryShapeCache.get(shape, builder)
+        return DBUtils.execute_query(query, params, fetch, prepared=True)
+
+    @staticmethod
+    def copy_expert(sql, file):
+        """
+        Streams `file` into a COPY ... FROM STDIN statement (or out of COPY ... TO STDOUT).
+
+        Runs inside the active unit of work, or in its own transaction otherwise.
+
+        Returns:
+            int: Number of rows copied.
+        """
+        with DBUtils.transaction() as uow:
+            return uow.copy_expert(sql, file)
+
+    @staticmethod
+    def stream_query(query, params=None, batch_size=1000, replica=False):
+        """
+        Yields batches of rows from a named (server-side) cursor.
+
+        The generator checks out its own connection instead of joining the
+        request's unit of work, because a streamed response is consumed after
+        the view has returned. Memory use is bounded by batch_size regardless
+        of the result size. The connection is returned when the generator is
+        exhausted or closed.
+
+        With replica=True the rows are read from the read replica when it may
+        serve the session (see read_query); a replica failure mid-stream is not retried.
+        """
+        db = DatabaseConnection()
+        conn, waited = DBUtils._replica_checkout(db) if replica else (None, 0.0)
+        put_conn = db.put_replica_conn
+        if conn is None:
+            conn, waited = _checkout(db)
+            put_conn = db.put_conn
+        cur = None
+        # Time spent in the database only; time the consumer takes between batches is excluded
+        elapsed = 0.0
+        row_count = 0
+        failed = True
+        try:
+            cur = conn.cursor(name=f"stream_{uuid.uuid4().hex}")
+            cur.itersize = batch_size
+            start = time.perf_counter()
+            cur.execute(query, params or ())
+            while True:
+                rows = cur.fetchmany(batch_size)
+                elapsed += time.perf_counter() - start
+                if not rows:
+                    break
+                row_count += len(rows)
+                yield rows
+                start = time.perf_counter()
+            cur.close()
+            cur = None
+            conn.commit()
+            failed = False
+        except GeneratorExit:
+            # The consumer stopped early (e.g. the client disconnected); not a query failure
+            failed = False
+            raise
+        finally:
+            QueryMetrics.record(query, elapsed, row_count, waited, failed)
+            SlowQueryLog.observe(query, params, elapsed, row_count)
+            if cur is not None:
+                try:
+                    cur.close()
+                except Exception:
+                    pass
+            if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            put_conn(conn)
+
+    # ---------- Unit of work ----------
+    @staticmethod
+    def _request_scoped():
+        return has_request_context() and current_app.extensions.get("db_unit_of_work", False)
+
+    @staticmethod
+    def current_unit(create=False):
+        """
+        Returns the active unit of work, or None.
+
+        Inside a request of an app set up with init_app, the request's unit of
+        work is opened lazily on first use when create=True.
+        """
+        if DBUtils._request_scoped():
+            uow = g.get("_db_unit_of_work")
+            if uow is None and create:
+                uow = UnitOfWork(DatabaseConnection())
+                g._db_unit_of_work = uow
+            return uow
+        return getattr(DBUtils._local, "uow", None)
+
+    @staticmethod
+    @contextmanager
+    def transaction():
+        """
+        Runs the enclosed queries on one connection in one transaction.
+
+            with DBUtils.transaction():
+                DBUtils.execute_query(...)
+                DBUtils.execute_query(...)
+
+        The outermost block commits on success and rolls back on error. Inside
+        a request-scoped app the request is the outermost unit, so the commit
+        happens once when the response is produced. A nested block that raises
+        only undoes its own work (via a savepoint when earlier statements must
+        be kept), leaving the surrounding transaction usable.
+        """
+        uow = DBUtils.current_unit(create=True)
+
+        if uow is None:
+            uow = UnitOfWork(DatabaseConnection())
+            DBUtils._local.uow = uow
+            try:
+                yield uow
+                uow.commit()
+            except Exception:
+                uow.rollback()
+                raise
+            finally:
+                DBUtils._local.uow = None
+                uow.close()
+            return
+
+        if uow.statements == 0:
+            # Nothing earlier in the transaction to protect, so no savepoint is needed
+            try:
+                yield uow
+            except Exception:
+                uow.rollback()
+                raise
+            return
+
+        uow.savepoints += 1
+        savepoint = f"uow_sp_{uow.savepoints}"
+        pending_callbacks = len(uow.after_commit)
+        uow.execute(f"SAVEPOINT {savepoint}")
+        try:
+            yield uow
+            uow.execute(f"RELEASE SAVEPOINT {savepoint}")
+        except Exception:
+            uow.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            del uow.after_commit[pending_callbacks:]
+            raise
+
+    @staticmethod
+    def on_commit(callback):
+        """
+        Runs `callback` once the current transaction commits, or right away outside one.
+
+        Meant for side effects outside the database (e.g. deleting files) that
+        must not happen if the transaction is rolled back. Callbacks are
+        dropped on rollback, including when only their savepoint is rolled back.
+        """
+        uow = DBUtils.current_unit()
+        if uow is None:
+            callback()
+        else:
+            uow.after_commit.append(callback)
+
+    # ---------- Flask integration ----------
+    @staticmethod
+    def init_app(app):
+        """
+        Binds one connection and one transaction to each request that touches the database.
+
+        The transaction is committed before the response is sent (rolled back
+        for 5xx responses); a failed commit turns the response into a 500.
+        """
+        app.extensions["db_unit_of_work"] = True
+
+        @app.after_request
+        def _finish_request_unit(response):
+            uow = g.pop("_db_unit_of_work", None)
+            if uow is None:
+                return response
+            try:
+                if response.status_code >= 500:
+                    uow.rollback()
+                else:
+                    uow.commit()
+            except Exception as e:
+                print("Error committing request transaction:", e)
+                response = jsonify({"success": False, "message": "Database error."})
+                response.status_code = 500
+            finally:
+                uow.close()
+            return response
+
+        @app.teardown_request
+        def _discard_request_unit(exc):
+            # Only reached with an open unit when the view raised
+            uow = g.pop("_db_unit_of_work", None)
+            if uow is not None:
+                try:
+                    uow.rollback()
+                finally:
+                    uow.close()
@@ -0,0 +1,101 @@
+from io import BytesIO
+from config import Config
+from Models.worker_pool import BoundedProcessPool
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Uploads are rejected until Pillow is installed
+    Image = None
+
+
+class ImageProcessorBusyError(RuntimeError):
+    """Raised when the processing queue is full or a result does not arrive in time."""
+
+
+class InvalidImageError(ValueError):
+    """Raised when an upload cannot be decoded as an image."""
+
+
+# Content types of the output formats
+CONTENT_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+
+# Decoded pixels accepted per upload; larger images are rejected before full decoding
+MAX_PIXELS = 40_000_000
+
+
+# Runs in the worker processes; module-level so it can be pickled
+def _render(data, sizes, image_format, quality):
+    Image.MAX_IMAGE_PIXELS = MAX_PIXELS
+    try:
+        with Image.open(BytesIO(data)) as source:
+            # JPEG can decode at a reduced scale, far cheaper than a full decode and resize
+            source.draft("RGB", (max(sizes) * 2, max(sizes) * 2))
+            image = ImageOps.exif_transpose(source)
+            image = image.convert("RGBA" if image_format == "png" else "RGB")
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError):
+        raise InvalidImageError("The upload is not a supported image.")
+
+    variants = {}
+    extension = "jpg" if image_format == "jpeg" else image_format
+    for size in sizes:
+        # Square, center-cropped thumbnails match how the photos are displayed
+        thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        out = BytesIO()
+        thumbnail.save(out, image_format.upper(), quality=quality, optimize=True)
+        variants[f"{size}.{extension}"] = out.getvalue()
+    return variants
+
+
+class ImageProcessor:
+    """
+    Decodes, resizes and re-encodes uploaded images in a bounded pool of worker processes.
+
+    Every upload becomes the same fixed set of square thumbnails
+    (PROFILE_IMAGE_SIZES) in one format, so clients never download a
+    full-size original and the stored size per image is bounded. At most
+    IMAGE_WORKERS images are processed at once and at most IMAGE_MAX_PENDING
+    wait behind them; beyond that callers get ImageProcessorBusyError instead
+    of queueing without bound.
+    """
+
+    _workers = BoundedProcessPool(
+        "IMAGE", ImageProcessorBusyError,
+        busy_message="Too many images are being processed.",
+        timeout_message="Image processing timed out.",
+        max_pending=16, timeout=30.0,
+    )
+
+    @staticmethod
+    def sizes():
+        sizes = getattr(Config, "PROFILE_IMAGE_SIZES", (80, 160, 320))
+        if isinstance(sizes, str):
+            sizes = [s for s in sizes.split(",") if s.strip()]
+        return tuple(sorted(int(s) for s in sizes))
+
+    @staticmethod
+    def image_format():
+        image_format = getattr(Config, "PROFILE_IMAGE_FORMAT", "webp").lower()
+        image_format = "jpeg" if image_format == "jpg" else image_format
+        if image_format not in CONTENT_TYPES:
+            raise ValueError(f"Unsupported PROFILE_IMAGE_FORMAT: {image_format}")
+        return image_format
+
+    @classmethod
+    def render(cls, data):
+        """
+        Turns an uploaded image into its thumbnails.
+
+        Args:
+            data (bytes): The uploaded file.
+
+        Returns:
+            dict: {variant name: bytes}, e.g. {"80.webp": ..., "160.webp": ...}
+
+        Raises:
+            InvalidImageError: If `data` is not a decodable image.
+            ImageProcessorBusyError: If the queue is full or processing times out.
+        """
+        if Image is None:
+            raise RuntimeError("Pillow is required to process images.")
+        quality = int(getattr(Config, "PROFILE_IMAGE_QUALITY", 80))
+        return cls._workers.submit(_render, data, cls.sizes(), cls.image_format(), quality)
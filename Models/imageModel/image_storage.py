@@ -0,0 +1,192 @@
+import os
+import re
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from config import Config
+
+# Keys are "/"-separated segments of letters, digits, "-" and "_" (e.g. "students/2023-0001/3f2a...")
+VALID_KEY = re.compile(r"^[A-Za-z0-9_-]+(/[A-Za-z0-9_-]+)*$")
+VALID_NAME = re.compile(r"^[A-Za-z0-9_-]+\.[A-Za-z0-9]+$")
+
+
+class ImageStorage(ABC):
+    """
+    Interface of the image storage backends.
+
+    An image is stored under a key (a content-addressed directory) as a set of
+    named variants, e.g. "80.webp" and "320.webp". Variants under a key never
+    change once written, so they can be cached indefinitely; replacing an
+    image means writing a new key and deleting the old one.
+    """
+
+    _default = None
+
+    @abstractmethod
+    def save(self, key, variants):
+        """
+        Stores `variants` ({name: bytes}) under `key`; a key that already exists is left as is.
+        """
+
+    @abstractmethod
+    def read(self, key, name):
+        """
+        Returns the bytes of one variant, or None if it does not exist.
+        """
+
+    @abstractmethod
+    def variant_names(self, key):
+        """
+        Returns the names of the variants stored under `key` (empty if none).
+        """
+
+    @abstractmethod
+    def exists(self, key):
+        """
+        Returns True if anything is stored under `key`.
+        """
+
+    @abstractmethod
+    def delete(self, key):
+        """
+        Removes every variant under `key`; missing keys are ignored.
+        """
+
+    @abstractmethod
+    def url(self, key):
+        """
+        Returns the URL prefix a client appends "/<variant name>" to.
+        """
+
+    @abstractmethod
+    def key_from_url(self, url):
+        """
+        Returns the key behind a url() value, or None if it is not from this backend.
+        """
+
+    def nearest_variant(self, key, name):
+        """
+        Returns the stored variant that best stands in for `name` ("<size>.<format>"), or None.
+
+        PROFILE_IMAGE_SIZES and PROFILE_IMAGE_FORMAT may have changed since a
+        key was written, so a missing size is served by the smallest larger
+        one (else the largest), preferring the requested format.
+        """
+        names = self.variant_names(key)
+        if name in names:
+            return name
+        wanted, _, extension = name.partition(".")
+        by_size = {}
+        for stored in sorted(names, key=lambda n: not n.endswith("." + extension)):
+            size = stored.partition(".")[0]
+            if size.isdigit():
+                by_size.setdefault(int(size), stored)
+        if not by_size:
+            return None
+        wanted = int(wanted) if wanted.isdigit() else max(by_size)
+        larger = [size for size in by_size if size >= wanted]
+        return by_size[min(larger) if larger else max(by_size)]
+
+    @staticmethod
+    def check_key(key):
+        if not isinstance(key, str) or not VALID_KEY.match(key):
+            raise ValueError(f"Invalid image key: {key!r}")
+        return key
+
+    @staticmethod
+    def check_name(name):
+        if not isinstance(name, str) or not VALID_NAME.match(name):
+            raise ValueError(f"Invalid image variant name: {name!r}")
+        return name
+
+    @staticmethod
+    def default():
+        """
+        Returns the process-wide backend, created from Config on first use.
+        """
+        if ImageStorage._default is None:
+            ImageStorage._default = ImageStorage.from_config()
+        return ImageStorage._default
+
+    @staticmethod
+    def from_config():
+        """
+        Returns the backend selected by Config.IMAGE_STORAGE.
+        """
+        backend = getattr(Config, "IMAGE_STORAGE", "local")
+        if backend == "local":
+            root = getattr(Config, "IMAGE_STORAGE_ROOT", None)
+            if root is None:
+                root = os.path.join(getattr(Config, "BASE_DIR", os.getcwd()), "media")
+            return LocalImageStorage(root, getattr(Config, "IMAGE_STORAGE_URL", "/media"))
+        raise ValueError(f"Unknown IMAGE_STORAGE backend: {backend}")
+
+
+class LocalImageStorage(ImageStorage):
+    """
+    Stores images on the local filesystem, one directory per key, served by
+    the /media route (see Controllers/media_modules).
+
+    A key is written to a temporary directory and renamed into place, so a
+    reader never sees a partially written image.
+    """
+
+    def __init__(self, root, base_url="/media"):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+
+    def _path(self, key, name=None):
+        path = os.path.join(self.root, *ImageStorage.check_key(key).split("/"))
+        if name is not None:
+            path = os.path.join(path, ImageStorage.check_name(name))
+        return path
+
+    def save(self, key, variants):
+        target = self._path(key)
+        if os.path.isdir(target):
+            return
+        parent = os.path.dirname(target)
+        os.makedirs(parent, exist_ok=True)
+
+        staging = tempfile.mkdtemp(prefix=".upload-", dir=parent)
+        try:
+            for name, data in variants.items():
+                with open(os.path.join(staging, ImageStorage.check_name(name)), "wb") as f:
+                    f.write(data)
+            try:
+                os.rename(staging, target)
+            except OSError:
+                # Another upload of the same content got there first
+                if not os.path.isdir(target):
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def read(self, key, name):
+        try:
+            with open(self._path(key, name), "rb") as f:
+                return f.read()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def variant_names(self, key):
+        try:
+            return [name for name in os.listdir(self._path(key)) if VALID_NAME.match(name)]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
+    def exists(self, key):
+        return os.path.isdir(self._path(key))
+
+    def delete(self, key):
+        shutil.rmtree(self._path(key), ignore_errors=True)
+
+    def url(self, key):
+        return f"{self.base_url}/{ImageStorage.check_key(key)}"
+
+    def key_from_url(self, url):
+        prefix = self.base_url + "/"
+        if not isinstance(url, str) or not url.startswith(prefix):
+            return None
+        key = url[len(prefix):]
+        return key if VALID_KEY.match(key) else None
@@ -0,0 +1,35 @@
+-- Core tables.
+--
+-- IF NOT EXISTS lets this first migration adopt databases whose tables were
+-- created by hand before migrations existed; their columns are left as they are.
+-- Codes are renamed in place, so the foreign keys cascade updates while
+-- deletes stay restricted (the delete models report linked rows instead).
+
+CREATE TABLE IF NOT EXISTS colleges (
+    college_code VARCHAR(20) PRIMARY KEY,
+    college_name VARCHAR(255) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS programs (
+    program_code VARCHAR(20) PRIMARY KEY,
+    program_name VARCHAR(255) NOT NULL,
+    college_code VARCHAR(20) NOT NULL
+        REFERENCES colleges (college_code) ON UPDATE CASCADE ON DELETE RESTRICT
+);
+
+CREATE TABLE IF NOT EXISTS students (
+    id_number VARCHAR(20) PRIMARY KEY,
+    first_name VARCHAR(100) NOT NULL,
+    middle_name VARCHAR(100),
+    last_name VARCHAR(100) NOT NULL,
+    gender VARCHAR(20) NOT NULL,
+    year_level INTEGER NOT NULL,
+    program_code VARCHAR(20) NOT NULL
+        REFERENCES programs (program_code) ON UPDATE CASCADE ON DELETE RESTRICT,
+    profile_image_path TEXT
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    username VARCHAR(100) PRIMARY KEY,
+    password_hash TEXT NOT NULL
+);
@@ -0,0 +1,44 @@
+-- Per-table change versions used by the in-process caches.
+--
+-- Statement-level triggers bump a table's version on every write and publish
+-- it on the "table_versions" channel, so every worker process learns about the
+-- change when the writing transaction commits (see TableVersions).
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO table_versions (table_name, version)
+VALUES ('colleges', 0), ('programs', 0), ('students', 0)
+ON CONFLICT (table_name) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+DECLARE
+    new_version BIGINT;
+BEGIN
+    UPDATE table_versions
+    SET version = version + 1
+    WHERE table_name = TG_TABLE_NAME
+    RETURNING version INTO new_version;
+
+    -- Delivered to listeners only when the transaction commits
+    PERFORM pg_notify('table_versions', TG_TABLE_NAME || ':' || new_version);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_colleges_version ON colleges;
+CREATE TRIGGER trg_colleges_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON colleges
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_programs_version ON programs;
+CREATE TRIGGER trg_programs_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON programs
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_students_version ON students;
+CREATE TRIGGER trg_students_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON students
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
@@ -0,0 +1,97 @@
+-- Search documents for StudentSearchModel.
+--
+-- One row per student holding the lower-cased text that search matches against
+-- (ID, names, year level, program name, college name). Triggers keep it in sync
+-- with students, programs and colleges; a trigram GIN index makes the
+-- ILIKE '%token%' predicates index scans instead of a three-way join scan.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE TABLE IF NOT EXISTS student_search_documents (
+    id_number TEXT PRIMARY KEY
+        REFERENCES students (id_number) ON DELETE CASCADE ON UPDATE CASCADE,
+    document TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_student_search_documents_trgm
+    ON student_search_documents USING gin (document gin_trgm_ops);
+
+-- Fields are joined with ' | ' so an exact phrase cannot match across two fields.
+CREATE OR REPLACE FUNCTION student_search_document_text(
+    id_number TEXT,
+    first_name TEXT,
+    middle_name TEXT,
+    last_name TEXT,
+    year_level INTEGER,
+    program_name TEXT,
+    college_name TEXT
+) RETURNS TEXT AS $$
+    SELECT lower(concat_ws(' | ', id_number, first_name, middle_name, last_name,
+                           year_level::text, program_name, college_name));
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION student_search_documents_refresh() RETURNS trigger AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'students' THEN
+        INSERT INTO student_search_documents (id_number, document)
+        SELECT s.id_number,
+               student_search_document_text(s.id_number::text, s.first_name, s.middle_name, s.last_name,
+                                            s.year_level, p.program_name, c.college_name)
+        FROM students s
+        JOIN programs p ON s.program_code = p.program_code
+        JOIN colleges c ON p.college_code = c.college_code
+        WHERE s.id_number = NEW.id_number
+        ON CONFLICT (id_number) DO UPDATE SET document = EXCLUDED.document;
+
+    ELSIF TG_TABLE_NAME = 'programs' THEN
+        UPDATE student_search_documents d
+        SET document = student_search_document_text(s.id_number::text, s.first_name, s.middle_name, s.last_name,
+                                                    s.year_level, p.program_name, c.college_name)
+        FROM students s
+        JOIN programs p ON s.program_code = p.program_code
+        JOIN colleges c ON p.college_code = c.college_code
+        WHERE d.id_number = s.id_number AND p.program_code = NEW.program_code;
+
+    ELSIF TG_TABLE_NAME = 'colleges' THEN
+        UPDATE student_search_documents d
+        SET document = student_search_document_text(s.id_number::text, s.first_name, s.middle_name, s.last_name,
+                                                    s.year_level, p.program_name, c.college_name)
+        FROM students s
+        JOIN programs p ON s.program_code = p.program_code
+        JOIN colleges c ON p.college_code = c.college_code
+        WHERE d.id_number = s.id_number AND c.college_code = NEW.college_code;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_students_search_document ON students;
+CREATE TRIGGER trg_students_search_document
+    AFTER INSERT OR UPDATE ON students
+    FOR EACH ROW EXECUTE FUNCTION student_search_documents_refresh();
+
+DROP TRIGGER IF EXISTS trg_programs_search_document ON programs;
+CREATE TRIGGER trg_programs_search_document
+    AFTER UPDATE OF program_name, college_code ON programs
+    FOR EACH ROW
+    WHEN (OLD.program_name IS DISTINCT FROM NEW.program_name
+          OR OLD.college_code IS DISTINCT FROM NEW.college_code)
+    EXECUTE FUNCTION student_search_documents_refresh();
+
+DROP TRIGGER IF EXISTS trg_colleges_search_document ON colleges;
+CREATE TRIGGER trg_colleges_search_document
+    AFTER UPDATE OF college_name ON colleges
+    FOR EACH ROW
+    WHEN (OLD.college_name IS DISTINCT FROM NEW.college_name)
+    EXECUTE FUNCTION student_search_documents_refresh();
+
+-- Backfill existing students (also used by StudentSearchIndex.rebuild)
+INSERT INTO student_search_documents (id_number, document)
+SELECT s.id_number,
+       student_search_document_text(s.id_number::text, s.first_name, s.middle_name, s.last_name,
+                                    s.year_level, p.program_name, c.college_name)
+FROM students s
+JOIN programs p ON s.program_code = p.program_code
+JOIN colleges c ON p.college_code = c.college_code
+ON CONFLICT (id_number) DO UPDATE SET document = EXCLUDED.document;
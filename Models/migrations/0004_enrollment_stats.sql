@@ -0,0 +1,90 @@
+-- Enrollment counts per (program, year level, gender), kept current by triggers.
+--
+-- Statement-level triggers with transition tables fold each write into the
+-- summary in the writing transaction, one upsert per affected group, so
+-- single-row edits, bulk updates/deletes, imports and program code cascades
+-- are all covered. College, year level and gender totals are derived from
+-- these rows (see StatsModel), so reads touch O(programs) rows.
+
+CREATE TABLE IF NOT EXISTS enrollment_stats (
+    program_code TEXT NOT NULL,
+    year_level INTEGER NOT NULL,
+    gender TEXT NOT NULL,
+    student_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (program_code, year_level, gender)
+);
+
+CREATE OR REPLACE FUNCTION enrollment_stats_apply() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO enrollment_stats AS e (program_code, year_level, gender, student_count)
+        SELECT program_code, year_level, gender, COUNT(*)
+        FROM new_rows
+        GROUP BY program_code, year_level, gender
+        ON CONFLICT (program_code, year_level, gender)
+        DO UPDATE SET student_count = e.student_count + EXCLUDED.student_count;
+
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO enrollment_stats AS e (program_code, year_level, gender, student_count)
+        SELECT program_code, year_level, gender, -COUNT(*)
+        FROM old_rows
+        GROUP BY program_code, year_level, gender
+        ON CONFLICT (program_code, year_level, gender)
+        DO UPDATE SET student_count = e.student_count + EXCLUDED.student_count;
+
+    ELSE
+        -- Only groups whose membership actually changed are touched
+        INSERT INTO enrollment_stats AS e (program_code, year_level, gender, student_count)
+        SELECT program_code, year_level, gender, SUM(delta)
+        FROM (
+            SELECT program_code, year_level, gender, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT program_code, year_level, gender, -1 AS delta FROM old_rows
+        ) changes
+        GROUP BY program_code, year_level, gender
+        HAVING SUM(delta) <> 0
+        ON CONFLICT (program_code, year_level, gender)
+        DO UPDATE SET student_count = e.student_count + EXCLUDED.student_count;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION enrollment_stats_truncate() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM enrollment_stats;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables require one trigger per event
+DROP TRIGGER IF EXISTS trg_students_stats_insert ON students;
+CREATE TRIGGER trg_students_stats_insert
+    AFTER INSERT ON students
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION enrollment_stats_apply();
+
+DROP TRIGGER IF EXISTS trg_students_stats_update ON students;
+CREATE TRIGGER trg_students_stats_update
+    AFTER UPDATE ON students
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION enrollment_stats_apply();
+
+DROP TRIGGER IF EXISTS trg_students_stats_delete ON students;
+CREATE TRIGGER trg_students_stats_delete
+    AFTER DELETE ON students
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION enrollment_stats_apply();
+
+DROP TRIGGER IF EXISTS trg_students_stats_truncate ON students;
+CREATE TRIGGER trg_students_stats_truncate
+    AFTER TRUNCATE ON students
+    FOR EACH STATEMENT EXECUTE FUNCTION enrollment_stats_truncate();
+
+-- Backfill (also used by StatsModel.rebuild); locks out writers so no delta is lost
+LOCK TABLE students IN SHARE MODE;
+DELETE FROM enrollment_stats;
+INSERT INTO enrollment_stats (program_code, year_level, gender, student_count)
+SELECT program_code, year_level, gender, COUNT(*)
+FROM students
+GROUP BY program_code, year_level, gender;
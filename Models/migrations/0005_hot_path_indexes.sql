@@ -0,0 +1,36 @@
+-- migrate: no-transaction
+--
+-- Indexes for the hot query paths, built CONCURRENTLY so writes continue
+-- during the build (which is why this file runs outside a transaction).
+-- If a build fails, the runner drops the invalid index it leaves behind so
+-- applying again rebuilds it.
+
+-- Linked-row checks in ProgramDeleteModel / CollegeDeleteModel, the foreign
+-- key checks on delete, and ?program_code= / ?college_code= filters (the
+-- students index also serves their id_number ordering and keyset pages)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_students_program_code
+    ON students (program_code, id_number);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_programs_college_code
+    ON programs (college_code);
+
+-- Sort columns of StudentModel.column_map, with id_number as the keyset
+-- tie-breaker; backward scans serve DESC. program_name and college_name
+-- sorts go through the joins and are served by the indexes further down.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_students_first_name
+    ON students (first_name, id_number);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_students_last_name
+    ON students (last_name, id_number);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_students_middle_name
+    ON students (middle_name, id_number);
+-- Keyset pages compare the nullable middle_name through COALESCE (see StudentModel.sort_expression)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_students_middle_name_keyset
+    ON students ((COALESCE(middle_name, '')), id_number);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_students_gender
+    ON students (gender, id_number);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_students_year_level
+    ON students (year_level, id_number);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_programs_program_name
+    ON programs (program_name);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_colleges_college_name
+    ON colleges (college_name);
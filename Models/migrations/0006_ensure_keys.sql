@@ -0,0 +1,98 @@
+-- Keys the write models rely on, for databases adopted by 0001.
+--
+-- 0001 leaves the constraints of hand-made tables as they were, but ON
+-- CONFLICT needs the code and ID columns to be unique, and the delete models
+-- leave it to the foreign keys to refuse deleting a college or program that
+-- still has programs or students (ON DELETE RESTRICT, renames cascading).
+-- Missing keys are added and foreign keys with other actions are replaced.
+-- Existing rows are checked first: duplicates or orphans stop the migration
+-- with a count instead of being changed. Tables created by 0001 already have
+-- every key, so nothing changes there.
+
+DO $$
+DECLARE
+    spec TEXT[];
+    con RECORD;
+    col_num SMALLINT;
+    ref_num SMALLINT;
+    bad BIGINT;
+    has_key BOOLEAN;
+BEGIN
+    -- Unique keys (ON CONFLICT targets, and the columns the foreign keys reference)
+    FOREACH spec SLICE 1 IN ARRAY ARRAY[
+        ['colleges', 'college_code'],
+        ['programs', 'program_code'],
+        ['students', 'id_number']
+    ] LOOP
+        SELECT attnum INTO col_num
+        FROM pg_attribute WHERE attrelid = spec[1]::regclass AND attname = spec[2];
+
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_index
+            WHERE indrelid = spec[1]::regclass
+              AND indisunique AND indimmediate AND indpred IS NULL
+              AND indkey::SMALLINT[] = ARRAY[col_num]
+        ) THEN
+            EXECUTE format(
+                'SELECT count(*) FROM (SELECT 1 FROM %I GROUP BY %I HAVING count(*) > 1) duplicated',
+                spec[1], spec[2]
+            ) INTO bad;
+            IF bad > 0 THEN
+                RAISE EXCEPTION '%.% has % duplicated values; resolve them and migrate again', spec[1], spec[2], bad;
+            END IF;
+
+            IF EXISTS (SELECT 1 FROM pg_constraint WHERE conrelid = spec[1]::regclass AND contype = 'p') THEN
+                EXECUTE format('ALTER TABLE %I ADD UNIQUE (%I)', spec[1], spec[2]);
+            ELSE
+                EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (%I)', spec[1], spec[2]);
+            END IF;
+        END IF;
+    END LOOP;
+
+    -- Foreign keys: ON UPDATE CASCADE ON DELETE RESTRICT, validated against existing rows
+    FOREACH spec SLICE 1 IN ARRAY ARRAY[
+        ['programs', 'college_code', 'colleges', 'college_code'],
+        ['students', 'program_code', 'programs', 'program_code']
+    ] LOOP
+        SELECT attnum INTO col_num
+        FROM pg_attribute WHERE attrelid = spec[1]::regclass AND attname = spec[2];
+        SELECT attnum INTO ref_num
+        FROM pg_attribute WHERE attrelid = spec[3]::regclass AND attname = spec[4];
+
+        has_key := false;
+        FOR con IN
+            SELECT conname, confkey, confupdtype, confdeltype, convalidated
+            FROM pg_constraint
+            WHERE contype = 'f' AND conrelid = spec[1]::regclass
+              AND confrelid = spec[3]::regclass AND conkey = ARRAY[col_num]
+        LOOP
+            IF NOT has_key AND con.confkey = ARRAY[ref_num]
+                    AND con.confupdtype = 'c' AND con.confdeltype = 'r' THEN
+                has_key := true;
+                IF NOT con.convalidated THEN
+                    EXECUTE format('ALTER TABLE %I VALIDATE CONSTRAINT %I', spec[1], con.conname);
+                END IF;
+            ELSE
+                EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', spec[1], con.conname);
+            END IF;
+        END LOOP;
+
+        IF NOT has_key THEN
+            EXECUTE format(
+                'SELECT count(*) FROM %1$I t WHERE t.%2$I IS NOT NULL'
+                ' AND NOT EXISTS (SELECT 1 FROM %3$I r WHERE r.%4$I = t.%2$I)',
+                spec[1], spec[2], spec[3], spec[4]
+            ) INTO bad;
+            IF bad > 0 THEN
+                RAISE EXCEPTION '% % rows have a % not found in %; fix them and migrate again',
+                    bad, spec[1], spec[2], spec[3];
+            END IF;
+
+            EXECUTE format(
+                'ALTER TABLE %I ADD FOREIGN KEY (%I) REFERENCES %I (%I) ON UPDATE CASCADE ON DELETE RESTRICT',
+                spec[1], spec[2], spec[3], spec[4]
+            );
+        END IF;
+    END LOOP;
+END;
+$$;
@@ -1,5 +1,7 @@
 # Models/programs/ProgramAddModel.py
 from Models.db.db_utils import DBUtils
+from Models.db.db_errors import ConstraintErrors
+from Models.db.db_reference_cache import ReferenceCache
 
 class ProgramAddModel:
     @staticmethod
@@ -22,26 +24,26 @@ class ProgramAddModel:
             return {"success": False, "message": "Program code, name, and college code are required."}
 
         try:
-            # Check if the referenced college exists
-            college_check_query = "SELECT 1 FROM colleges WHERE college_code = %s"
-            college_exists = DBUtils.execute_query(college_check_query, (college_code,), fetch=True)
-            if not college_exists:
-                return {"success": False, "message": f"College with code '{college_code}' not found."}
-
-            # Check if the program code already exists
-            duplicate_query = "SELECT 1 FROM programs WHERE program_code = %s"
-            duplicate_exists = DBUtils.execute_query(duplicate_query, (program_code,), fetch=True)
-            if duplicate_exists:
-                return {"success": False, "message": f"Program with code '{program_code}' already exists."}
-
-            # Insert new program
-            insert_query = """
-                INSERT INTO programs (program_code, program_name, college_code)
-                VALUES (%s, %s, %s)
-            """
-            DBUtils.execute_query(insert_query, (program_code, program_name, college_code), fetch=False)
-            return {"success": True, "message": "Program added successfully."}
-
+            with DBUtils.transaction():
+                # The primary key skips duplicates (no row back); the foreign key rejects unknown colleges
+                insert_query = """
+                    INSERT INTO programs (program_code, program_name, college_code)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (program_code) DO NOTHING
+                    RETURNING program_code
+                """
+                inserted = DBUtils.execute_query(insert_query, (program_code, program_name, college_code), fetch=True)
         except Exception as e:
+            message = ConstraintErrors.message(e, {
+                ConstraintErrors.FOREIGN_KEY_VIOLATION: f"College with code '{college_code}' not found.",
+            })
+            if message:
+                return {"success": False, "message": message}
             print("Error in add_program:", e)
             return {"success": False, "message": "Database error while adding program."}
+
+        if not inserted:
+            return {"success": False, "message": f"Program with code '{program_code}' already exists."}
+
+        DBUtils.on_commit(lambda: ReferenceCache.invalidate("programs"))
+        return {"success": True, "message": "Program added successfully."}
@@ -0,0 +1,33 @@
+from Models.db.db_async import AsyncDBUtils
+from Models.programTableModel.program_table_model import ProgramModel
+from Models.programTableModel.program_search_model import ProgramSearchModel
+
+class ProgramAsyncModel:
+    """
+    Async read paths for programs, used by the ASGI serving mode.
+
+    SQL comes from the statement builders of ProgramModel and ProgramSearchModel.
+    """
+
+    @staticmethod
+    async def get_programs(order_by="program_code", direction="ASC", filters={}, columnar=False):
+        query, params = ProgramModel.list_statement(order_by, direction, filters)
+        rows = await AsyncDBUtils.execute_query(query, params, fetch=True)
+        return rows if columnar else ProgramModel.to_dicts(rows)
+
+    @staticmethod
+    async def get_count(filters={}):
+        query, params = ProgramModel.count_statement(filters)
+        rows = await AsyncDBUtils.execute_query(query, params, fetch=True)
+        return rows[0][0]
+
+    @staticmethod
+    async def search_programs(query="", limit=20, offset=0, order_by="program_code", direction="ASC", estimate_count=False,
+                             columnar=False):
+        """
+        Returns:
+            tuple: (total_count, rows)
+        """
+        data_query, params = ProgramSearchModel.search_statement(query, limit, offset, order_by, direction, estimate_count)
+        rows = await AsyncDBUtils.execute_query(data_query, params, fetch=True)
+        return ProgramSearchModel.to_result(rows, columnar)
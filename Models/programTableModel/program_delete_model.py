@@ -1,4 +1,6 @@
 from Models.db.db_utils import DBUtils
+from Models.db.db_errors import ConstraintErrors
+from Models.db.db_reference_cache import ReferenceCache
 
 class ProgramDeleteModel:
 
@@ -20,27 +22,22 @@ class ProgramDeleteModel:
             return {"success": False, "message": "Program code is required."}
 
         try:
-            # Check if the program exists
-            check_query = "SELECT 1 FROM programs WHERE program_code = %s"
-            existing = DBUtils.execute_query(check_query, (program_code,), fetch=True)
-            if not existing:
-                return {"success": False, "message": "Program not found."}
-
-            # Check if any students are linked to this program
-            student_check_query = "SELECT 1 FROM students WHERE program_code = %s LIMIT 1"
-            linked_student = DBUtils.execute_query(student_check_query, (program_code,), fetch=True)
-            if linked_student:
-                return {
-                    "success": False,
-                    "message": "Cannot delete program: There are students enrolled in it."
-                }
-
-            # Safe to delete
-            delete_query = "DELETE FROM programs WHERE program_code = %s"
-            DBUtils.execute_query(delete_query, (program_code,), fetch=False)
-
-            return {"success": True, "message": "Program deleted successfully."}
-
+            with DBUtils.transaction():
+                # students.program_code's foreign key (ON DELETE RESTRICT, see migration 0006;
+                # served by idx_students_program_code) rejects the delete while students are enrolled
+                delete_query = "DELETE FROM programs WHERE program_code = %s RETURNING program_code"
+                deleted = DBUtils.execute_query(delete_query, (program_code,), fetch=True)
         except Exception as e:
+            message = ConstraintErrors.message(e, {
+                ConstraintErrors.FOREIGN_KEY_VIOLATION: "Cannot delete program: There are students enrolled in it.",
+            })
+            if message:
+                return {"success": False, "message": message}
             print("Error in delete_program:", e)
             return {"success": False, "message": "Database error while deleting program."}
+
+        if not deleted:
+            return {"success": False, "message": "Program not found."}
+
+        DBUtils.on_commit(lambda: ReferenceCache.invalidate("programs"))
+        return {"success": True, "message": "Program deleted successfully."}
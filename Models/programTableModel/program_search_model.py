@@ -1,80 +1,109 @@
 from Models.db.db_utils import DBUtils
+from Models.db.db_search import SearchStatement
 
 class ProgramSearchModel:
+    base_query = """
+        FROM programs p
+        JOIN colleges c ON p.college_code = c.college_code
+    """
+    columns = ["program_code", "program_name", "college_name"]
+    columns_sql = """
+        p.program_code,
+        p.program_name,
+        c.college_name
+    """
+    order_columns = {
+        "program_code": "p.program_code",
+        "program_name": "p.program_name",
+        "college_name": "c.college_name"
+    }
 
     @staticmethod
-    def search_programs(query="", limit=20, offset=0, order_by="program_code", direction="ASC"):
-        base_query = """
-            FROM programs p
-            JOIN colleges c ON p.college_code = c.college_code
-        """
-
-        def build_where_clause(tokens, exact=False):
-            where_clauses = []
-            params = []
-            if not tokens.strip():
-                return where_clauses, params
+    def build_where_clause(tokens, exact=False):
+        where_clauses = []
+        params = []
+        if not tokens.strip():
+            return where_clauses, params
 
-            if exact:
+        if exact:
+            where_clauses.append("""
+                (p.program_code ILIKE %s 
+                 OR p.program_name ILIKE %s 
+                 OR c.college_name ILIKE %s)
+            """)
+            params.extend([f"%{tokens}%", f"%{tokens}%", f"%{tokens}%"])
+        else:
+            for token in tokens.split():
+                token_like = f"%{token}%"
                 where_clauses.append("""
                     (p.program_code ILIKE %s 
                      OR p.program_name ILIKE %s 
                      OR c.college_name ILIKE %s)
                 """)
-                params.extend([f"%{tokens}%", f"%{tokens}%", f"%{tokens}%"])
-            else:
-                for token in tokens.split():
-                    token_like = f"%{token}%"
-                    where_clauses.append("""
-                        (p.program_code ILIKE %s 
-                         OR p.program_name ILIKE %s 
-                         OR c.college_name ILIKE %s)
-                    """)
-                    params.extend([token_like, token_like, token_like])
-            return where_clauses, params
+                params.extend([token_like, token_like, token_like])
+        return where_clauses, params
 
-        # Step 1: Try exact match first
-        where_clauses, params = build_where_clause(query, exact=True)
-        where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
+    @staticmethod
+    def search_statement(query="", limit=20, offset=0, order_by="program_code", direction="ASC", estimate_count=False):
+        """
+        Returns (sql, params) for search_programs; shared with the async model.
+        """
+        direction = "DESC" if direction == "DESC" else "ASC"
+        base_query = ProgramSearchModel.base_query
 
-        count_query = f"SELECT COUNT(*) {base_query} {where_sql}"
-        total_count_result = DBUtils.execute_query(count_query, tuple(params), fetch=True)
-        total_count = total_count_result[0][0] if total_count_result else 0
+        # Step 1 and 2: exact match with tokenized fallback, resolved in one statement
+        exact_where, exact_params = ProgramSearchModel.build_where_clause(query, exact=True)
+        token_where, token_params = ProgramSearchModel.build_where_clause(query, exact=False)
 
-        # Step 2: If no exact matches, try tokenized search
-        if total_count == 0 and query.strip():
-            where_clauses, params = build_where_clause(query, exact=False)
-            where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
-            count_query = f"SELECT COUNT(*) {base_query} {where_sql}"
-            total_count_result = DBUtils.execute_query(count_query, tuple(params), fetch=True)
-            total_count = total_count_result[0][0] if total_count_result else 0
+        # Step 3: Fetch paginated results together with the total count
+        order_column = ProgramSearchModel.order_columns.get(order_by, "p.program_code")
+        columns_sql = ProgramSearchModel.columns_sql
+        order_sql = f"ORDER BY {order_column} {direction}"
 
-        # Step 3: Fetch paginated results
-        order_column = {
-            "program_code": "p.program_code",
-            "program_name": "p.program_name",
-            "college_name": "c.college_name"
-        }.get(order_by, "p.program_code")
+        if estimate_count and not query.strip():
+            return SearchStatement.build_estimated(
+                columns_sql, base_query, "programs", order_sql, limit=limit, offset=offset
+            )
+        return SearchStatement.build(
+            columns_sql, base_query, "p.program_code",
+            exact_where, exact_params, token_where, token_params,
+            order_sql, limit=limit, offset=offset
+        )
 
-        data_query = f"""
-            SELECT 
-                p.program_code,
-                p.program_name,
-                c.college_name
-            {base_query}
-            {where_sql}
-            ORDER BY {order_column} {direction}
-            LIMIT %s OFFSET %s
+    @staticmethod
+    def to_result(rows, columnar=False):
         """
+        Splits the rows of search_statement into (total_count, rows); rows are
+        dicts, or tuples in ProgramSearchModel.columns order with columnar=True.
+        """
+        total_count, rows = SearchStatement.split(rows)
+        if columnar:
+            return total_count, rows
+        return total_count, [dict(zip(ProgramSearchModel.columns, r)) for r in rows]
+
+    @staticmethod
+    def search_programs(query="", limit=20, offset=0, order_by="program_code", direction="ASC", estimate_count=False,
+                       columnar=False):
+        data_query, params = ProgramSearchModel.search_statement(query, limit, offset, order_by, direction, estimate_count)
+        rows = DBUtils.read_query(data_query, tuple(params), prepared=True)
+        return ProgramSearchModel.to_result(rows, columnar)
 
-        rows = DBUtils.execute_query(data_query, tuple(params + [limit, offset]), fetch=True)
-        result_rows = [
-            {
-                "program_code": r[0],
-                "program_name": r[1],
-                "college_name": r[2]
-            }
-            for r in rows
-        ]
+    @staticmethod
+    def export_query(query="", order_by="program_code", direction="ASC"):
+        """
+        Builds the statement returning every program matching `query`, for streaming exports.
+
+        Returns:
+            tuple: (sql, params, column_names)
+        """
+        direction = "DESC" if direction == "DESC" else "ASC"
+        exact_where, exact_params = ProgramSearchModel.build_where_clause(query, exact=True)
+        token_where, token_params = ProgramSearchModel.build_where_clause(query, exact=False)
+        order_column = ProgramSearchModel.order_columns.get(order_by, "p.program_code")
 
-        return total_count, result_rows
+        sql, params = SearchStatement.build_all(
+            ProgramSearchModel.columns_sql, ProgramSearchModel.base_query, "p.program_code",
+            exact_where, exact_params, token_where, token_params,
+            f"ORDER BY {order_column} {direction}"
+        )
+        return sql, params, ProgramSearchModel.columns
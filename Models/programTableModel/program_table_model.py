@@ -1,4 +1,6 @@
 from Models.db.db_utils import DBUtils
+from Models.db.db_query_cache import QueryShapeCache
+from Models.db.db_reference_cache import ReferenceCache
 
 class ProgramModel:
     column_map = {
@@ -8,56 +10,88 @@ class ProgramModel:
         "college_name": "c.college_name"
     }
 
+    # Names of the columns returned by the list statement, in order
+    columns = list(column_map.keys())
+
+    base_query = """
+        FROM programs p
+        JOIN colleges c ON p.college_code = c.college_code
+    """
+
     @staticmethod
-    def get_programs(order_by="program_code", direction="ASC", filters={}):
-        base_query = """
-            SELECT
-                p.program_code,
-                p.program_name,
-                p.college_code,
-                c.college_name
-            FROM programs p
-            JOIN colleges c ON p.college_code = c.college_code
+    def filter_shape(filters):
+        """
+        Returns (filter_keys, values) for the recognised filters in a stable order.
         """
-        where_clauses = []
-        values = []
+        filter_keys = tuple(sorted(key for key in filters if key in ProgramModel.column_map))
+        return filter_keys, [filters[key] for key in filter_keys]
 
-        # Apply filters
-        for key, value in filters.items():
-            if key in ProgramModel.column_map:
-                where_clauses.append(f"{ProgramModel.column_map[key]} = %s")
-                values.append(value)
+    @staticmethod
+    def where_sql(filter_keys):
+        where_clauses = [f"{ProgramModel.column_map[key]} = %s" for key in filter_keys]
+        return " WHERE " + " AND ".join(where_clauses) if where_clauses else ""
 
-        if where_clauses:
-            base_query += " WHERE " + " AND ".join(where_clauses)
+    @staticmethod
+    def list_statement(order_by="program_code", direction="ASC", filters={}):
+        """
+        Returns (sql, params) for get_programs; shared with the async model.
+        """
+        direction = "DESC" if direction == "DESC" else "ASC"
+        if order_by not in ProgramModel.column_map:
+            order_by = "program_code"
+        filter_keys, values = ProgramModel.filter_shape(filters)
 
-        order_column = ProgramModel.column_map.get(order_by, "p.program_code")
-        base_query += f" ORDER BY {order_column} {direction}"
+        def build():
+            query = f"""
+                SELECT
+                    p.program_code,
+                    p.program_name,
+                    p.college_code,
+                    c.college_name
+                {ProgramModel.base_query}
+            """
+            # Apply filters
+            query += ProgramModel.where_sql(filter_keys)
+            query += f" ORDER BY {ProgramModel.column_map[order_by]} {direction}"
+            return query
 
-        rows = DBUtils.execute_query(base_query, tuple(values), fetch=True)
-        columns = list(ProgramModel.column_map.keys())
+        shape = ("programs.list", filter_keys, order_by, direction)
+        return QueryShapeCache.get(shape, build), tuple(values)
+
+    @staticmethod
+    def count_statement(filters={}):
+        filter_keys, values = ProgramModel.filter_shape(filters)
 
-        # FIXED: closed the bracket correctly
+        def build():
+            return f"SELECT COUNT(*) {ProgramModel.base_query}" + ProgramModel.where_sql(filter_keys)
+
+        return QueryShapeCache.get(("programs.count", filter_keys), build), tuple(values)
+
+    @staticmethod
+    def to_dicts(rows):
+        columns = ProgramModel.columns
         return [dict(zip(columns, row)) for row in rows]
 
     @staticmethod
-    def get_count(filters={}):
-        base_query = """
-            SELECT COUNT(*)
-            FROM programs p
-            JOIN colleges c ON p.college_code = c.college_code
+    def get_programs(order_by="program_code", direction="ASC", filters={}, columnar=False):
         """
+        With columnar=True rows are returned as tuples in ProgramModel.columns order
+        instead of dicts.
+        """
+        query, params = ProgramModel.list_statement(order_by, direction, filters)
 
-        where_clauses = []
-        values = []
-
-        for key, value in filters.items():
-            if key in ProgramModel.column_map:
-                where_clauses.append(f"{ProgramModel.column_map[key]} = %s")
-                values.append(value)
+        def load():
+            # Read from the primary: a stale replica result would stay cached until the next change
+            rows = DBUtils.execute_query(query, params, fetch=True, prepared=True)
+            return [tuple(row) for row in rows] if columnar else ProgramModel.to_dicts(rows)
 
-        if where_clauses:
-            base_query += " WHERE " + " AND ".join(where_clauses)
+        # Served from memory until programs or colleges change (college_name is joined in)
+        return ReferenceCache.get(("programs", "colleges"), (query, params, columnar), load)
 
-        result = DBUtils.execute_query(base_query, tuple(values), fetch=True)
-        return result[0][0]
+    @staticmethod
+    def get_count(filters={}):
+        query, params = ProgramModel.count_statement(filters)
+        return ReferenceCache.get(
+            ("programs", "colleges"), (query, params),
+            lambda: DBUtils.execute_query(query, params, fetch=True, prepared=True)[0][0]
+        )
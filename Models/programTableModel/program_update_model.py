@@ -1,5 +1,7 @@
 # Models/programTableModel/program_update_model.py
 from Models.db.db_utils import DBUtils
+from Models.db.db_errors import ConstraintErrors
+from Models.db.db_reference_cache import ReferenceCache
 
 class ProgramUpdateModel:
 
@@ -23,29 +25,29 @@ class ProgramUpdateModel:
             return {"success": False, "message": "program_code, new_program_name, and new_college_code are required."}
 
         try:
-            # Check if the program exists
-            check_program_query = "SELECT 1 FROM programs WHERE program_code = %s"
-            program_exists = DBUtils.execute_query(check_program_query, (program_code,), fetch=True)
-            if not program_exists:
-                return {"success": False, "message": "Program not found."}
-
-            # Check if the target college exists
-            check_college_query = "SELECT 1 FROM colleges WHERE college_code = %s"
-            college_exists = DBUtils.execute_query(check_college_query, (new_college_code,), fetch=True)
-            if not college_exists:
-                return {"success": False, "message": "College code does not exist."}
-
-            # Perform update
-            update_query = """
-                UPDATE programs
-                SET program_name = %s,
-                    college_code = %s
-                WHERE program_code = %s
-            """
-            DBUtils.execute_query(update_query, (new_program_name, new_college_code, program_code), fetch=False)
-
-            return {"success": True, "message": "Program updated successfully."}
-
+            with DBUtils.transaction():
+                # No row back means the program does not exist; the foreign key rejects unknown colleges
+                update_query = """
+                    UPDATE programs
+                    SET program_name = %s,
+                        college_code = %s
+                    WHERE program_code = %s
+                    RETURNING program_code
+                """
+                updated = DBUtils.execute_query(
+                    update_query, (new_program_name, new_college_code, program_code), fetch=True
+                )
         except Exception as e:
+            message = ConstraintErrors.message(e, {
+                ConstraintErrors.FOREIGN_KEY_VIOLATION: "College code does not exist.",
+            })
+            if message:
+                return {"success": False, "message": message}
             print("Error in update_program:", e)
             return {"success": False, "message": "Database error while updating program."}
+
+        if not updated:
+            return {"success": False, "message": "Program not found."}
+
+        DBUtils.on_commit(lambda: ReferenceCache.invalidate("programs"))
+        return {"success": True, "message": "Program updated successfully."}
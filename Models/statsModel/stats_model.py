@@ -0,0 +1,71 @@
+from Models.db.db_utils import DBUtils
+from Models.db.db_reference_cache import ReferenceCache
+
+class StatsModel:
+    """
+    Enrollment statistics read from the trigger-maintained enrollment_stats table
+    (see Models/migrations/0004_enrollment_stats.sql), so no query scans the students table.
+    """
+
+    # Programs without students are listed with a zero count
+    SUMMARY_QUERY = """
+        SELECT c.college_code, c.college_name, p.program_code, p.program_name,
+               e.year_level, e.gender, COALESCE(e.student_count, 0)
+        FROM programs p
+        JOIN colleges c ON p.college_code = c.college_code
+        LEFT JOIN enrollment_stats e ON e.program_code = p.program_code AND e.student_count > 0
+        ORDER BY c.college_code, p.program_code
+    """
+
+    @staticmethod
+    def get_stats():
+        """
+        Returns enrollment totals overall and per college, program, year level and gender.
+
+        Returns:
+            dict: {
+                "total": int,
+                "byCollege": [{"college_code", "college_name", "count"}, ...],
+                "byProgram": [{"program_code", "program_name", "college_code", "count"}, ...],
+                "byYearLevel": [{"year_level", "count"}, ...],
+                "byGender": [{"gender", "count"}, ...]
+            }
+        """
+        def load():
+            rows = DBUtils.execute_query(StatsModel.SUMMARY_QUERY, fetch=True, prepared=True)
+            return StatsModel.summarize(rows)
+
+        # Served from memory until a student, program or college changes
+        return ReferenceCache.get(("students", "programs", "colleges"), ("stats.summary",), load)
+
+    @staticmethod
+    def summarize(rows):
+        colleges = {}
+        programs = {}
+        year_levels = {}
+        genders = {}
+        total = 0
+
+        for college_code, college_name, program_code, program_name, year_level, gender, count in rows:
+            college = colleges.setdefault(
+                college_code, {"college_code": college_code, "college_name": college_name, "count": 0}
+            )
+            program = programs.setdefault(program_code, {
+                "program_code": program_code, "program_name": program_name,
+                "college_code": college_code, "count": 0
+            })
+            if not count:
+                continue
+            college["count"] += count
+            program["count"] += count
+            year_levels[year_level] = year_levels.get(year_level, 0) + count
+            genders[gender] = genders.get(gender, 0) + count
+            total += count
+
+        return {
+            "total": total,
+            "byCollege": list(colleges.values()),
+            "byProgram": list(programs.values()),
+            "byYearLevel": [{"year_level": y, "count": n} for y, n in sorted(year_levels.items())],
+            "byGender": [{"gender": g, "count": n} for g, n in sorted(genders.items())],
+        }
@@ -1,5 +1,7 @@
 # Models/students/StudentAddModel.py
 from Models.db.db_utils import DBUtils
+from Models.db.db_table_versions import TableVersions
+from Models.db.db_errors import ConstraintErrors
 
 class StudentAddModel:
     @staticmethod
@@ -36,32 +38,32 @@ class StudentAddModel:
             return {"success": False, "message": "All required fields must be provided."}
 
         try:
-            # Check if the referenced program exists
-            program_check_query = "SELECT 1 FROM programs WHERE program_code = %s"
-            program_exists = DBUtils.execute_query(program_check_query, (program_code,), fetch=True)
-            if not program_exists:
-                return {"success": False, "message": f"Program with code '{program_code}' not found."}
-
-            # Check if the student ID already exists
-            duplicate_query = "SELECT 1 FROM students WHERE id_number = %s"
-            duplicate_exists = DBUtils.execute_query(duplicate_query, (id_number,), fetch=True)
-            if duplicate_exists:
-                return {"success": False, "message": f"Student with ID '{id_number}' already exists."}
-
-            # Insert new student, including profile_image_path
-            insert_query = """
-                INSERT INTO students
-                    (id_number, first_name, middle_name, last_name, gender, year_level, program_code, profile_image_path)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """
-        
-            DBUtils.execute_query(
-                insert_query,
-                (id_number, first_name, middle_name, last_name, gender, year_level, program_code, profile_image_path),
-                fetch=False
-            )
-            return {"success": True, "message": "Student added successfully."}
-
+            with DBUtils.transaction():
+                # The primary key skips duplicate IDs (no row back); the foreign key rejects unknown programs
+                insert_query = """
+                    INSERT INTO students
+                        (id_number, first_name, middle_name, last_name, gender, year_level, program_code, profile_image_path)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (id_number) DO NOTHING
+                    RETURNING id_number
+                """
+                inserted = DBUtils.execute_query(
+                    insert_query,
+                    (id_number, first_name, middle_name, last_name, gender, year_level, program_code, profile_image_path),
+                    fetch=True
+                )
         except Exception as e:
+            message = ConstraintErrors.message(e, {
+                ConstraintErrors.FOREIGN_KEY_VIOLATION: f"Program with code '{program_code}' not found.",
+            })
+            if message:
+                return {"success": False, "message": message}
             print("Error in add_student:", e)
             return {"success": False, "message": "Database error while adding student."}
+
+        if not inserted:
+            return {"success": False, "message": f"Student with ID '{id_number}' already exists."}
+
+        # Student list/search ETags follow the new version right away, without waiting for the NOTIFY
+        DBUtils.on_commit(lambda: TableVersions.invalidate("students"))
+        return {"success": True, "message": "Student added successfully."}
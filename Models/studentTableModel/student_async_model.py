@@ -0,0 +1,86 @@
+from Models.db.db_async import AsyncDBUtils
+from Models.db.db_search import SearchStatement
+from Models.studentTableModel.student_table_model import StudentModel
+from Models.studentTableModel.student_search_model import StudentSearchModel
+
+class StudentAsyncModel:
+    """
+    Async read paths for students, used by the ASGI serving mode.
+
+    SQL comes from the statement builders of StudentModel and
+    StudentSearchModel, so both modes return identical results.
+    """
+
+    # asyncpg binds parameters by type, so filter values for integer columns must be ints
+    integer_filters = {"year_level"}
+
+    @staticmethod
+    def coerce_filters(filters):
+        coerced = dict(filters)
+        for key in StudentAsyncModel.integer_filters & coerced.keys():
+            try:
+                coerced[key] = int(coerced[key])
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be a whole number.")
+        return coerced
+
+    @staticmethod
+    async def get_students(order_by="id_number", direction="ASC", limit=None, offset=None, filters={}, columnar=False,
+                           fields=None):
+        query, params = StudentModel.list_statement(
+            order_by, direction, limit, offset, StudentAsyncModel.coerce_filters(filters), fields
+        )
+        rows = await AsyncDBUtils.execute_query(query, params, fetch=True)
+        return rows if columnar else StudentModel.to_dicts(rows, fields)
+
+    @staticmethod
+    async def get_students_after(order_by="id_number", direction="ASC", limit=20, cursor=None, filters={}, columnar=False,
+                                 fields=None):
+        """
+        Returns:
+            tuple: (rows, next_cursor)
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or was issued for another ordering.
+        """
+        query, params = StudentModel.keyset_statement(
+            order_by, direction, limit, cursor, StudentAsyncModel.coerce_filters(filters), fields
+        )
+        rows = await AsyncDBUtils.execute_query(query, params, fetch=True)
+        return StudentModel.keyset_page(rows, limit, order_by, direction, columnar, fields)
+
+    @staticmethod
+    async def get_count(filters={}):
+        query, params = StudentModel.count_statement(StudentAsyncModel.coerce_filters(filters))
+        rows = await AsyncDBUtils.execute_query(query, params, fetch=True)
+        return rows[0][0]
+
+    @staticmethod
+    async def search_students(query="", limit=20, offset=0, order_by="id_number", direction="ASC", estimate_count=False,
+                              columnar=False, fields=None):
+        """
+        Returns:
+            tuple: (total_count, rows)
+        """
+        data_query, params = StudentSearchModel.search_statement(
+            query, limit, offset, order_by, direction, estimate_count, fields
+        )
+        rows = await AsyncDBUtils.execute_query(data_query, params, fetch=True)
+        total_count, page = SearchStatement.split(rows)
+        return total_count, page if columnar else StudentSearchModel.to_dicts(page, fields)
+
+    @staticmethod
+    async def search_students_after(query="", limit=20, cursor=None, order_by="id_number", direction="ASC", estimate_count=False,
+                                    columnar=False, fields=None):
+        """
+        Returns:
+            tuple: (total_count, rows, next_cursor)
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or was issued for another ordering.
+        """
+        data_query, params = StudentSearchModel.search_after_statement(
+            query, limit, cursor, order_by, direction, estimate_count, fields
+        )
+        rows = await AsyncDBUtils.execute_query(data_query, params, fetch=True)
+        return StudentSearchModel.search_after_page(rows, limit, order_by, direction, columnar, fields)
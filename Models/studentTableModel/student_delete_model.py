@@ -1,4 +1,6 @@
 from Models.db.db_utils import DBUtils
+from Models.db.db_table_versions import TableVersions
+from Models.studentTableModel.student_image_model import StudentImageModel
 
 class StudentDeleteModel:
 
@@ -20,18 +22,69 @@ class StudentDeleteModel:
             return {"success": False, "message": "Student ID number is required."}
 
         try:
-            # Check if the student exists
-            check_query = "SELECT 1 FROM students WHERE id_number = %s"
-            existing = DBUtils.execute_query(check_query, (id_number,), fetch=True)
-            if not existing:
-                return {"success": False, "message": "Student not found."}
+            with DBUtils.transaction():
+                # No row back means the student does not exist
+                delete_query = "DELETE FROM students WHERE id_number = %s RETURNING id_number, profile_image_path"
+                deleted = DBUtils.execute_query(delete_query, (id_number,), fetch=True)
+        except Exception as e:
+            print("Error in delete_student:", e)
+            return {"success": False, "message": "Database error while deleting student."}
+
+        if not deleted:
+            return {"success": False, "message": "Student not found."}
+
+        StudentImageModel.delete_after_commit(row[1] for row in deleted)
+        DBUtils.on_commit(lambda: TableVersions.invalidate("students"))
+        return {"success": True, "message": "Student deleted successfully."}
 
-            # Safe to delete
-            delete_query = "DELETE FROM students WHERE id_number = %s"
-            DBUtils.execute_query(delete_query, (id_number,), fetch=False)
+    # Upper bound on IDs accepted by one bulk request
+    MAX_BULK_IDS = 1000
 
-            return {"success": True, "message": "Student deleted successfully."}
+    @staticmethod
+    def delete_students(id_numbers):
+        """
+        Deletes many students with a single DELETE ... WHERE id_number = ANY(...).
 
+        Args:
+            id_numbers (list[str]): ID numbers to delete; duplicates are ignored.
+
+        Returns:
+            dict: {
+                "success": bool,
+                "message": str,
+                "deleted": int,
+                "results": [{"id_number": str, "success": bool, "message": str}, ...]
+            }
+        """
+        id_numbers = list(dict.fromkeys(str(i).strip() for i in (id_numbers or []) if str(i).strip()))
+        if not id_numbers:
+            return {"success": False, "message": "At least one student ID number is required."}
+        if len(id_numbers) > StudentDeleteModel.MAX_BULK_IDS:
+            return {"success": False,
+                    "message": f"At most {StudentDeleteModel.MAX_BULK_IDS} students can be deleted at once."}
+
+        try:
+            with DBUtils.transaction():
+                deleted = DBUtils.execute_query(
+                    "DELETE FROM students WHERE id_number = ANY(%s) RETURNING id_number, profile_image_path",
+                    (id_numbers,), fetch=True
+                )
         except Exception as e:
-            print("Error in delete_student:", e)
-            return {"success": False, "message": "Database error while deleting student."}
+            print("Error in delete_students:", e)
+            return {"success": False, "message": "Database error while deleting students."}
+
+        StudentImageModel.delete_after_commit(row[1] for row in deleted)
+        deleted = {row[0] for row in deleted}
+        if deleted:
+            DBUtils.on_commit(lambda: TableVersions.invalidate("students"))
+        results = [
+            {"id_number": i, "success": True, "message": "Student deleted successfully."} if i in deleted
+            else {"id_number": i, "success": False, "message": "Student not found."}
+            for i in id_numbers
+        ]
+        return {
+            "success": True,
+            "message": f"Deleted {len(deleted)} of {len(id_numbers)} student(s).",
+            "deleted": len(deleted),
+            "results": results,
+        }
@@ -0,0 +1,119 @@
+import hashlib
+from config import Config
+from Models.db.db_utils import DBUtils
+from Models.imageModel.image_processor import ImageProcessor, InvalidImageError
+from Models.imageModel.image_storage import ImageStorage, VALID_KEY
+from Models.studentTableModel.student_update_model import StudentUpdateModel
+
+class StudentImageModel:
+    """
+    Stores student profile pictures as server-made thumbnails.
+
+    Each upload is rendered into the fixed PROFILE_IMAGE_SIZES and stored
+    under a key derived from the rendered bytes
+    (students/<id_number>/<content hash>), so re-uploading the same picture
+    writes nothing new and a stored key is never modified. The student's
+    profile_image_path records the key's URL; replacing a picture deletes
+    exactly the previous key, without listing other students' files.
+    """
+
+    @staticmethod
+    def content_key(id_number, variants):
+        digest = hashlib.sha256()
+        for name in sorted(variants):
+            digest.update(name.encode("utf-8"))
+            digest.update(variants[name])
+        return f"students/{id_number}/{digest.hexdigest()[:32]}"
+
+    @staticmethod
+    def upload_profile_image(id_number: str, data: bytes):
+        """
+        Replaces a student's profile picture with thumbnails of `data`.
+
+        Returns:
+            dict: {"success": bool, "message": str, "profile_image_path": str, "variants": [str, ...]}
+
+        Raises:
+            ImageProcessorBusyError: If too many images are already being processed.
+        """
+        # The ID becomes one segment of the storage key
+        if not id_number or "/" in id_number or not VALID_KEY.match(id_number):
+            return {"success": False, "message": "A valid id_number is required."}
+        if not data:
+            return {"success": False, "message": "No image was uploaded."}
+        max_bytes = int(getattr(Config, "PROFILE_IMAGE_MAX_BYTES", 5 * 1024 * 1024))
+        if len(data) > max_bytes:
+            return {"success": False, "message": f"Images may be at most {max_bytes // (1024 * 1024)} MB."}
+
+        existing = DBUtils.execute_query(
+            "SELECT profile_image_path FROM students WHERE id_number = %s",
+            (id_number,), fetch=True, prepared=True
+        )
+        if not existing:
+            return {"success": False, "message": "Student not found."}
+
+        try:
+            variants = ImageProcessor.render(data)
+        except InvalidImageError as e:
+            return {"success": False, "message": str(e)}
+
+        storage = ImageStorage.default()
+        key = StudentImageModel.content_key(id_number, variants)
+        old_key = storage.key_from_url(existing[0][0])
+        try:
+            storage.save(key, variants)
+        except OSError as e:
+            print("Error storing profile image:", e)
+            return {"success": False, "message": "Could not store the image."}
+
+        path = storage.url(key)
+        result = StudentUpdateModel.update_student(id_number, new_image_path=path)
+        if not result["success"]:
+            if key != old_key:
+                storage.delete(key)
+            return result
+
+        # Only once the new path is committed; until then the old picture is still in use
+        if old_key and old_key != key:
+            DBUtils.on_commit(lambda: storage.delete(old_key))
+
+        return {
+            "success": True,
+            "message": "Profile picture updated successfully.",
+            "profile_image_path": path,
+            "variants": sorted(variants),
+        }
+
+    @staticmethod
+    def delete_after_commit(image_paths):
+        """
+        Deletes the stored thumbnails behind profile_image_path values once the transaction commits.
+
+        Paths that are empty or not from the storage backend are ignored.
+        """
+        storage = ImageStorage.default()
+        keys = {storage.key_from_url(path) for path in image_paths} - {None}
+        for key in keys:
+            DBUtils.on_commit(lambda key=key: storage.delete(key))
+
+    @staticmethod
+    def remove_profile_image(id_number: str):
+        """
+        Clears a student's profile picture and deletes its stored thumbnails.
+        """
+        existing = DBUtils.execute_query(
+            "SELECT profile_image_path FROM students WHERE id_number = %s",
+            (id_number,), fetch=True, prepared=True
+        )
+        if not existing:
+            return {"success": False, "message": "Student not found."}
+
+        result = StudentUpdateModel.update_student(id_number, new_image_path="")
+        if not result["success"]:
+            return result
+
+        storage = ImageStorage.default()
+        old_key = storage.key_from_url(existing[0][0])
+        if old_key:
+            DBUtils.on_commit(lambda: storage.delete(old_key))
+        return {"success": True, "message": "Profile picture removed."}
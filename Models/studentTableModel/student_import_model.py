@@ -0,0 +1,248 @@
+import csv
+import io
+import json
+from Models.db.db_utils import DBUtils
+from Models.db.db_table_versions import TableVersions
+
+class _CsvRowStream:
+    """
+    File-like adapter that serializes an iterator of rows as CSV for COPY FROM STDIN.
+
+    psycopg2 pulls data with read(size), so rows are encoded on demand and the
+    upload is never held in memory as a whole.
+    """
+
+    def __init__(self, rows):
+        self._rows = rows
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._pending = ""
+
+    def read(self, size=-1):
+        while size < 0 or len(self._pending) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._writer.writerow(row)
+            self._pending += self._buffer.getvalue()
+            self._buffer.seek(0)
+            self._buffer.truncate()
+
+        if size < 0:
+            chunk, self._pending = self._pending, ""
+        else:
+            chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+
+def _length_rule(max_lengths):
+    """
+    Builds a VALIDATION_RULES entry rejecting values longer than their students column allows.
+    """
+    condition = " OR ".join(f"length(st.{column}) > {limit}" for column, limit in max_lengths.items())
+    message = "CASE " + " ".join(
+        f"WHEN length(st.{column}) > {limit} THEN '{column} must be at most {limit} characters.'"
+        for column, limit in max_lengths.items()
+    ) + " END"
+    return condition, message
+
+
+class StudentImportModel:
+    REQUIRED_COLUMNS = ("id_number", "first_name", "last_name", "gender", "year_level", "program_code")
+    OPTIONAL_COLUMNS = ("middle_name", "profile_image_path")
+    COLUMNS = ("id_number", "first_name", "middle_name", "last_name", "gender",
+               "year_level", "program_code", "profile_image_path")
+
+    # Cap on per-row errors echoed back; the total is always reported
+    MAX_REPORTED_ERRORS = 1000
+
+    # Column sizes in students (see Models/migrations/0001_initial_schema.sql); staging is TEXT, so an
+    # oversized value would otherwise only fail the final INSERT, for the whole file
+    MAX_LENGTHS = {"id_number": 20, "first_name": 100, "middle_name": 100, "last_name": 100,
+                   "gender": 20, "program_code": 20}
+
+    # Validation applied set-wise to the staging table: (condition, SQL message), first failing rule wins
+    VALIDATION_RULES = [
+        ("""
+            st.id_number IS NULL OR st.first_name IS NULL OR st.last_name IS NULL
+            OR st.gender IS NULL OR st.year_level IS NULL OR st.program_code IS NULL
+         """, "'All required fields must be provided.'"),
+        _length_rule(MAX_LENGTHS),
+        ("st.year_level !~ '^[0-9]{1,3}$'", "'year_level must be a whole number.'"),
+        ("NOT EXISTS (SELECT 1 FROM programs p WHERE p.program_code = st.program_code)",
+         "'Program with code ''' || st.program_code || ''' not found.'"),
+        ("""
+            EXISTS (SELECT 1 FROM student_import_staging d
+                    WHERE d.id_number = st.id_number AND d.row_number < st.row_number)
+         """, "'Duplicate ID ''' || st.id_number || ''' earlier in the file.'"),
+        ("EXISTS (SELECT 1 FROM students s WHERE s.id_number = st.id_number)",
+         "'Student with ID ''' || st.id_number || ''' already exists.'"),
+    ]
+
+    @staticmethod
+    def parse_csv(stream, errors):
+        """
+        Yields (row_number, *COLUMNS) from a CSV upload with a header row.
+
+        Raises:
+            ValueError: If required header columns are missing.
+        """
+        reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+        header = {name.strip() for name in (reader.fieldnames or [])}
+        missing = [c for c in StudentImportModel.REQUIRED_COLUMNS if c not in header]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}.")
+
+        for record in reader:
+            # Data starts on line 2; this ignores quoted multi-line fields, which the form never produces
+            row_number = reader.line_num
+            if None in record:
+                errors.append({"row": row_number, "id_number": record.get("id_number"),
+                               "message": "Row has more fields than the header."})
+                continue
+            yield StudentImportModel._normalize(row_number, {k.strip(): v for k, v in record.items() if k})
+
+    @staticmethod
+    def parse_ndjson(stream, errors):
+        """
+        Yields (row_number, *COLUMNS) from newline-delimited JSON objects.
+        """
+        for row_number, line in enumerate(io.TextIOWrapper(stream, encoding="utf-8-sig"), start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError
+            except ValueError:
+                errors.append({"row": row_number, "id_number": None, "message": "Invalid JSON object."})
+                continue
+            yield StudentImportModel._normalize(row_number, record)
+
+    @staticmethod
+    def _normalize(row_number, record):
+        values = [row_number]
+        for column in StudentImportModel.COLUMNS:
+            value = record.get(column)
+            value = "" if value is None else str(value).strip()
+            # Empty unquoted CSV fields load as NULL
+            values.append(value)
+        return values
+
+    @staticmethod
+    def import_students(stream, file_format="csv"):
+        """
+        Bulk-imports students from a CSV or NDJSON upload.
+
+        Rows are streamed into a temporary staging table with COPY, validated
+        with set-wise queries (required fields, year level, program codes,
+        duplicates within the file and against existing students), and every
+        valid row is inserted with one INSERT ... SELECT in the same transaction.
+
+        Args:
+            stream: Binary file object of the upload.
+            file_format (str): "csv" or "ndjson".
+
+        Returns:
+            dict: {
+                "success": bool,
+                "message": str,
+                "imported": int,
+                "failed": int,
+                "errors": [{"row": int, "id_number": str, "message": str}, ...]
+            }
+        """
+        errors = []
+        parser = StudentImportModel.parse_ndjson if file_format == "ndjson" else StudentImportModel.parse_csv
+
+        try:
+            rows = parser(stream, errors)
+            # Surface header problems before any database work
+            first = next(rows, None)
+        except (ValueError, UnicodeDecodeError) as e:
+            return {"success": False, "message": f"Could not read upload: {e}", "imported": 0,
+                    "failed": 0, "errors": []}
+
+        if first is None and not errors:
+            return {"success": False, "message": "The upload contains no rows.", "imported": 0,
+                    "failed": 0, "errors": []}
+
+        def all_rows():
+            if first is not None:
+                yield first
+            yield from rows
+
+        try:
+            with DBUtils.transaction():
+                DBUtils.execute_query("""
+                    CREATE TEMP TABLE student_import_staging (
+                        row_number INTEGER PRIMARY KEY,
+                        id_number TEXT,
+                        first_name TEXT,
+                        middle_name TEXT,
+                        last_name TEXT,
+                        gender TEXT,
+                        year_level TEXT,
+                        program_code TEXT,
+                        profile_image_path TEXT,
+                        error TEXT
+                    ) ON COMMIT DROP
+                """)
+                DBUtils.copy_expert(
+                    f"COPY student_import_staging (row_number, {', '.join(StudentImportModel.COLUMNS)}) "
+                    "FROM STDIN WITH (FORMAT csv)",
+                    _CsvRowStream(all_rows())
+                )
+                DBUtils.execute_query("CREATE INDEX ON student_import_staging (id_number)")
+                DBUtils.execute_query("ANALYZE student_import_staging")
+
+                for condition, message in StudentImportModel.VALIDATION_RULES:
+                    DBUtils.execute_query(f"""
+                        UPDATE student_import_staging st
+                        SET error = {message}
+                        WHERE st.error IS NULL AND ({condition})
+                    """)
+
+                # ON CONFLICT covers IDs inserted concurrently after validation
+                inserted = DBUtils.execute_query(f"""
+                    INSERT INTO students ({', '.join(StudentImportModel.COLUMNS)})
+                    SELECT id_number, first_name, middle_name, last_name, gender,
+                           year_level::integer, program_code, profile_image_path
+                    FROM student_import_staging
+                    WHERE error IS NULL
+                    ORDER BY row_number
+                    ON CONFLICT (id_number) DO NOTHING
+                    RETURNING id_number
+                """, fetch=True)
+                DBUtils.execute_query("""
+                    UPDATE student_import_staging st
+                    SET error = 'Student with ID ''' || st.id_number || ''' already exists.'
+                    WHERE st.error IS NULL AND NOT (st.id_number = ANY(%s))
+                """, ([r[0] for r in inserted],))
+
+                rejected = DBUtils.execute_query("""
+                    SELECT row_number, id_number, error
+                    FROM student_import_staging
+                    WHERE error IS NOT NULL
+                    ORDER BY row_number
+                """, fetch=True)
+
+        except Exception as e:
+            print("Error in import_students:", e)
+            return {"success": False, "message": "Database error while importing students.", "imported": 0,
+                    "failed": 0, "errors": []}
+
+        errors.extend({"row": r[0], "id_number": r[1], "message": r[2]} for r in rejected)
+        errors.sort(key=lambda error: error["row"])
+        imported = len(inserted)
+        if imported:
+            # Re-read the students version once committed, as the single-row writes do
+            DBUtils.on_commit(lambda: TableVersions.invalidate("students"))
+
+        return {
+            "success": True,
+            "message": f"Imported {imported} student(s); {len(errors)} row(s) rejected.",
+            "imported": imported,
+            "failed": len(errors),
+            "errors": errors[:StudentImportModel.MAX_REPORTED_ERRORS],
+        }
@@ -0,0 +1,35 @@
+from Models.db.db_utils import DBUtils
+
+class StudentSearchIndex:
+    """
+    The per-student search document table backing StudentSearchModel.
+
+    Documents are maintained by database triggers (see Models/migrations/0003_student_search_documents.sql),
+    so the write models do not need to touch them.
+    """
+
+    REBUILD_QUERY = """
+        INSERT INTO student_search_documents (id_number, document)
+        SELECT s.id_number,
+               student_search_document_text(s.id_number::text, s.first_name, s.middle_name, s.last_name,
+                                            s.year_level, p.program_name, c.college_name)
+        FROM students s
+        JOIN programs p ON s.program_code = p.program_code
+        JOIN colleges c ON p.college_code = c.college_code
+        ON CONFLICT (id_number) DO UPDATE SET document = EXCLUDED.document
+    """
+
+    @staticmethod
+    def rebuild():
+        """
+        Recomputes every search document, e.g. after a bulk load with triggers disabled.
+        """
+        DBUtils.execute_query(StudentSearchIndex.REBUILD_QUERY, None, fetch=False)
+
+    @staticmethod
+    def like_pattern(text: str):
+        """
+        Returns a lower-cased '%text%' pattern with LIKE wildcards in the input escaped.
+        """
+        escaped = text.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"%{escaped}%"
@@ -1,107 +1,272 @@
 from Models.db.db_utils import DBUtils
+from Models.db.db_pagination import KeysetPagination
+from Models.db.db_search import SearchStatement
+from Models.studentTableModel.student_table_model import StudentModel
+from Models.studentTableModel.student_search_index import StudentSearchIndex
 
 class StudentSearchModel:
 
+    # d.document is the trigger-maintained search text of each student,
+    # covered by a trigram GIN index (see StudentSearchIndex). LEFT JOIN keeps a
+    # student whose document is missing (e.g. loaded with triggers disabled and
+    # not yet rebuilt) in unfiltered results; a LIKE on d.document still turns
+    # it into an inner join for the planner.
+    base_query = """
+        FROM students s
+        LEFT JOIN student_search_documents d ON d.id_number = s.id_number
+        JOIN programs p ON s.program_code = p.program_code
+        JOIN colleges c ON p.college_code = c.college_code
+    """
+
+    @staticmethod
+    def build_where_clause(tokens, exact=False, prioritize_year=False):
+        where_clauses = []
+        params = []
+
+        if prioritize_year and tokens.isdigit() and tokens in {"1","2","3","4"}:
+            # Prioritize year_level exact match
+            where_clauses.append("s.year_level = %s")
+            params.append(int(tokens))
+
+        if exact:
+            if not tokens.strip():
+                # An empty phrase matches everything; skip the predicate entirely
+                return where_clauses, params
+            where_clauses.append("d.document LIKE %s")
+            params.append(StudentSearchIndex.like_pattern(tokens))
+        else:
+            for token in tokens.split():
+                where_clauses.append("d.document LIKE %s")
+                params.append(StudentSearchIndex.like_pattern(token))
+        return where_clauses, params
+
+    # Page columns shared by both pagination modes
+    columns_sql = """
+        s.id_number,
+        s.first_name,
+        s.middle_name,
+        s.last_name,
+        s.gender,
+        s.year_level,
+        s.program_code,
+        s.profile_image_path,
+        p.program_name AS program_name,
+        c.college_name AS college_name
+    """
+
+    # Selectable page columns (see ?fields=), in columns_sql order
+    field_map = {
+        "id_number": "s.id_number",
+        "first_name": "s.first_name",
+        "middle_name": "s.middle_name",
+        "last_name": "s.last_name",
+        "gender": "s.gender",
+        "year_level": "s.year_level",
+        "program_code": "s.program_code",
+        "profile_image_path": "s.profile_image_path",
+        "program_name": "p.program_name",
+        "college_name": "c.college_name",
+    }
+
+    # Names of the columns_sql columns, in order
+    columns = list(field_map.keys())
+
+    # The match only reads the search document, which already holds the
+    # program and college names, so it never needs those joins
+    match_from_sql = """
+        FROM students s
+        LEFT JOIN student_search_documents d ON d.id_number = s.id_number
+    """
+
+    @staticmethod
+    def page_from_sql(fields, order_by, relevance=False):
+        """
+        Returns the FROM clause of the page with only the joins its selected and sorted columns need.
+        """
+        from_sql = StudentModel.from_sql(tuple(fields) + (order_by,))
+        if relevance:
+            from_sql += "LEFT JOIN student_search_documents d ON d.id_number = s.id_number "
+        return from_sql
+
+    @staticmethod
+    def build_statement(query, columns_sql, order_sql, order_params=(), page_where=None, page_params=(),
+                        limit=20, offset=0, estimate_count=False, page_from_sql=None):
+        """
+        Builds the single count-and-page statement for a search.
+
+        Step 1 prioritizes year_level for "1".."4"; the exact phrase and the
+        tokenized fallback are then resolved inside the statement.
+        """
+        page_from_sql = page_from_sql or StudentSearchModel.base_query
+
+        if estimate_count and not query:
+            return SearchStatement.build_estimated(
+                columns_sql, page_from_sql, "students", order_sql, order_params,
+                page_where, page_params, limit, offset
+            )
+
+        prioritize_year = query.isdigit() and query in {"1","2","3","4"}
+        exact_where, exact_params = StudentSearchModel.build_where_clause(query, exact=True, prioritize_year=prioritize_year)
+        token_where, token_params = StudentSearchModel.build_where_clause(query, exact=False, prioritize_year=prioritize_year)
+
+        return SearchStatement.build(
+            columns_sql, StudentSearchModel.match_from_sql, "s.id_number",
+            exact_where, exact_params, token_where, token_params,
+            order_sql, order_params, page_where, page_params, limit, offset,
+            page_from_sql=page_from_sql
+        )
+
+    @staticmethod
+    def select_sql(fields):
+        return ", ".join(StudentSearchModel.field_map[name] for name in fields)
+
+    @staticmethod
+    def to_dicts(rows, fields=None):
+        columns = fields or StudentSearchModel.columns
+        return [dict(zip(columns, row)) for row in rows]
+
+    @staticmethod
+    def search_statement(query="", limit=20, offset=0, order_by="id_number", direction="ASC", estimate_count=False,
+                         fields=None):
+        """
+        Returns (sql, params) for search_students; shared with the async model.
+        """
+        direction = "DESC" if direction == "DESC" else "ASC"
+        fields = tuple(fields or StudentSearchModel.columns)
+        order_params = []
+        relevance = order_by == "relevance" and bool(query)
+
+        if relevance:
+            # Rank by how closely the query matches a word sequence in the document
+            order_sql = f"ORDER BY word_similarity(%s, d.document) DESC NULLS LAST, s.id_number {direction}"
+            order_params.append(query.lower())
+        else:
+            order_column = StudentModel.column_map.get(order_by, "s.id_number")
+            order_sql = f"ORDER BY {order_column} {direction}"
+
+        return StudentSearchModel.build_statement(
+            query, StudentSearchModel.select_sql(fields), order_sql, order_params,
+            limit=limit, offset=offset, estimate_count=estimate_count,
+            page_from_sql=StudentSearchModel.page_from_sql(fields, order_by, relevance)
+        )
+
+    @staticmethod
+    def search_after_statement(query="", limit=20, cursor=None, order_by="id_number", direction="ASC", estimate_count=False,
+                               fields=None):
+        """
+        Returns (sql, params) for search_students_after, fetching one row past the page.
+
+        Each page row carries the selected fields followed by the sort value
+        and the id_number the cursor is built from.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or was issued for another ordering.
+        """
+        direction = "DESC" if direction == "DESC" else "ASC"
+        order_by, sort_column = StudentModel.sort_expression(order_by)
+        fields = tuple(fields or StudentSearchModel.columns)
+
+        # Decode before touching the database so a bad token costs nothing
+        seek = KeysetPagination.decode_cursor(cursor, order_by, direction) if cursor else None
+
+        page_where = None
+        page_params = []
+        if seek:
+            page_where = KeysetPagination.seek_clause(sort_column, "s.id_number", direction)
+            page_params.extend(seek)
+
+        order_sql = KeysetPagination.order_clause(sort_column, "s.id_number", direction)
+        columns_sql = f"{StudentSearchModel.select_sql(fields)}, {sort_column} AS sort_value, s.id_number AS key_value"
+
+        return StudentSearchModel.build_statement(
+            query, columns_sql, order_sql, page_where=page_where, page_params=page_params,
+            limit=limit + 1, offset=0, estimate_count=estimate_count,
+            page_from_sql=StudentSearchModel.page_from_sql(fields, order_by)
+        )
+
     @staticmethod
-    def search_students(query="", limit=20, offset=0, order_by="id_number", direction="ASC"):
-        base_query = """
-            FROM students s
-            JOIN programs p ON s.program_code = p.program_code
-            JOIN colleges c ON p.college_code = c.college_code
-        """
-
-        def build_where_clause(tokens, exact=False, prioritize_year=False):
-            where_clauses = []
-            params = []
-
-            if prioritize_year and tokens.isdigit() and tokens in {"1","2","3","4"}:
-                # Prioritize year_level exact match
-                where_clauses.append("s.year_level::text = %s")
-                params.append(tokens)
-
-            if exact:
-                where_clauses.append("""
-                    s.id_number::text ILIKE %s OR
-                    s.first_name ILIKE %s OR
-                    s.middle_name ILIKE %s OR
-                    s.last_name ILIKE %s OR
-                    s.year_level::text ILIKE %s OR
-                    p.program_name ILIKE %s OR
-                    c.college_name ILIKE %s
-                """)
-                params.extend([f"%{tokens}%"]*7)
-            else:
-                token_list = tokens.split()
-                for token in token_list:
-                    token_like = f"%{token}%"
-                    where_clauses.append("""
-                        (
-                            s.id_number::text ILIKE %s OR
-                            s.first_name ILIKE %s OR
-                            s.middle_name ILIKE %s OR
-                            s.last_name ILIKE %s OR
-                            s.year_level::text ILIKE %s OR
-                            p.program_name ILIKE %s OR
-                            c.college_name ILIKE %s
-                        )
-                    """)
-                    params.extend([token_like]*7)
-            return where_clauses, params
-
-        # Step 1: Prioritize year_level if applicable
+    def search_after_page(rows, limit, order_by="id_number", direction="ASC", columnar=False, fields=None):
+        """
+        Turns the rows of search_after_statement into (total_count, rows, next_cursor).
+        """
+        direction = "DESC" if direction == "DESC" else "ASC"
+        order_by, _ = StudentModel.sort_expression(order_by)
+        fields = tuple(fields or StudentSearchModel.columns)
+        width = len(fields)
+        total_count, rows = SearchStatement.split(rows)
+
+        page, next_cursor = KeysetPagination.build_page(
+            rows, limit, order_by, direction, sort_index=width, key_index=width + 1
+        )
+        # Drop the trailing sort and key columns
+        page = [row[:width] for row in page]
+        return total_count, (page if columnar else StudentSearchModel.to_dicts(page, fields)), next_cursor
+
+    @staticmethod
+    def search_students(query="", limit=20, offset=0, order_by="id_number", direction="ASC", estimate_count=False,
+                        columnar=False, fields=None):
+        """
+        Searches students by ID, name, year level, program and college.
+
+        The whole query is tried as a phrase first; if nothing matches, every
+        whitespace-separated token must match instead. order_by="relevance"
+        ranks rows by trigram word similarity to the query.
+
+        The count and the page come back from one statement. With
+        estimate_count=True an empty query reports the planner's row estimate
+        instead of counting every student.
+
+        With columnar=True rows are returned as tuples in field order instead
+        of dicts. `fields` narrows the page to those columns; the program and
+        college joins are left out unless a selected or sorted column needs them.
+
+        Returns:
+            tuple: (total_count, rows)
+        """
+        data_query, params = StudentSearchModel.search_statement(
+            query, limit, offset, order_by, direction, estimate_count, fields
+        )
+        rows = DBUtils.read_query(data_query, params, prepared=True)
+        total_count, page = SearchStatement.split(rows)
+
+        return total_count, page if columnar else StudentSearchModel.to_dicts(page, fields)
+
+    @staticmethod
+    def search_students_after(query="", limit=20, cursor=None, order_by="id_number", direction="ASC", estimate_count=False,
+                              columnar=False, fields=None):
+        """
+        Keyset-paginated variant of search_students.
+
+        Returns:
+            tuple: (total_count, rows, next_cursor) where next_cursor is None on the last page.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or was issued for another ordering.
+        """
+        data_query, params = StudentSearchModel.search_after_statement(
+            query, limit, cursor, order_by, direction, estimate_count, fields
+        )
+        rows = DBUtils.read_query(data_query, params, prepared=True)
+        return StudentSearchModel.search_after_page(rows, limit, order_by, direction, columnar, fields)
+
+    @staticmethod
+    def export_query(query="", order_by="id_number", direction="ASC"):
+        """
+        Builds the statement returning every student matching `query`, for streaming exports.
+
+        Returns:
+            tuple: (sql, params, column_names)
+        """
+        direction = "DESC" if direction == "DESC" else "ASC"
+        order_column = StudentModel.column_map.get(order_by, "s.id_number")
+
         prioritize_year = query.isdigit() and query in {"1","2","3","4"}
+        exact_where, exact_params = StudentSearchModel.build_where_clause(query, exact=True, prioritize_year=prioritize_year)
+        token_where, token_params = StudentSearchModel.build_where_clause(query, exact=False, prioritize_year=prioritize_year)
 
-        # Step 2: Try exact phrase match
-        where_clauses, params = build_where_clause(query, exact=True, prioritize_year=prioritize_year)
-        where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
-
-        count_query = f"SELECT COUNT(*) {base_query} {where_sql}"
-        total_count_result = DBUtils.execute_query(count_query, params, fetch=True)
-        total_count = total_count_result[0][0] if total_count_result else 0
-
-        # Step 3: Fallback to tokenized search if no results
-        if total_count == 0 and query:
-            where_clauses, params = build_where_clause(query, exact=False, prioritize_year=prioritize_year)
-            where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
-            count_query = f"SELECT COUNT(*) {base_query} {where_sql}"
-            total_count_result = DBUtils.execute_query(count_query, params, fetch=True)
-            total_count = total_count_result[0][0] if total_count_result else 0
-
-        # Step 4: Fetch paginated rows
-        data_query = f"""
-            SELECT
-                s.id_number,
-                s.first_name,
-                s.middle_name,
-                s.last_name,
-                s.gender,
-                s.year_level,
-                s.program_code,
-                s.profile_image_path,      -- ADD THIS LINE
-                p.program_name AS program_name,
-                c.college_name AS college_name
-            {base_query}
-            {where_sql}
-            ORDER BY {order_by} {direction}
-            LIMIT %s OFFSET %s
-        """
-
-        rows = DBUtils.execute_query(data_query, params + [limit, offset], fetch=True)
-
-        result_rows = []
-        for r in rows:
-            result_rows.append({
-                "id_number": r[0],
-                "first_name": r[1],
-                "middle_name": r[2],
-                "last_name": r[3],
-                "gender": r[4],
-                "year_level": r[5],
-                "program_code": r[6],
-                "profile_image_path": r[7],   # ADD THIS LINE
-                "program_name": r[8],
-                "college_name": r[9],
-            })
-
-
-        return total_count, result_rows
+        sql, params = SearchStatement.build_all(
+            StudentSearchModel.columns_sql, StudentSearchModel.base_query, "s.id_number",
+            exact_where, exact_params, token_where, token_params,
+            f"ORDER BY {order_column} {direction}, s.id_number {direction}"
+        )
+        return sql, params, StudentSearchModel.columns
@@ -1,4 +1,6 @@
 from Models.db.db_utils import DBUtils
+from Models.db.db_pagination import KeysetPagination
+from Models.db.db_query_cache import QueryShapeCache
 
 class StudentModel:
     column_map = {
@@ -13,66 +15,261 @@ class StudentModel:
         "program_code": "s.program_code",
     }
 
+    # Names of the columns returned by the list statements, in order
+    columns = list(column_map.keys())
+
+    # Sortable columns that may hold NULL; keyset seeks compare them through COALESCE
+    # so that a NULL on the cursor row does not make the row comparison unknown.
+    nullable_columns = {"middle_name"}
+
+    base_query = """
+        FROM students s
+        JOIN programs p ON s.program_code = p.program_code
+        JOIN colleges c ON p.college_code = c.college_code
+    """
+
+    # Joins each joined column depends on. The foreign keys guarantee every
+    # student has a program and every program a college, so leaving a join out
+    # never changes which students match.
+    column_joins = {
+        "program_name": ("p",),
+        "college_name": ("p", "c"),
+    }
+
+    @staticmethod
+    def from_sql(names):
+        """
+        Returns the FROM clause with only the joins needed by the column `names`
+        (selected, filtered or sorted on).
+        """
+        aliases = set()
+        for name in names:
+            aliases.update(StudentModel.column_joins.get(name, ()))
+        query = " FROM students s"
+        if "p" in aliases:
+            query += " JOIN programs p ON s.program_code = p.program_code"
+        if "c" in aliases:
+            query += " JOIN colleges c ON p.college_code = c.college_code"
+        return query + " "
+
+    @staticmethod
+    def parse_fields(fields, allowed=None):
+        """
+        Parses a comma-separated ?fields= value into a tuple of column names.
+
+        Names are returned in `allowed` order whatever order they were given
+        in, so each set of fields maps to one query shape and one prepared
+        statement (columnar responses list the columns they use).
+
+        Args:
+            fields (str): e.g. "id_number,first_name"; empty or None selects every column.
+            allowed (list, optional): Valid names in default order; StudentModel.columns by default.
+
+        Raises:
+            ValueError: If a name is not an allowed column.
+        """
+        allowed = allowed or StudentModel.columns
+        if not fields:
+            return tuple(allowed)
+        names = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = [name for name in names if name not in allowed]
+        if unknown or not names:
+            raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown)) or fields}. Allowed: {', '.join(allowed)}.")
+        return tuple(name for name in allowed if name in names)
+
     @staticmethod
-    def get_students(order_by="id_number", direction="ASC", limit=None, offset=None, filters={}):
-        base_query = """
-            SELECT 
-                s.id_number,
-                s.first_name,
-                s.middle_name,
-                s.last_name,
-                s.gender,
-                s.year_level,
-                p.program_name,
-                c.college_name,
-                s.program_code
-            FROM students s
-            JOIN programs p ON s.program_code = p.program_code
-            JOIN colleges c ON p.college_code = c.college_code
-        """
-        where_clauses = []
-        values = []
-
-        for key, value in filters.items():
-            if key in StudentModel.column_map:
-                where_clauses.append(f"{StudentModel.column_map[key]} = %s")
-                values.append(value)
-
-        if where_clauses:
-            base_query += " WHERE " + " AND ".join(where_clauses)
-
-        order_column = StudentModel.column_map.get(order_by, "s.id_number")
-        base_query += f" ORDER BY {order_column} {direction}"
+    def select_sql(fields):
+        return ", ".join(StudentModel.column_map[name] for name in fields)
+
+    @staticmethod
+    def sort_expression(order_by):
+        """
+        Returns (order_by, SQL expression) for a sort key, falling back to id_number.
+        """
+        if order_by not in StudentModel.column_map:
+            order_by = "id_number"
+        column = StudentModel.column_map[order_by]
+        if order_by in StudentModel.nullable_columns:
+            column = f"COALESCE({column}, '')"
+        return order_by, column
+
+    @staticmethod
+    def filter_shape(filters):
+        """
+        Returns (filter_keys, values) for the recognised filters in a stable order,
+        so that the same set of keys always produces the same SQL shape.
+        """
+        filter_keys = tuple(sorted(key for key in filters if key in StudentModel.column_map))
+        return filter_keys, [filters[key] for key in filter_keys]
+
+    @staticmethod
+    def where_sql(filter_keys, extra=()):
+        where_clauses = [f"{StudentModel.column_map[key]} = %s" for key in filter_keys]
+        where_clauses.extend(extra)
+        return " WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+
+    @staticmethod
+    def list_statement(order_by="id_number", direction="ASC", limit=None, offset=None, filters={}, fields=None):
+        """
+        Returns (sql, params) for get_students; shared with the async model.
+        """
+        direction = "DESC" if direction == "DESC" else "ASC"
+        if order_by not in StudentModel.column_map:
+            order_by = "id_number"
+        fields = tuple(fields or StudentModel.columns)
+        filter_keys, values = StudentModel.filter_shape(filters)
+
+        def build():
+            query = f"SELECT {StudentModel.select_sql(fields)}"
+            query += StudentModel.from_sql(fields + filter_keys + (order_by,))
+            query += StudentModel.where_sql(filter_keys)
+            query += f" ORDER BY {StudentModel.column_map[order_by]} {direction}"
+            if limit is not None:
+                query += " LIMIT %s"
+            if offset is not None:
+                query += " OFFSET %s"
+            return query
 
         if limit is not None:
-            base_query += " LIMIT %s"
             values.append(limit)
         if offset is not None:
-            base_query += " OFFSET %s"
             values.append(offset)
 
-        rows = DBUtils.execute_query(base_query, tuple(values), fetch=True)
-        columns = list(StudentModel.column_map.keys())
+        shape = ("students.list", fields, filter_keys, order_by, direction, limit is not None, offset is not None)
+        return QueryShapeCache.get(shape, build), tuple(values)
+
+    @staticmethod
+    def keyset_statement(order_by="id_number", direction="ASC", limit=20, cursor=None, filters={}, fields=None):
+        """
+        Returns (sql, params) for get_students_after, fetching one row past the page.
+
+        Each row carries the selected fields followed by the sort value and the
+        id_number the cursor is built from.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or was issued for another ordering.
+        """
+        direction = "DESC" if direction == "DESC" else "ASC"
+        order_by, sort_column = StudentModel.sort_expression(order_by)
+        fields = tuple(fields or StudentModel.columns)
+        filter_keys, values = StudentModel.filter_shape(filters)
+
+        if cursor:
+            values.extend(KeysetPagination.decode_cursor(cursor, order_by, direction))
+        values.append(limit + 1)
+
+        def build():
+            seek = [KeysetPagination.seek_clause(sort_column, "s.id_number", direction)] if cursor else []
+            query = f"SELECT {StudentModel.select_sql(fields)}, {sort_column} AS sort_value, s.id_number AS key_value"
+            query += StudentModel.from_sql(fields + filter_keys + (order_by,))
+            query += StudentModel.where_sql(filter_keys, seek)
+            query += " " + KeysetPagination.order_clause(sort_column, "s.id_number", direction)
+            query += " LIMIT %s"
+            return query
+
+        shape = ("students.keyset", fields, filter_keys, order_by, direction, bool(cursor))
+        return QueryShapeCache.get(shape, build), tuple(values)
+
+    @staticmethod
+    def keyset_page(rows, limit, order_by="id_number", direction="ASC", columnar=False, fields=None):
+        """
+        Turns the rows of keyset_statement into (rows, next_cursor).
+        """
+        direction = "DESC" if direction == "DESC" else "ASC"
+        order_by, _ = StudentModel.sort_expression(order_by)
+        fields = tuple(fields or StudentModel.columns)
+        width = len(fields)
+        page, next_cursor = KeysetPagination.build_page(
+            rows, limit, order_by, direction, sort_index=width, key_index=width + 1
+        )
+        # Drop the trailing sort and key columns
+        page = [row[:width] for row in page]
+        return (page if columnar else StudentModel.to_dicts(page, fields)), next_cursor
+
+    @staticmethod
+    def count_statement(filters={}):
+        filter_keys, values = StudentModel.filter_shape(filters)
+
+        def build():
+            # Joins only when a filter needs them; an unfiltered count reads students alone
+            return "SELECT COUNT(*)" + StudentModel.from_sql(filter_keys) + StudentModel.where_sql(filter_keys)
+
+        return QueryShapeCache.get(("students.count", filter_keys), build), tuple(values)
+
+    @staticmethod
+    def to_dicts(rows, fields=None):
+        columns = fields or StudentModel.columns
         return [dict(zip(columns, row)) for row in rows]
 
+    @staticmethod
+    def get_students(order_by="id_number", direction="ASC", limit=None, offset=None, filters={}, columnar=False,
+                     fields=None):
+        """
+        With columnar=True rows are returned as tuples in field order instead of dicts.
+
+        Args:
+            fields (tuple, optional): Columns to select (see parse_fields); all by default.
+        """
+        query, params = StudentModel.list_statement(order_by, direction, limit, offset, filters, fields)
+        rows = DBUtils.read_query(query, params, prepared=True)
+        return rows if columnar else StudentModel.to_dicts(rows, fields)
+
+    @staticmethod
+    def get_students_after(order_by="id_number", direction="ASC", limit=20, cursor=None, filters={}, columnar=False,
+                           fields=None):
+        """
+        Fetches one page of students using keyset pagination.
+
+        Args:
+            cursor (str, optional): Token returned as next_cursor by the previous page;
+                None or "" starts from the first page.
+
+        Returns:
+            tuple: (rows, next_cursor) where next_cursor is None on the last page.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or was issued for another ordering.
+        """
+        query, params = StudentModel.keyset_statement(order_by, direction, limit, cursor, filters, fields)
+        rows = DBUtils.read_query(query, params, prepared=True)
+        return StudentModel.keyset_page(rows, limit, order_by, direction, columnar, fields)
 
     @staticmethod
     def get_count(filters={}):
-        base_query = """
-            SELECT COUNT(*)
-            FROM students s
-            JOIN programs p ON s.program_code = p.program_code
-            JOIN colleges c ON p.college_code = c.college_code
+        query, params = StudentModel.count_statement(filters)
+        return DBUtils.read_query(query, params, prepared=True)[0][0]
+
+    @staticmethod
+    def export_query(order_by="id_number", direction="ASC", filters={}):
         """
-        where_clauses = []
-        values = []
+        Builds the statement returning every student matching `filters`, for streaming exports.
 
-        for key, value in filters.items():
-            if key in StudentModel.column_map:
-                where_clauses.append(f"{StudentModel.column_map[key]} = %s")
-                values.append(value)
+        Returns:
+            tuple: (sql, params, column_names)
+        """
+        direction = "DESC" if direction == "DESC" else "ASC"
+        if order_by not in StudentModel.column_map:
+            order_by = "id_number"
+        filter_keys, values = StudentModel.filter_shape(filters)
 
-        if where_clauses:
-            base_query += " WHERE " + " AND ".join(where_clauses)
+        def build():
+            query = f"""
+                SELECT 
+                    s.id_number,
+                    s.first_name,
+                    s.middle_name,
+                    s.last_name,
+                    s.gender,
+                    s.year_level,
+                    p.program_name,
+                    c.college_name,
+                    s.program_code
+                {StudentModel.base_query}
+            """
+            query += StudentModel.where_sql(filter_keys)
+            query += f" ORDER BY {StudentModel.column_map[order_by]} {direction}, s.id_number {direction}"
+            return query
 
-        return DBUtils.execute_query(base_query, tuple(values), fetch=True)[0][0]
+        # Named cursors cannot run prepared statements, so only the SQL text is cached
+        query = QueryShapeCache.get(("students.export", filter_keys, order_by, direction), build)
+        return query, values, StudentModel.columns
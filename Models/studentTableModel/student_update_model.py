@@ -1,4 +1,6 @@
 from Models.db.db_utils import DBUtils
+from Models.db.db_table_versions import TableVersions
+from Models.db.db_errors import ConstraintErrors
 
 class StudentUpdateModel:
     @staticmethod
@@ -18,60 +20,142 @@ class StudentUpdateModel:
         if not id_number:
             return {"success": False, "message": "id_number is required."}
 
-        try:
-            # Check if the student exists
-            check_query = "SELECT 1 FROM students WHERE id_number = %s"
-            existing = DBUtils.execute_query(check_query, (id_number,), fetch=True)
-            if not existing:
-                return {"success": False, "message": "Student not found."}
-
-            # If program code is being updated, ensure it exists
-            if new_program_code:
-                program_check_query = "SELECT 1 FROM programs WHERE program_code = %s"
-                valid_program = DBUtils.execute_query(program_check_query, (new_program_code,), fetch=True)
-                if not valid_program:
-                    return {"success": False, "message": "Invalid program_code: does not exist."}
-
-            # Build dynamic SET clause
-            fields = []
-            params = []
-
-            # Only skip None; allow empty strings for middle name or image path
-            if new_first_name is not None:
-                fields.append("first_name = %s")
-                params.append(new_first_name)
-            if new_middle_name is not None:
-                fields.append("middle_name = %s")
-                params.append(new_middle_name)
-            if new_last_name is not None:
-                fields.append("last_name = %s")
-                params.append(new_last_name)
-            if new_gender is not None:
-                fields.append("gender = %s")
-                params.append(new_gender)
-            if new_year_level is not None:
-                fields.append("year_level = %s")
-                params.append(new_year_level)
-            if new_program_code is not None:
-                fields.append("program_code = %s")
-                params.append(new_program_code)
-            # Only update profile_image_path if the frontend actually sent a value
-            if new_image_path is not None:
-                fields.append("profile_image_path = %s")
-                params.append(new_image_path if new_image_path != "" else None)
-            if not fields:
-                return {"success": False, "message": "No fields to update."}
-
-            params.append(id_number)
-            update_query = f"""
-                UPDATE students
-                SET {', '.join(fields)}
-                WHERE id_number = %s
-            """
-
-            DBUtils.execute_query(update_query, tuple(params), fetch=False)
-            return {"success": True, "message": "Student record updated successfully."}
+        # Build dynamic SET clause
+        fields = []
+        params = []
+
+        # Only skip None; allow empty strings for middle name or image path
+        if new_first_name is not None:
+            fields.append("first_name = %s")
+            params.append(new_first_name)
+        if new_middle_name is not None:
+            fields.append("middle_name = %s")
+            params.append(new_middle_name)
+        if new_last_name is not None:
+            fields.append("last_name = %s")
+            params.append(new_last_name)
+        if new_gender is not None:
+            fields.append("gender = %s")
+            params.append(new_gender)
+        if new_year_level is not None:
+            fields.append("year_level = %s")
+            params.append(new_year_level)
+        if new_program_code is not None:
+            fields.append("program_code = %s")
+            params.append(new_program_code)
+        # Only update profile_image_path if the frontend actually sent a value
+        if new_image_path is not None:
+            fields.append("profile_image_path = %s")
+            params.append(new_image_path if new_image_path != "" else None)
+        if not fields:
+            return {"success": False, "message": "No fields to update."}
+
+        params.append(id_number)
+        # No row back means the student does not exist; the foreign key rejects unknown programs
+        update_query = f"""
+            UPDATE students
+            SET {', '.join(fields)}
+            WHERE id_number = %s
+            RETURNING id_number
+        """
 
+        try:
+            with DBUtils.transaction():
+                updated = DBUtils.execute_query(update_query, tuple(params), fetch=True)
         except Exception as e:
+            message = ConstraintErrors.message(e, {
+                ConstraintErrors.FOREIGN_KEY_VIOLATION: "Invalid program_code: does not exist.",
+            })
+            if message:
+                return {"success": False, "message": message}
             print("Error in update_student:", e)
             return {"success": False, "message": "Database error while updating student."}
+
+        if not updated:
+            return {"success": False, "message": "Student not found."}
+
+        DBUtils.on_commit(lambda: TableVersions.invalidate("students"))
+        return {"success": True, "message": "Student record updated successfully."}
+
+    # Fields a bulk update may set on every selected student
+    BULK_FIELDS = ("first_name", "middle_name", "last_name", "gender", "year_level",
+                   "program_code", "profile_image_path")
+
+    # Upper bound on IDs accepted by one bulk request
+    MAX_BULK_IDS = 1000
+
+    @staticmethod
+    def update_students(id_numbers, patch):
+        """
+        Applies the same field changes to many students with a single UPDATE ... WHERE id_number = ANY(...).
+
+        Args:
+            id_numbers (list[str]): ID numbers to update; duplicates are ignored.
+            patch (dict): Column -> new value, limited to BULK_FIELDS. An empty
+                profile_image_path clears the image.
+
+        Returns:
+            dict: {
+                "success": bool,
+                "message": str,
+                "updated": int,
+                "results": [{"id_number": str, "success": bool, "message": str}, ...]
+            }
+        """
+        id_numbers = list(dict.fromkeys(str(i).strip() for i in (id_numbers or []) if str(i).strip()))
+        if not id_numbers:
+            return {"success": False, "message": "At least one student ID number is required."}
+        if len(id_numbers) > StudentUpdateModel.MAX_BULK_IDS:
+            return {"success": False,
+                    "message": f"At most {StudentUpdateModel.MAX_BULK_IDS} students can be updated at once."}
+
+        patch = patch or {}
+        unknown = [key for key in patch if key not in StudentUpdateModel.BULK_FIELDS]
+        if unknown:
+            return {"success": False, "message": f"Cannot bulk update: {', '.join(sorted(unknown))}."}
+
+        # Fixed column order keeps the statement text stable for the same set of fields
+        fields = [key for key in StudentUpdateModel.BULK_FIELDS if patch.get(key) is not None]
+        if not fields:
+            return {"success": False, "message": "No fields to update."}
+
+        params = []
+        for key in fields:
+            value = patch[key]
+            if key == "profile_image_path" and value == "":
+                value = None
+            params.append(value)
+        params.append(id_numbers)
+
+        try:
+            with DBUtils.transaction():
+                # The foreign key rejects an unknown program_code for the whole batch
+                updated = DBUtils.execute_query(f"""
+                    UPDATE students
+                    SET {', '.join(f"{key} = %s" for key in fields)}
+                    WHERE id_number = ANY(%s)
+                    RETURNING id_number
+                """, tuple(params), fetch=True)
+        except Exception as e:
+            message = ConstraintErrors.message(e, {
+                ConstraintErrors.FOREIGN_KEY_VIOLATION: "Invalid program_code: does not exist.",
+            })
+            if message:
+                return {"success": False, "message": message}
+            print("Error in update_students:", e)
+            return {"success": False, "message": "Database error while updating students."}
+
+        updated = {row[0] for row in updated}
+        if updated:
+            DBUtils.on_commit(lambda: TableVersions.invalidate("students"))
+        results = [
+            {"id_number": i, "success": True, "message": "Student record updated successfully."} if i in updated
+            else {"id_number": i, "success": False, "message": "Student not found."}
+            for i in id_numbers
+        ]
+        return {
+            "success": True,
+            "message": f"Updated {len(updated)} of {len(id_numbers)} student(s).",
+            "updated": len(updated),
+            "results": results,
+        }
@@ -0,0 +1,77 @@
+import bcrypt
+from config import Config
+from Models.worker_pool import BoundedProcessPool
+
+
+class HasherBusyError(RuntimeError):
+    """Raised when the hashing queue is full or a result does not arrive in time."""
+
+
+# Run in the worker processes; module-level so they can be pickled, and this
+# module stays small because each worker imports it
+def _check(password, password_hash):
+    return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a bounded pool of worker processes.
+
+    bcrypt is deliberately CPU-heavy; done in the request thread, a burst of
+    logins starves every other request on the worker. Here at most
+    BCRYPT_WORKERS hashes run at once and at most BCRYPT_MAX_PENDING wait
+    behind them; beyond that callers get HasherBusyError immediately instead
+    of queueing without bound.
+    """
+
+    _workers = BoundedProcessPool(
+        "BCRYPT", HasherBusyError,
+        busy_message="Too many password checks in progress.",
+        timeout_message="Password check timed out.",
+        max_pending=64, timeout=10.0,
+    )
+
+    @staticmethod
+    def rounds():
+        """
+        Returns the configured bcrypt cost (log2 rounds).
+        """
+        return int(getattr(Config, "BCRYPT_LOG_ROUNDS", 12))
+
+    @staticmethod
+    def hash_rounds(password_hash):
+        """
+        Returns the cost a bcrypt hash was made with, or None if it cannot be read.
+        """
+        try:
+            return int(password_hash.split("$")[2])
+        except (AttributeError, IndexError, ValueError):
+            return None
+
+    @staticmethod
+    def needs_rehash(password_hash):
+        return PasswordHasher.hash_rounds(password_hash) != PasswordHasher.rounds()
+
+    @classmethod
+    def check(cls, password, password_hash):
+        """
+        Returns True if `password` matches `password_hash`.
+
+        Raises:
+            HasherBusyError: If the queue is full or the check times out.
+        """
+        return cls._workers.submit(_check, password, password_hash)
+
+    @classmethod
+    def hash(cls, password):
+        """
+        Returns a bcrypt hash of `password` at the configured cost.
+
+        Raises:
+            HasherBusyError: If the queue is full or hashing times out.
+        """
+        return cls._workers.submit(_hash, password, cls.rounds())
@@ -1,22 +1,82 @@
+import threading
+import time
+from config import Config
 from Models.db.db_utils import DBUtils
-from flask_bcrypt import Bcrypt
+from Models.userModel.password_hasher import PasswordHasher
 
-bcrypt = Bcrypt()
 db = DBUtils()
 
 class UserModel:
+    # username -> (row or None, fetched_at); short-lived so password changes apply quickly
+    _user_cache = {}
+    _user_cache_lock = threading.Lock()
+    MAX_CACHED_USERS = 1024
+
     @staticmethod
     def create_user(username: str, password: str):
-        password_hash = bcrypt.generate_password_hash(password).decode("utf-8")
+        password_hash = PasswordHasher.hash(password)
         query = "INSERT INTO users (username, password_hash) VALUES (%s, %s)"
         db.execute_query(query, (username, password_hash))
+        UserModel.forget_user(username)
 
     @staticmethod
     def get_user_by_username(username: str):
+        """
+        Returns (username, password_hash) or None, cached for USER_CACHE_TTL seconds.
+        """
+        ttl = float(getattr(Config, "USER_CACHE_TTL", 30))
+        entry = UserModel._user_cache.get(username)
+        if entry is not None and time.monotonic() - entry[1] < ttl:
+            return entry[0]
+
         query = "SELECT username, password_hash FROM users WHERE username = %s"
-        result = db.execute_query(query, (username,), fetch=True)
-        return result[0] if result else None
+        result = db.execute_query(query, (username,), fetch=True, prepared=True)
+        user = tuple(result[0]) if result else None
+
+        with UserModel._user_cache_lock:
+            if len(UserModel._user_cache) >= UserModel.MAX_CACHED_USERS:
+                UserModel._user_cache.clear()
+            UserModel._user_cache[username] = (user, time.monotonic())
+        return user
+
+    @staticmethod
+    def forget_user(username: str):
+        with UserModel._user_cache_lock:
+            UserModel._user_cache.pop(username, None)
 
     @staticmethod
     def check_password(password: str, password_hash: str):
-        return bcrypt.check_password_hash(password_hash, password)
+        """
+        Raises:
+            HasherBusyError: If too many checks are already queued.
+        """
+        return PasswordHasher.check(password, password_hash)
+
+    @staticmethod
+    def verify_login(username: str, password: str):
+        """
+        Checks a username and password, upgrading the stored hash when the bcrypt cost changed.
+
+        Returns:
+            bool: True if the credentials are valid.
+
+        Raises:
+            HasherBusyError: If too many checks are already queued.
+        """
+        user = UserModel.get_user_by_username(username)
+        if not user or not UserModel.check_password(password, user[1]):
+            return False
+
+        if PasswordHasher.needs_rehash(user[1]):
+            try:
+                new_hash = PasswordHasher.hash(password)
+                # Only replaces the hash that was verified, never a concurrent change
+                db.execute_query(
+                    "UPDATE users SET password_hash = %s WHERE username = %s AND password_hash = %s",
+                    (new_hash, username, user[1])
+                )
+                UserModel.forget_user(username)
+            except Exception as e:
+                # The login itself succeeded; the upgrade is retried next time
+                print("Error rehashing password:", e)
+        return True
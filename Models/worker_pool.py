@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from config import Config
+
+
+class BoundedProcessPool:
+    """
+    A pool of worker processes with a bounded queue, for CPU-heavy work kept off request threads.
+
+    At most <PREFIX>_WORKERS tasks run at once (0 = one per CPU) and at most
+    <PREFIX>_MAX_PENDING wait behind them; beyond that submit() raises
+    `busy_error` immediately instead of queueing without bound. A result not
+    ready within <PREFIX>_TIMEOUT seconds raises `busy_error` as well.
+
+    Workers are started with spawn and only import what the submitted
+    function's module imports, so task functions belong in small modules
+    with module-level definitions (they are pickled by name). Entry scripts
+    must not build the app when re-run as "__mp_main__" (see run.py).
+    """
+
+    def __init__(self, config_prefix, busy_error, busy_message, timeout_message, max_pending=64, timeout=10.0):
+        self.config_prefix = config_prefix
+        self.busy_error = busy_error
+        self.busy_message = busy_message
+        self.timeout_message = timeout_message
+        self.default_max_pending = max_pending
+        self.default_timeout = timeout
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self._slots = None
+
+    def _setting(self, name, default):
+        return getattr(Config, f"{self.config_prefix}_{name}", default)
+
+    def _pool(self):
+        # Executors do not survive fork(), so each worker process creates its own
+        if self._executor_pid == os.getpid():
+            return self._executor, self._slots
+        with self._lock:
+            if self._executor_pid != os.getpid():
+                workers = int(self._setting("WORKERS", 0)) or os.cpu_count() or 1
+                pending = int(self._setting("MAX_PENDING", self.default_max_pending))
+                # spawn: forking a multi-threaded server process is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                self._slots = threading.BoundedSemaphore(workers + pending)
+                self._executor_pid = os.getpid()
+        return self._executor, self._slots
+
+    def submit(self, fn, *args):
+        """
+        Runs fn(*args) in a worker process and returns its result.
+
+        Raises:
+            busy_error: If the queue is full or the result does not arrive in time.
+        """
+        executor, slots = self._pool()
+        if not slots.acquire(blocking=False):
+            raise self.busy_error(self.busy_message)
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+
+        try:
+            return future.result(timeout=float(self._setting("TIMEOUT", self.default_timeout)))
+        except FutureTimeoutError:
+            raise self.busy_error(self.timeout_message)
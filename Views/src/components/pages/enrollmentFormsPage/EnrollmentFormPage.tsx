@@ -5,7 +5,7 @@ import InputForm from "../../forms/InputForm";
 import SelectForm from "../../forms/SelectForm";
 import AlertBanner from "../../alertBanner/AlertBanner";
 import FileInput from "../../forms/FileInput";
-import { supabase } from "../../../lib/supabaseClient";
+import { uploadProfileImage } from "../../../data/ProfileImage";
 import "./EnrollmentFormPage.css";
 
 interface CollegeOption { label: string; value: string; name: string; }
@@ -99,14 +99,6 @@ export default function EnrollmentForm({ show, handleClose, onSuccess }: Enrollm
         }
     };
 
-    const uploadProfilePicture = async (file: File | null, id: string) => {
-        if (!file) return null;
-        const extension = file.name.split(".").pop();
-        const fileName = encodeURIComponent(`${id}.${extension}`);
-        const { error } = await supabase.storage.from('profile').upload(`students/${fileName}`, file, { upsert: true });
-        return error ? null : `students/${fileName}`;
-    };
-
     const handleEnrollStudent = async () => {
         if (!idNumber || !firstName || !lastName || !gender || !yearLevel || !program || !college) {
             return showAlert("warning", "Please fill out all required fields.");
@@ -119,25 +111,9 @@ export default function EnrollmentForm({ show, handleClose, onSuccess }: Enrollm
         setStatusLabel("Initializing...");
 
         try {
-            let profile_image_path = undefined;
-
-            if (profileFile) {
-                setStatusLabel("Uploading Profile Picture...");
-                const uploadTimer = setInterval(() => setProgress(p => (p < 60 ? p + 5 : p)), 200);
-                
-                profile_image_path = await uploadProfilePicture(profileFile, idNumber);
-                clearInterval(uploadTimer);
-
-                if (!profile_image_path) {
-                    setProgress(0);
-                    return showAlert("danger", "Failed to upload profile picture.");
-                }
-            }
-
-            setProgress(70);
             setStatusLabel("Saving Student Record...");
             
-            const dbTimer = setInterval(() => setProgress(p => (p < 90 ? p + 5 : p)), 100);
+            const dbTimer = setInterval(() => setProgress(p => (p < 40 ? p + 5 : p)), 100);
 
             const res = await fetch("/api/students/add", {
                 method: "POST",
@@ -145,25 +121,40 @@ export default function EnrollmentForm({ show, handleClose, onSuccess }: Enrollm
                 body: JSON.stringify({
                     id_number: idNumber, first_name: firstName, middle_name: middleName,
                     last_name: lastName, gender, year_level: parseInt(yearLevel, 10),
-                    program_code: program, profile_image_path,
+                    program_code: program,
                 }),
             });
 
             clearInterval(dbTimer);
             const data = await res.json();
 
-            if (data.success) {
-                setProgress(100);
-                setStatusLabel("Enrollment Complete!");
-                showAlert("success", data.message);
-                
-                setTimeout(() => {
-                    onSuccess();
-                }, 1000);
-            } else {
+            if (!data.success) {
                 setProgress(0);
-                showAlert("danger", data.message);
+                return showAlert("danger", data.message);
             }
+
+            // The picture is attached to the saved record; the server records its path
+            if (profileFile) {
+                setProgress(50);
+                setStatusLabel("Uploading Profile Picture...");
+                const uploadTimer = setInterval(() => setProgress(p => (p < 90 ? p + 5 : p)), 200);
+
+                const profile_image_path = await uploadProfileImage(profileFile, idNumber);
+                clearInterval(uploadTimer);
+
+                if (!profile_image_path) {
+                    setProgress(0);
+                    return showAlert("warning", "Student enrolled, but the profile picture failed to upload.");
+                }
+            }
+
+            setProgress(100);
+            setStatusLabel("Enrollment Complete!");
+            showAlert("success", data.message);
+            
+            setTimeout(() => {
+                onSuccess();
+            }, 1000);
         } catch {
             setProgress(0);
             showAlert("danger", "Error connecting to the server.");
@@ -5,7 +5,7 @@ import InputForm from "../../forms/InputForm";
 import SelectForm from "../../forms/SelectForm";
 import AlertBanner from "../../alertBanner/AlertBanner";
 import FileInput from "../../forms/FileInput";
-import { supabase } from "../../../lib/supabaseClient";
+import { uploadProfileImage } from "../../../data/ProfileImage";
 import "./EnrollmentFormPage.css";
 
 interface CollegeOption { label: string; value: string; }
@@ -96,22 +96,6 @@ export default function UpdateForm({ show, handleClose, initialId, onSuccess }:
         } catch { lastLoadedId.current = ""; showAlert("danger", "Student not found."); }
     };
 
-    const uploadProfilePicture = async (file: File | null, id: string) => {
-        if (!file) return null;
-        const ext = file.name.split(".").pop();
-        
-        const { data: files } = await supabase.storage.from('profile').list('students');
-        if (files) {
-            const old = files.filter(f => f.name.startsWith(id)).map(f => `students/${f.name}`);
-            if (old.length) await supabase.storage.from('profile').remove(old);
-        }
-
-        const fileName = `students/${encodeURIComponent(`${id}.${ext}`)}`;
-        const { error } = await supabase.storage.from('profile').upload(fileName, file, { upsert: true });
-        
-        return error ? null : fileName;
-    };
-
     const handleUpdate = () => {
         if (!idNumber || !firstName || !lastName || !program) return showAlert("warning", "Fill all required fields.");
         
@@ -143,7 +127,8 @@ export default function UpdateForm({ show, handleClose, initialId, onSuccess }:
                     setProgress((prev) => (prev < 65 ? prev + 5 : prev));
                 }, 200);
 
-                path = await uploadProfilePicture(profileFile, idNumber);
+                // The server replaces the old picture and records the new path
+                path = await uploadProfileImage(profileFile, idNumber);
                 
                 clearInterval(uploadTimer);
                 
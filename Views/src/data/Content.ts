@@ -5,7 +5,7 @@ import CollegeTable from "../components/pages/managementPage/collegeTable/Colleg
 import ProgramTable from "../components/pages/managementPage/programTable/ProgramTable";
 import LoginPage from "../components/loginPage/login"
 import HomePage from "../components/pages/homePage/homepage";
-import { supabase } from "../lib/supabaseClient";
+import { profileImageUrl } from "./ProfileImage";
 
 import LogoImage from "../assets/Logo.png";
 import { createColumnHelper } from "@tanstack/react-table";
@@ -62,12 +62,11 @@ export const getStudentColumns = (onUpdate: (id: string) => void) => [
         cell: (info) => {
             const path = info.getValue();
             if (!path) return createElement("p", { className: "m-0 p-2 text-center text-muted" }, "-");
-            const { data } = supabase.storage.from("profile").getPublicUrl(path);
             return createElement(
                 "div",
                 { className: "d-flex justify-content-center align-items-center" },
                 createElement("img", {
-                    src: data.publicUrl,
+                    src: profileImageUrl(path),
                     className: "rounded-circle",
                     style: { width: "80px", height: "80px", objectFit: "cover" },
                     alt: "Profile photo",
@@ -0,0 +1,17 @@
+import { supabase } from "../lib/supabaseClient";
+
+// Uploads a profile picture; the server makes the thumbnails and records the path on the student.
+export const uploadProfileImage = async (file: File, id: string): Promise<string | null> => {
+    const body = new FormData();
+    body.append("file", file);
+    const res = await fetch(`/api/students/${encodeURIComponent(id)}/profile-image`, { method: "POST", body });
+    const data = await res.json().catch(() => null);
+    return data?.success ? data.profile_image_path : null;
+};
+
+// Server-stored pictures are URL prefixes ("/media/..."); older ones are keys in the Supabase bucket.
+// /media answers a size or format that was not rendered with the closest stored variant.
+export const profileImageUrl = (path: string, size = 160, format = "webp"): string => {
+    if (path.startsWith("/")) return `${path}/${size}.${format}`;
+    return supabase.storage.from("profile").getPublicUrl(path).data.publicUrl;
+};
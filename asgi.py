@@ -0,0 +1,10 @@
+from config import Config
+
+# Not when re-run as __mp_main__ by a spawned worker process (see run.py)
+if __name__ != "__mp_main__":
+    from Controllers.asgi_app import app
+
+# Async serving mode: uvicorn asgi:app --host <host> --port <port>
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host=Config.HOST, port=Config.PORT)
@@ -1,5 +1,9 @@
-from Controllers.app import app
 from config import Config
 
+# Worker pools (see Models/worker_pool.py) start processes with spawn, which re-run
+# this file as __mp_main__; only the real entry point needs the app
+if __name__ != "__mp_main__":
+    from Controllers.app import app
+
 if __name__ == "__main__":
     app.run(host=Config.HOST, port=Config.PORT, debug=Config.DEBUG)
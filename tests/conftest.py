@@ -0,0 +1,15 @@
+import importlib.machinery
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# config.py is written per deployment from config.py.configure; without one, tests use the template's defaults
+if importlib.util.find_spec("config") is None:
+    loader = importlib.machinery.SourceFileLoader("config", os.path.join(ROOT, "config.py.configure"))
+    spec = importlib.util.spec_from_loader("config", loader)
+    config = importlib.util.module_from_spec(spec)
+    loader.exec_module(config)
+    sys.modules["config"] = config
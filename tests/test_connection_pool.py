@@ -0,0 +1,139 @@
+import threading
+import time
+
+import pytest
+from psycopg2 import extensions, pool
+
+from Models.db import db_connection
+from Models.db.db_connection import BoundedConnectionPool, PoolTimeoutError
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, params=None):
+        if not self.conn.alive:
+            raise RuntimeError("server closed the connection")
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.alive = True
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    opened = []
+
+    def connect(**kwargs):
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(db_connection.psycopg2, "connect", connect)
+    return opened
+
+
+def test_minconn_are_opened_up_front(connections):
+    BoundedConnectionPool(2, 5)
+    assert len(connections) == 2
+
+
+def test_returned_connection_is_reused(connections):
+    p = BoundedConnectionPool(0, 2)
+    conn = p.getconn()
+    p.putconn(conn)
+    assert p.getconn() is conn
+    assert len(connections) == 1
+
+
+def test_getconn_times_out_when_exhausted(connections):
+    p = BoundedConnectionPool(0, 1, timeout=0.05)
+    p.getconn()
+    with pytest.raises(PoolTimeoutError):
+        p.getconn()
+    assert p.stats()["timeouts"] == 1
+
+
+def test_waiter_gets_connection_returned_by_another_thread(connections):
+    p = BoundedConnectionPool(0, 1, timeout=2)
+    conn = p.getconn()
+    threading.Timer(0.05, p.putconn, args=(conn,)).start()
+    assert p.getconn() is conn
+    assert p.stats()["wait_time_max"] > 0
+
+
+def test_dead_idle_connection_is_pinged_and_replaced(connections):
+    p = BoundedConnectionPool(0, 1, ping_after=0)
+    conn = p.getconn()
+    p.putconn(conn)
+    conn.alive = False
+    time.sleep(0.001)
+
+    replacement = p.getconn()
+    assert replacement is not conn
+    assert conn.closed
+    assert p.stats()["discarded"] == 1
+
+
+def test_broken_and_expired_connections_are_discarded(connections):
+    p = BoundedConnectionPool(0, 2, max_lifetime=0.01)
+    conn = p.getconn()
+    time.sleep(0.02)
+    p.putconn(conn)
+    assert conn.closed
+
+    p = BoundedConnectionPool(0, 2)
+    conn = p.getconn()
+    p.putconn(conn)
+    conn.closed = 1
+    assert p.getconn() is not conn
+
+
+def test_putconn_rolls_back_open_transaction(connections):
+    p = BoundedConnectionPool(0, 1)
+    conn = p.getconn()
+    conn.status = extensions.TRANSACTION_STATUS_INTRANS
+    p.putconn(conn)
+    assert conn.rollbacks == 1
+    assert p.getconn() is conn
+
+
+def test_failed_connect_releases_reserved_slot(connections, monkeypatch):
+    p = BoundedConnectionPool(0, 1, timeout=0.05)
+
+    def refuse(**kwargs):
+        raise RuntimeError("connection refused")
+
+    monkeypatch.setattr(db_connection.psycopg2, "connect", refuse)
+    with pytest.raises(RuntimeError):
+        p.getconn()
+    assert p.stats()["size"] == 0 and p.stats()["in_use"] == 0
+
+
+def test_closed_pool_refuses_checkout(connections):
+    p = BoundedConnectionPool(1, 1)
+    p.closeall()
+    assert connections[0].closed
+    with pytest.raises(pool.PoolError):
+        p.getconn()
@@ -0,0 +1,47 @@
+import psycopg2
+import pytest
+
+from Models.db.db_errors import ConstraintErrors
+
+
+class PgError(psycopg2.Error):
+    """psycopg2 errors get pgcode from the server; this one takes it as an argument."""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
+
+    @property
+    def pgcode(self):
+        return self.code
+
+
+def test_sqlstate_codes():
+    assert ConstraintErrors.UNIQUE_VIOLATION == "23505"
+    assert ConstraintErrors.FOREIGN_KEY_VIOLATION == "23503"
+    assert ConstraintErrors.NOT_NULL_VIOLATION == "23502"
+    assert ConstraintErrors.STRING_TOO_LONG == "22001"
+    assert ConstraintErrors.INVALID_NUMBER == "22P02"
+
+
+def test_model_messages_take_precedence():
+    error = PgError("23503")
+    assert ConstraintErrors.message(error, {"23503": "Program not found."}) == "Program not found."
+
+
+@pytest.mark.parametrize("code, expected", [
+    ("23502", "All required fields must be provided."),
+    ("23514", "A value is outside the allowed range."),
+    ("22001", "A value is too long."),
+    ("22P02", "A value has the wrong format."),
+])
+def test_defaults_apply_without_a_model_message(code, expected):
+    assert ConstraintErrors.message(PgError(code), {"23503": "Program not found."}) == expected
+
+
+def test_unmapped_errors_return_none():
+    # Foreign key and unique violations only mean something to the model that caused them
+    assert ConstraintErrors.message(PgError("23503")) is None
+    assert ConstraintErrors.message(PgError("40P01")) is None
+    assert ConstraintErrors.message(psycopg2.OperationalError("connection lost")) is None
+    assert ConstraintErrors.message(ValueError("not a database error")) is None
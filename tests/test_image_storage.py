@@ -0,0 +1,28 @@
+from Models.imageModel.image_storage import LocalImageStorage
+
+
+def storage_with(tmp_path, *names):
+    storage = LocalImageStorage(str(tmp_path))
+    storage.save("students/2024-0001/abc", {name: name.encode() for name in names})
+    return storage
+
+
+def test_nearest_variant_prefers_the_stored_name(tmp_path):
+    storage = storage_with(tmp_path, "80.webp", "160.webp")
+    assert storage.nearest_variant("students/2024-0001/abc", "160.webp") == "160.webp"
+
+
+def test_nearest_variant_rounds_up_then_falls_back_to_the_largest(tmp_path):
+    storage = storage_with(tmp_path, "80.jpeg", "320.jpeg")
+    assert storage.nearest_variant("students/2024-0001/abc", "160.webp") == "320.jpeg"
+    assert storage.nearest_variant("students/2024-0001/abc", "640.webp") == "320.jpeg"
+    assert storage.nearest_variant("students/2024-0001/abc", "large.webp") == "320.jpeg"
+
+
+def test_nearest_variant_prefers_the_requested_format(tmp_path):
+    storage = storage_with(tmp_path, "320.jpeg", "320.webp")
+    assert storage.nearest_variant("students/2024-0001/abc", "160.webp") == "320.webp"
+
+
+def test_nearest_variant_of_a_missing_key(tmp_path):
+    assert LocalImageStorage(str(tmp_path)).nearest_variant("students/none", "160.webp") is None
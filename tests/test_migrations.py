@@ -0,0 +1,65 @@
+from Models.db.db_migrations import Migration, Migrations, MIGRATIONS_DIR
+
+
+class RecordingCursor:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def execute(self, *args):
+        self.calls.append(args)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.calls = []
+        self.autocommit = True
+
+    def cursor(self):
+        return RecordingCursor(self.calls)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def test_migration_sql_is_sent_without_parameters():
+    # psycopg2 only %-formats when parameters are passed; 0003 contains a literal '%token%'
+    migration = next(m for m in Migrations.discover() if m.version == 3)
+    assert "%" in migration.sql
+
+    conn = RecordingConnection()
+    Migrations._run(conn, migration)
+
+    sql_call, record_call = conn.calls
+    assert sql_call == (migration.sql,)
+    assert record_call[1][:2] == (3, "student_search_documents")
+
+
+def test_discover_orders_versions():
+    versions = [m.version for m in Migrations.discover(MIGRATIONS_DIR)]
+    assert versions == sorted(versions) and versions[0] == 1
+
+
+def test_no_transaction_migration_is_split_into_statements(tmp_path):
+    path = tmp_path / "0009_indexes.sql"
+    path.write_text(
+        "-- migrate: no-transaction\n"
+        "-- Two indexes\n"
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_a ON t (a);\n"
+        "CREATE UNIQUE INDEX CONCURRENTLY idx_b\n    ON t (b);\n"
+    )
+    migration = Migration(9, "indexes", str(path))
+    assert not migration.transactional
+    assert migration.statements() == [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_a ON t (a)",
+        "CREATE UNIQUE INDEX CONCURRENTLY idx_b\n    ON t (b)",
+    ]
+    assert migration.concurrent_indexes() == ["idx_a", "idx_b"]
@@ -0,0 +1,46 @@
+import pytest
+
+from Models.db.db_pagination import InvalidCursorError, KeysetPagination
+
+
+def test_cursor_round_trip():
+    cursor = KeysetPagination.encode_cursor("last_name", "DESC", "Dela Cruz", "2024-0001")
+    assert "=" not in cursor
+    assert KeysetPagination.decode_cursor(cursor, "last_name", "DESC") == ("Dela Cruz", "2024-0001")
+
+
+def test_cursor_round_trip_keeps_null_and_numbers():
+    cursor = KeysetPagination.encode_cursor("year_level", "ASC", None, 3)
+    assert KeysetPagination.decode_cursor(cursor, "year_level", "ASC") == (None, 3)
+
+
+def test_cursor_for_another_ordering_is_rejected():
+    cursor = KeysetPagination.encode_cursor("last_name", "ASC", "Reyes", "2024-0002")
+    with pytest.raises(InvalidCursorError):
+        KeysetPagination.decode_cursor(cursor, "last_name", "DESC")
+    with pytest.raises(InvalidCursorError):
+        KeysetPagination.decode_cursor(cursor, "first_name", "ASC")
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "e30", "!!!!", "bnVsbA"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        KeysetPagination.decode_cursor(cursor, "id_number", "ASC")
+
+
+def test_seek_clause_follows_direction():
+    assert KeysetPagination.seek_clause("s.last_name", "s.id_number", "ASC") == "(s.last_name, s.id_number) > (%s, %s)"
+    assert KeysetPagination.seek_clause("s.last_name", "s.id_number", "DESC") == "(s.last_name, s.id_number) < (%s, %s)"
+
+
+def test_build_page_trims_extra_row_and_issues_cursor():
+    rows = [("2024-0001", "A"), ("2024-0002", "B"), ("2024-0003", "C")]
+    page, next_cursor = KeysetPagination.build_page(rows, 2, "last_name", "ASC", sort_index=1, key_index=0)
+    assert page == rows[:2]
+    assert KeysetPagination.decode_cursor(next_cursor, "last_name", "ASC") == ("B", "2024-0002")
+
+
+def test_build_page_last_page_has_no_cursor():
+    rows = [("2024-0001", "A")]
+    assert KeysetPagination.build_page(rows, 2, "last_name", "ASC", 1, 0) == (rows, None)
+    assert KeysetPagination.build_page(rows, 0, "last_name", "ASC", 1, 0) == ([], None)
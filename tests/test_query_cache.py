@@ -0,0 +1,73 @@
+from Models.db.db_query_cache import PreparedStatements, QueryShapeCache
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, query, params=None):
+        self.calls.append((query, params))
+
+
+class PreparedConnection:
+    def __init__(self):
+        self.prepared_statements = {}
+
+
+def test_placeholders_are_numbered_in_order():
+    sql, count = PreparedStatements.to_server_placeholders(
+        "SELECT * FROM students WHERE last_name = %s AND year_level = %s LIMIT %s"
+    )
+    assert sql == "SELECT * FROM students WHERE last_name = $1 AND year_level = $2 LIMIT $3"
+    assert count == 3
+
+
+def test_escaped_percent_is_unescaped_not_numbered():
+    sql, count = PreparedStatements.to_server_placeholders("SELECT 'a%%b' LIKE %s, 100 %% %s")
+    assert sql == "SELECT 'a%b' LIKE $1, 100 % $2"
+    assert count == 2
+
+
+def test_query_without_placeholders_is_unchanged():
+    assert PreparedStatements.to_server_placeholders("SELECT 1") == ("SELECT 1", 0)
+
+
+def test_statement_is_prepared_once_per_connection():
+    conn, cur = PreparedConnection(), RecordingCursor()
+    query = "SELECT * FROM programs WHERE college_code = %s"
+    name = PreparedStatements.statement_name(query)
+
+    PreparedStatements.execute(conn, cur, query, ("CCS",))
+    PreparedStatements.execute(conn, cur, query, ("CE",))
+
+    assert cur.calls == [
+        (f"PREPARE {name} AS SELECT * FROM programs WHERE college_code = $1", None),
+        (f"EXECUTE {name} (%s)", ("CCS",)),
+        (f"EXECUTE {name} (%s)", ("CE",)),
+    ]
+    assert conn.prepared_statements == {name: 1}
+
+
+def test_plain_connection_and_full_connection_run_unprepared(monkeypatch):
+    cur = RecordingCursor()
+    PreparedStatements.execute(object(), cur, "SELECT %s", (1,))
+    assert cur.calls == [("SELECT %s", (1,))]
+
+    monkeypatch.setattr(PreparedStatements, "MAX_PER_CONNECTION", 0)
+    conn, cur = PreparedConnection(), RecordingCursor()
+    PreparedStatements.execute(conn, cur, "SELECT %s", (2,))
+    assert cur.calls == [("SELECT %s", (2,))]
+    assert conn.prepared_statements == {}
+
+
+def test_shape_builder_runs_once_per_key():
+    calls = []
+
+    def build():
+        calls.append(1)
+        return "SELECT 1"
+
+    key = ("tests.shape", object())
+    assert QueryShapeCache.get(key, build) == "SELECT 1"
+    assert QueryShapeCache.get(key, build) == "SELECT 1"
+    assert len(calls) == 1
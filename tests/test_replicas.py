@@ -0,0 +1,165 @@
+import time
+
+import pytest
+from flask import Flask, session
+
+from Controllers import conditional_requests
+from Controllers.conditional_requests import compute_etag, versioned_etag
+from Models.db import db_utils
+from Models.db.db_replicas import ReplicaRouting, parse_lsn
+from Models.db.db_utils import DBUtils
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, params=None):
+        self.conn.queries.append(query)
+
+    def fetchone(self):
+        return (self.conn.replay_lsn,)
+
+    def fetchall(self):
+        return list(self.conn.versions.items())
+
+    def close(self):
+        pass
+
+
+class FakeReplica:
+    def __init__(self, replay_lsn="0/0", versions=None):
+        self.replay_lsn = replay_lsn
+        self.versions = versions or {}
+        self.queries = []
+        self.closed = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+class FakeDatabase:
+    def __init__(self, replica):
+        self.replica = replica
+        self.returned = []
+
+    def has_replica(self):
+        return self.replica is not None
+
+    def get_replica_conn(self):
+        return self.replica
+
+    def put_replica_conn(self, conn):
+        self.returned.append(conn)
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.secret_key = "test"
+    return app
+
+
+@pytest.fixture(autouse=True)
+def routing(monkeypatch):
+    monkeypatch.setattr(ReplicaRouting, "_replay_lsn", -1)
+    monkeypatch.setattr(ReplicaRouting, "_down_until", 0.0)
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Routes read_query to a fake replica; returns (database, sources of each read)."""
+    database = FakeDatabase(FakeReplica())
+    sources = []
+    monkeypatch.setattr(db_utils, "DatabaseConnection", lambda: database)
+    monkeypatch.setattr(db_utils, "_run_pooled", lambda *args: (sources.append("replica"), False))
+    monkeypatch.setattr(DBUtils, "execute_query", lambda *args, **kwargs: sources.append("primary"))
+    return database, sources
+
+
+def test_parse_lsn_orders_positions():
+    assert parse_lsn("0/0") == 0
+    assert parse_lsn("16/B374D848") == (0x16 << 32) | 0xB374D848
+    assert parse_lsn("1/0") > parse_lsn("0/FFFFFFFF")
+
+
+def test_caught_up_without_or_after_expired_write(app):
+    with app.test_request_context():
+        assert ReplicaRouting.caught_up(FakeReplica())
+        session[ReplicaRouting.SESSION_KEY] = ["5/0", time.time() - 1]
+        assert ReplicaRouting.caught_up(FakeReplica())
+        assert ReplicaRouting.SESSION_KEY not in session
+
+
+def test_caught_up_stays_on_primary_without_a_position(app):
+    with app.test_request_context():
+        session[ReplicaRouting.SESSION_KEY] = [None, time.time() + 30]
+        assert not ReplicaRouting.caught_up(FakeReplica())
+
+
+def test_caught_up_compares_the_replay_position(app):
+    with app.test_request_context():
+        session[ReplicaRouting.SESSION_KEY] = ["5/0", time.time() + 30]
+        assert not ReplicaRouting.caught_up(FakeReplica(None))
+        assert not ReplicaRouting.caught_up(FakeReplica("4/FFFFFFFF"))
+        assert ReplicaRouting.caught_up(FakeReplica("5/10"))
+
+
+def test_caught_up_uses_the_remembered_replay_position(app):
+    with app.test_request_context():
+        session[ReplicaRouting.SESSION_KEY] = ["5/0", time.time() + 30]
+        assert ReplicaRouting.caught_up(FakeReplica("6/0"))
+        replica = FakeReplica("0/0")
+        assert ReplicaRouting.caught_up(replica)
+        assert replica.queries == []
+
+
+def test_mark_down_skips_the_replica(reads):
+    database, sources = reads
+    ReplicaRouting.mark_down()
+    assert not ReplicaRouting.available()
+    DBUtils.read_query("SELECT 1")
+    assert sources == ["primary"]
+
+
+def test_read_query_uses_replica_until_the_unit_writes(app, reads, monkeypatch):
+    database, sources = reads
+    unit = type("Unit", (), {"wrote": False})()
+    app.extensions["db_unit_of_work"] = True
+    monkeypatch.setattr(DBUtils, "current_unit", lambda create=False: unit)
+    with app.test_request_context():
+        DBUtils.read_query("SELECT 1")
+        unit.wrote = True
+        DBUtils.read_query("SELECT 1")
+    assert sources == ["replica", "primary"]
+    assert database.returned == [database.replica]
+
+
+def test_read_query_stays_on_primary_behind_the_session_write(app, reads):
+    database, sources = reads
+    database.replica.replay_lsn = "1/0"
+    with app.test_request_context():
+        session[ReplicaRouting.SESSION_KEY] = ["2/0", time.time() + 30]
+        DBUtils.read_query("SELECT 1")
+    assert sources == ["primary"]
+    assert database.returned == [database.replica]
+
+
+def test_etag_uses_versions_read_on_the_replica(app, monkeypatch):
+    monkeypatch.setattr(conditional_requests.TableVersions, "get", classmethod(lambda cls, table: 5))
+    replica = FakeReplica(versions={"students": 4})
+
+    @app.route("/students")
+    @versioned_etag("students")
+    def students():
+        ReplicaRouting.record_versions(replica)
+        ReplicaRouting.record_versions(FakeReplica(versions={"students": 5}))
+        return "stale"
+
+    client = app.test_client()
+    response = client.get("/students")
+    assert response.headers["ETag"] == '"%s"' % compute_etag("/students", [], ("students",), [4])
+
+    # The primary is already at version 5, so the replica's tag never earns a 304
+    again = client.get("/students", headers={"If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 200
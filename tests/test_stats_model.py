@@ -0,0 +1,37 @@
+from Models.statsModel.stats_model import StatsModel
+
+ROWS = [
+    ("CCS", "Computer Studies", "BSCS", "Computer Science", 1, "Male", 3),
+    ("CCS", "Computer Studies", "BSCS", "Computer Science", 2, "Female", 2),
+    ("CCS", "Computer Studies", "BSIT", "Information Technology", None, None, 0),
+    ("COE", "Engineering", "BSCE", "Civil Engineering", 1, "Female", 4),
+]
+
+
+def test_summarize_totals():
+    summary = StatsModel.summarize(ROWS)
+    assert summary["total"] == 9
+    assert summary["byCollege"] == [
+        {"college_code": "CCS", "college_name": "Computer Studies", "count": 5},
+        {"college_code": "COE", "college_name": "Engineering", "count": 4},
+    ]
+
+
+def test_summarize_keeps_programs_without_students():
+    by_program = {p["program_code"]: p for p in StatsModel.summarize(ROWS)["byProgram"]}
+    assert by_program["BSIT"] == {
+        "program_code": "BSIT", "program_name": "Information Technology", "college_code": "CCS", "count": 0
+    }
+    assert by_program["BSCS"]["count"] == 5
+
+
+def test_summarize_sorts_year_levels_and_genders():
+    summary = StatsModel.summarize(list(reversed(ROWS)))
+    assert summary["byYearLevel"] == [{"year_level": 1, "count": 7}, {"year_level": 2, "count": 2}]
+    assert summary["byGender"] == [{"gender": "Female", "count": 6}, {"gender": "Male", "count": 3}]
+
+
+def test_summarize_without_rows():
+    assert StatsModel.summarize([]) == {
+        "total": 0, "byCollege": [], "byProgram": [], "byYearLevel": [], "byGender": []
+    }
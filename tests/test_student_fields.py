@@ -0,0 +1,28 @@
+import pytest
+
+from Models.studentTableModel.student_search_model import StudentSearchModel
+from Models.studentTableModel.student_table_model import StudentModel
+
+
+def test_field_permutations_share_one_shape():
+    assert StudentModel.parse_fields("last_name,id_number") == StudentModel.parse_fields("id_number, last_name,last_name")
+    first, _ = StudentModel.list_statement(fields=StudentModel.parse_fields("last_name,id_number"))
+    second, _ = StudentModel.list_statement(fields=StudentModel.parse_fields("id_number,last_name"))
+    assert first is second
+
+
+def test_fields_follow_allowed_order():
+    allowed = StudentSearchModel.columns
+    names = StudentModel.parse_fields(",".join(reversed(allowed)), allowed=allowed)
+    assert names == tuple(allowed)
+
+
+def test_empty_fields_select_every_column():
+    assert StudentModel.parse_fields(None) == tuple(StudentModel.columns)
+    assert StudentModel.parse_fields("") == tuple(StudentModel.columns)
+
+
+@pytest.mark.parametrize("fields", ["password", "id_number,nope", " , "])
+def test_unknown_fields_are_rejected(fields):
+    with pytest.raises(ValueError):
+        StudentModel.parse_fields(fields)
@@ -0,0 +1,78 @@
+import io
+
+import pytest
+
+from Models.studentTableModel.student_import_model import StudentImportModel, _CsvRowStream
+
+
+def parse_csv(text):
+    errors = []
+    rows = list(StudentImportModel.parse_csv(io.BytesIO(text.encode("utf-8")), errors))
+    return rows, errors
+
+
+def parse_ndjson(text):
+    errors = []
+    rows = list(StudentImportModel.parse_ndjson(io.BytesIO(text.encode("utf-8")), errors))
+    return rows, errors
+
+
+def test_csv_rows_are_numbered_and_normalized():
+    rows, errors = parse_csv(
+        "﻿id_number, first_name ,last_name,gender,year_level,program_code\n"
+        "2024-0001, Ana ,Reyes,Female,1,BSCS\n"
+        "2024-0002,Ben,Cruz,Male,2,BSIT\n"
+    )
+    assert errors == []
+    assert rows == [
+        [2, "2024-0001", "Ana", "", "Reyes", "Female", "1", "BSCS", ""],
+        [3, "2024-0002", "Ben", "", "Cruz", "Male", "2", "BSIT", ""],
+    ]
+
+
+def test_csv_missing_required_columns_is_rejected():
+    with pytest.raises(ValueError, match="gender, year_level, program_code"):
+        parse_csv("id_number,first_name,last_name\n2024-0001,Ana,Reyes\n")
+
+
+def test_csv_row_with_extra_fields_is_reported():
+    rows, errors = parse_csv(
+        "id_number,first_name,last_name,gender,year_level,program_code\n"
+        "2024-0001,Ana,Reyes,Female,1,BSCS,extra\n"
+    )
+    assert rows == []
+    assert errors == [{"row": 2, "id_number": "2024-0001", "message": "Row has more fields than the header."}]
+
+
+def test_ndjson_reports_invalid_lines_and_skips_blank_ones():
+    rows, errors = parse_ndjson(
+        '{"id_number": "2024-0001", "first_name": "Ana", "year_level": 1}\n'
+        "\n"
+        "[1, 2]\n"
+        "{not json\n"
+    )
+    assert rows == [[1, "2024-0001", "Ana", "", "", "", "1", "", ""]]
+    assert [e["row"] for e in errors] == [3, 4]
+
+
+def test_csv_row_stream_serves_any_read_size():
+    rows = [[1, "a,b", None], [2, 'say "hi"', "x"]]
+    expected = '1,"a,b",\r\n2,"say ""hi""",x\r\n'
+    assert _CsvRowStream(iter(rows)).read() == expected
+
+    stream = _CsvRowStream(iter(rows))
+    chunks = []
+    while True:
+        chunk = stream.read(5)
+        if not chunk:
+            break
+        assert len(chunk) <= 5
+        chunks.append(chunk)
+    assert "".join(chunks) == expected
+
+
+def test_length_rule_covers_every_sized_column():
+    condition, message = StudentImportModel.VALIDATION_RULES[1]
+    for column, limit in StudentImportModel.MAX_LENGTHS.items():
+        assert f"length(st.{column}) > {limit}" in condition
+        assert f"'{column} must be at most {limit} characters.'" in message
@@ -0,0 +1,132 @@
+from contextlib import contextmanager
+
+import psycopg2
+import pytest
+
+from Models.db.db_utils import DBUtils
+from Models.programTableModel.program_delete_model import ProgramDeleteModel
+from Models.studentTableModel.student_add_model import StudentAddModel
+from Models.studentTableModel.student_delete_model import StudentDeleteModel
+from Models.studentTableModel.student_update_model import StudentUpdateModel
+
+
+class PgError(psycopg2.Error):
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
+
+    @property
+    def pgcode(self):
+        return self.code
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """Replaces the database with a list of results (or exceptions) returned by successive queries;
+    the (query, params) pairs run are recorded."""
+    results = []
+    queries = []
+
+    @contextmanager
+    def transaction():
+        yield
+
+    def execute_query(query, params=None, fetch=False, prepared=False, isolated=False):
+        queries.append((query, params))
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(DBUtils, "transaction", transaction)
+    monkeypatch.setattr(DBUtils, "execute_query", execute_query)
+    monkeypatch.setattr(DBUtils, "on_commit", lambda callback: None)
+    return results, queries
+
+
+def add_student(program_code="BSCS"):
+    return StudentAddModel.add_student("2024-0001", "Ana", "", "Reyes", "Female", 1, program_code)
+
+
+def test_add_student_is_one_statement(database):
+    results, queries = database
+    results.append([("2024-0001",)])
+    assert add_student()["success"]
+    assert len(queries) == 1 and "ON CONFLICT (id_number) DO NOTHING" in queries[0][0]
+
+
+def test_add_student_duplicate_and_unknown_program(database):
+    results, _ = database
+    results.extend([[], PgError("23503")])
+    assert add_student()["message"] == "Student with ID '2024-0001' already exists."
+    assert add_student("NOPE")["message"] == "Program with code 'NOPE' not found."
+
+
+def test_unmapped_error_is_generic(database, capsys):
+    results, _ = database
+    results.append(PgError("40P01"))
+    assert add_student()["message"] == "Database error while adding student."
+
+
+def test_update_student_not_found_and_no_fields(database):
+    results, queries = database
+    results.append([])
+    assert StudentUpdateModel.update_student("2024-0001", new_first_name="Ana")["message"] == "Student not found."
+    assert StudentUpdateModel.update_student("2024-0001")["message"] == "No fields to update."
+    assert len(queries) == 1
+
+
+def test_delete_program_with_students_is_restricted(database):
+    results, _ = database
+    results.append(PgError("23503"))
+    result = ProgramDeleteModel.delete_program("BSCS")
+    assert result == {"success": False, "message": "Cannot delete program: There are students enrolled in it."}
+
+
+def test_bulk_ids_are_deduplicated_and_blanks_dropped(database):
+    results, queries = database
+    results.extend([[("2024-0001",)], [("2024-0001", None)]])
+    ids = [" 2024-0001", "2024-0001", "", "  ", "2024-0002"]
+
+    StudentUpdateModel.update_students(ids, {"year_level": 2})
+    StudentDeleteModel.delete_students(ids)
+    assert queries[0][1] == (2, ["2024-0001", "2024-0002"])
+    assert queries[1][1] == (["2024-0001", "2024-0002"],)
+
+
+def test_bulk_id_limit_and_empty_ids(database):
+    _, queries = database
+    too_many = [f"2024-{n:04d}" for n in range(StudentUpdateModel.MAX_BULK_IDS + 1)]
+    assert not StudentUpdateModel.update_students(too_many, {"year_level": 2})["success"]
+    assert not StudentDeleteModel.delete_students(too_many)["success"]
+    assert StudentDeleteModel.delete_students(["", " "])["message"] == "At least one student ID number is required."
+    assert queries == []
+
+
+def test_bulk_update_rejects_unknown_and_empty_patches(database):
+    _, queries = database
+    result = StudentUpdateModel.update_students(["2024-0001"], {"id_number": "x", "password": "y"})
+    assert result == {"success": False, "message": "Cannot bulk update: id_number, password."}
+    assert StudentUpdateModel.update_students(["2024-0001"], {})["message"] == "No fields to update."
+    assert queries == []
+
+
+def test_bulk_results_follow_returning(database):
+    results, _ = database
+    results.extend([[("2024-0002",)], [("2024-0001", "/media/students/2024-0001/abc")]])
+
+    updated = StudentUpdateModel.update_students(["2024-0001", "2024-0002"], {"year_level": 3})
+    assert updated["updated"] == 1
+    assert [(r["id_number"], r["success"]) for r in updated["results"]] == [("2024-0001", False), ("2024-0002", True)]
+    assert updated["results"][0]["message"] == "Student not found."
+
+    deleted = StudentDeleteModel.delete_students(["2024-0001", "2024-0003"])
+    assert deleted["deleted"] == 1 and deleted["message"] == "Deleted 1 of 2 student(s)."
+    assert [(r["id_number"], r["success"]) for r in deleted["results"]] == [("2024-0001", True), ("2024-0003", False)]
+
+
+def test_bulk_update_unknown_program(database):
+    results, _ = database
+    results.append(PgError("23503"))
+    result = StudentUpdateModel.update_students(["2024-0001"], {"program_code": "NOPE"})
+    assert result == {"success": False, "message": "Invalid program_code: does not exist."}